@@ -0,0 +1,80 @@
+"""
+.. _ex-fft-threads:
+
+=================================================
+Compare FFT threads and worker processes on a CPU
+=================================================
+
+FIR filtering and resampling in MNE-Python are computed with FFTs. Without a
+GPU (see :ref:`CUDA`), they can run in parallel either with ``n_jobs``
+worker processes or with ``n_jobs='fft-threads'``, which computes the FFTs
+of many channels at once with :mod:`scipy.fft` worker threads (see
+:ref:`fft-threads`). Here we time both on the raw data of the sample
+dataset.
+"""
+# License: BSD (3-clause)
+
+from time import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mne
+from mne.datasets import sample
+
+print(__doc__)
+
+###############################################################################
+# Load the raw data, and make them a bit longer to get more stable timings.
+
+data_path = sample.data_path()
+raw_fname = data_path + '/MEG/sample/sample_audvis_raw.fif'
+raw = mne.io.read_raw_fif(raw_fname).pick_types(meg=True, eeg=True)
+raw = mne.concatenate_raws([raw.copy() for _ in range(2)]).load_data()
+print(raw)
+
+###############################################################################
+# Run each operation a few times with each ``n_jobs`` value, and keep the
+# fastest run. With ``n_jobs=4``, :meth:`~mne.io.Raw.filter` and
+# :meth:`~mne.io.Raw.resample` dispatch the channels to 4 worker processes,
+# while with ``n_jobs='fft-threads'`` they stay in this process.
+
+
+def time_it(func, n_jobs, n_runs=3):
+    times = list()
+    for _ in range(n_runs):
+        raw_copy = raw.copy()
+        t0 = time()
+        func(raw_copy, n_jobs)
+        times.append(time() - t0)
+    return min(times)
+
+
+def filter_raw(raw, n_jobs):
+    raw.filter(1., 40., n_jobs=n_jobs, verbose='error')
+
+
+def resample_raw(raw, n_jobs):
+    raw.resample(150., n_jobs=n_jobs, verbose='error')
+
+
+all_n_jobs = (1, 4, 'fft-threads')
+timings = dict()
+for func in (filter_raw, resample_raw):
+    timings[func.__name__] = [time_it(func, n_jobs) for n_jobs in all_n_jobs]
+    for n_jobs, this_time in zip(all_n_jobs, timings[func.__name__]):
+        print('%s with n_jobs=%r: %0.2f s' % (func.__name__, n_jobs,
+                                              this_time))
+
+###############################################################################
+# Plot the timings. How much faster the threads are depends on the number of
+# CPUs, which can be changed with the ``MNE_FFT_THREADS`` config variable.
+
+fig, ax = plt.subplots(figsize=(6, 3), constrained_layout=True)
+width = 0.25
+x = np.arange(len(timings))
+for ii, n_jobs in enumerate(all_n_jobs):
+    ax.bar(x + (ii - 1) * width, [t[ii] for t in timings.values()],
+           width, label='n_jobs=%r' % (n_jobs,))
+ax.set(xticks=x, xticklabels=list(timings), ylabel='Time (s)')
+ax.legend()
@@ -672,6 +672,54 @@ def _annotations_starts_stops(raw, kinds, name='skip_by_annotation',
     return onsets, ends
 
 
+def _bad_annotation_overlaps(raw, starts, stops):
+    """Get the first bad annotation that overlaps each segment of raw.
+
+    starts and stops are the first and last samples of the segments
+    (relative to ``raw.first_samp``). Returns a list with the description of
+    the annotation for each segment, or None if no bad annotation overlaps it.
+    """
+    starts, stops = np.atleast_1d(starts), np.atleast_1d(stops)
+    annot = raw.annotations
+    bad = np.array([desc.lower().startswith('bad')
+                    for desc in annot.description], bool)
+    out = [None] * len(starts)
+    if not bad.any():
+        return out
+    sfreq = raw.info['sfreq']
+    onsets = _sync_onset(raw, annot.onset[bad])
+    order = np.argsort(onsets, kind='stable')  # already sorted in practice
+    onsets = onsets[order]
+    ends = np.maximum.accumulate(onsets + annot.duration[bad][order])
+    descs = annot.description[bad][order]
+    # the annotations that start before each segment stops are a prefix, and
+    # the first one of them that ends after the segment starts is the first
+    # one whose running maximum end does
+    n_before = np.searchsorted(onsets, stops / sfreq, 'left')
+    first = np.searchsorted(ends, starts / sfreq, 'right')
+    for ii in np.flatnonzero(first < n_before):
+        out[ii] = descs[first[ii]]
+    return out
+
+
+def _merge_onsets_ends(onsets, ends):
+    """Merge overlapping (or touching) spans into sorted, disjoint ones.
+
+    Empty spans (``onset == end``) are dropped.
+    """
+    keep = onsets < ends
+    onsets, ends = onsets[keep], ends[keep]
+    if len(onsets) == 0:
+        return onsets, ends
+    order = np.argsort(onsets, kind='stable')
+    onsets, ends = onsets[order], ends[order]
+    ends = np.maximum.accumulate(ends)
+    # a new span starts wherever the onset is past all previous ends
+    first = np.concatenate([[True], onsets[1:] > ends[:-1]])
+    last = np.concatenate([first[1:], [True]])
+    return onsets[first], ends[last]
+
+
 def _prep_name_list(lst, operation, name='description'):
     if operation == 'check':
         if any(['{COLON}' in val for val in lst]):
@@ -921,6 +921,7 @@ class UpdateChannelsMixin(object):
 
     def _pick_drop_channels(self, idx):
         # avoid circular imports
+        from ..epochs import EpochsFIF
         from ..io import BaseRaw
         from ..time_frequency import AverageTFR, EpochsTFR
 
@@ -928,6 +929,15 @@ class UpdateChannelsMixin(object):
         if isinstance(self, BaseRaw):
             if self._projector is not None:
                 _check_preload(self, f'{msg} after calling .apply_proj()')
+        elif isinstance(self, EpochsFIF) and not self.preload:
+            # only the picked channels will be read from disk, which can
+            # be projected only if the projection was applied before saving
+            if self._projector is not None and \
+                    (self.proj or self._do_delayed_proj):
+                if not self._raw_projected:
+                    _check_preload(self, f'{msg} with projections that are '
+                                         'not applied')
+                self._projector = None
         else:
             _check_preload(self, msg)
 
@@ -949,10 +959,10 @@ class UpdateChannelsMixin(object):
 
         # All others (Evoked, Epochs, Raw) have chs axis=-2
         axis = -3 if isinstance(self, (AverageTFR, EpochsTFR)) else -2
-        if hasattr(self, '_data'):  # skip non-preloaded Raw
+        if getattr(self, '_data', None) is not None:  # skip non-preloaded
             self._data = self._data.take(idx, axis=axis)
         else:
-            assert isinstance(self, BaseRaw) and not self.preload
+            assert isinstance(self, (BaseRaw, EpochsFIF)) and not self.preload
 
         if isinstance(self, BaseRaw):
             self.annotations._prune_ch_names(self.info, on_missing='ignore')
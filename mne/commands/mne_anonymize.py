@@ -7,22 +7,37 @@
 To anonymize other file types call :func:`mne.io.anonymize_info` on their
 :class:`~mne.Info` objects and resave to disk.
 
+With ``--header-only``, only the measurement info is rewritten and the data
+buffers are copied byte for byte, which is much faster for large files.
+If a directory is given, all raw fif files in it (and its subdirectories)
+are anonymized, optionally in parallel.
+
 Examples
 --------
 .. code-block:: console
 
     $ mne anonymize -f sample_audvis_raw.fif
 
+    $ mne anonymize -f archive/ -o anon_archive/ --header-only -j 8
+
 """
 
+import os
 import sys
 import mne
 import os.path as op
 
 ANONYMIZE_FILE_PREFIX = 'anon'
 
+# endings of the raw fif files that are anonymized in a directory
+RAW_FIF_ENDINGS = ('raw.fif', 'raw_sss.fif', 'raw_tsss.fif', '_meg.fif',
+                   '_eeg.fif', '_ieeg.fif')
+RAW_FIF_ENDINGS = RAW_FIF_ENDINGS + tuple(
+    ending + '.gz' for ending in RAW_FIF_ENDINGS)
 
-def mne_anonymize(fif_fname, out_fname, keep_his, daysback, overwrite):
+
+def mne_anonymize(fif_fname, out_fname, keep_his, daysback, overwrite,
+                  header_only=False):
     """Call *anonymize_info* on fif file and save.
 
     Parameters
@@ -41,7 +56,17 @@ def mne_anonymize(fif_fname, out_fname, keep_his, daysback, overwrite):
         defaults to False
     overwrite : bool
         Overwrite output file if it already exists
+    header_only : bool
+        If True, only rewrite the measurement info and copy the data buffers
+        byte for byte instead of reading and writing the data. Split files
+        are always rewritten.
+
+    Returns
+    -------
+    out_fname : str
+        The name of the anonymized file.
     """
+    from mne.io.fiff.raw import _write_anonymized_fif
     raw = mne.io.read_raw_fif(fif_fname, allow_maxshield=True)
     raw.anonymize(daysback=daysback, keep_his=keep_his)
 
@@ -54,7 +79,81 @@ def mne_anonymize(fif_fname, out_fname, keep_his, daysback, overwrite):
     elif not op.isabs(out_fname):
         out_fname = op.join(dir_name, out_fname)
 
-    raw.save(out_fname, overwrite=overwrite)
+    if header_only and len(raw._filenames) == 1:
+        _write_anonymized_fif(raw, out_fname, overwrite=overwrite)
+    else:
+        raw.save(out_fname, overwrite=overwrite)
+    return out_fname
+
+
+def mne_anonymize_dir(dir_name, out_dir, keep_his, daysback, overwrite,
+                      header_only=False, n_jobs=1):
+    """Anonymize all raw fif files in a directory.
+
+    Parameters
+    ----------
+    dir_name : str
+        Directory to search (recursively) for raw fif files.
+    out_dir : str | None
+        Output directory, the directory structure of dir_name is reproduced
+        in it. None will save each file in its own directory with the
+        default prefix.
+    keep_his : bool
+        If True his_id of subject_info will NOT be overwritten.
+    daysback : int | None
+        Number of days to subtract from all dates.
+    overwrite : bool
+        Overwrite output files if they already exist.
+    header_only : bool
+        If True, copy the data buffers byte for byte
+        (see :func:`mne_anonymize`).
+    n_jobs : int
+        Number of files to anonymize in parallel.
+
+    Returns
+    -------
+    out_fnames : list of str
+        The names of the anonymized files.
+    """
+    from mne.parallel import parallel_func
+    fif_fnames = list()
+    for root, dirs, files in os.walk(dir_name):
+        dirs.sort()
+        fif_fnames.extend(op.join(root, fname) for fname in sorted(files)
+                          if fname.endswith(RAW_FIF_ENDINGS) and
+                          not fname.startswith(ANONYMIZE_FILE_PREFIX + '-'))
+    out_fnames = list()
+    for fif_fname in fif_fnames:
+        if out_dir is None:
+            out_fnames.append(None)
+        else:
+            out_fname = op.join(out_dir, op.relpath(fif_fname, dir_name))
+            os.makedirs(op.dirname(out_fname), exist_ok=True)
+            out_fnames.append(op.abspath(out_fname))
+    parallel, p_fun, _ = parallel_func(_anonymize_part, n_jobs)
+    out_fnames = parallel(p_fun(fif_fname, out_fname, keep_his, daysback,
+                                overwrite, header_only)
+                          for fif_fname, out_fname in zip(fif_fnames,
+                                                          out_fnames))
+    return [out_fname for out_fname in out_fnames if out_fname is not None]
+
+
+def _anonymize_part(fif_fname, out_fname, keep_his, daysback, overwrite,
+                    header_only):
+    """Anonymize a file unless it continues a split file."""
+    from mne.io.constants import FIFF
+    from mne.io.open import fiff_open
+    from mne.io.tag import read_tag
+    from mne.io.tree import dir_tree_find
+    fid, tree, _ = fiff_open(fif_fname)
+    with fid:
+        for ref in dir_tree_find(tree, FIFF.FIFFB_REF):
+            for ent in ref['directory']:
+                if ent.kind == FIFF.FIFF_REF_ROLE and read_tag(
+                        fid, ent.pos).data == FIFF.FIFFV_ROLE_PREV_FILE:
+                    return None  # anonymized along with the first part
+    return mne_anonymize(fif_fname, out_fname, keep_his, daysback,
+                         overwrite, header_only)
 
 
 def run():
@@ -64,10 +163,11 @@ def run():
     parser = get_optparser(__file__)
 
     parser.add_option("-f", "--file", type="string", dest="file",
-                      help="Name of file to modify.", metavar="FILE",
-                      default=None)
+                      help="Name of file (or directory of files) to modify.",
+                      metavar="FILE", default=None)
     parser.add_option("-o", "--output", type="string", dest="output",
-                      help="Name of anonymized output file."
+                      help="Name of anonymized output file (or directory "
+                      "if FILE is a directory). "
                       "`anon-` prefix is added to FILE if not given",
                       metavar="OUTFILE", default=None)
     parser.add_option("--keep_his", dest="keep_his", action="store_true",
@@ -77,6 +177,13 @@ def run():
                       metavar="N_DAYS", default=None)
     parser.add_option("--overwrite", dest="overwrite", action="store_true",
                       help="Overwrite input file.", default=False)
+    parser.add_option("--header-only", dest="header_only",
+                      action="store_true",
+                      help="Only rewrite the measurement info and copy the "
+                      "data unchanged (faster).", default=False)
+    parser.add_option("-j", "--n-jobs", dest="n_jobs", type="int",
+                      help="Number of files to anonymize in parallel when "
+                      "FILE is a directory.", default=1)
 
     options, args = parser.parse_args()
     if options.file is None:
@@ -88,10 +195,16 @@ def run():
     keep_his = options.keep_his
     daysback = options.daysback
     overwrite = options.overwrite
+    header_only = options.header_only
+    if op.isdir(fname):
+        mne_anonymize_dir(fname, out_fname, keep_his, daysback, overwrite,
+                          header_only, options.n_jobs)
+        return
     if not fname.endswith('.fif'):
         raise ValueError('%s does not seem to be a .fif file.' % fname)
 
-    mne_anonymize(fname, out_fname, keep_his, daysback, overwrite)
+    mne_anonymize(fname, out_fname, keep_his, daysback, overwrite,
+                  header_only)
 
 
 is_main = (__name__ == '__main__')
@@ -6,7 +6,7 @@ import glob
 
 import numpy as np
 import pytest
-from numpy.testing import assert_equal, assert_allclose
+from numpy.testing import assert_equal, assert_allclose, assert_array_equal
 
 from mne import (concatenate_raws, read_bem_surfaces, read_surface,
                  read_source_spaces, read_bem_solution)
@@ -392,6 +392,34 @@ def test_anonymize(tmpdir):
     info = read_info(out_fname)
     assert(op.exists(out_fname))
     assert info['meas_date'] == _stamp_to_dt((946684800, 0))
+    # header-only copy of the data buffers
+    raw = read_raw_fif(raw_fname)
+    hdr_fname = op.join(tmpdir, 'anon_hdr_raw.fif')
+    with ArgvSetter(('-f', raw_fname, '-o', hdr_fname, '--header-only')):
+        mne_anonymize.run()
+    raw_hdr = read_raw_fif(hdr_fname)
+    assert raw_hdr.info['meas_date'] == info['meas_date']
+    assert raw_hdr.info['subject_info'] == info['subject_info']
+    assert_array_equal(raw_hdr.get_data(), raw.get_data())
+    # directories
+    in_dir = op.join(tmpdir, 'in')
+    os.makedirs(op.join(in_dir, 'sub'))
+    shutil.copyfile(raw_fname, op.join(in_dir, 'sub', 'test_raw.fif'))
+    raw.crop(0, 5).save(op.join(in_dir, 'test_raw.fif'), split_size='5MB')
+    shutil.copyfile(raw_fname, op.join(in_dir, 'test-eve.fif'))  # not raw
+    out_dir = op.join(tmpdir, 'out')
+    with ArgvSetter(('-f', in_dir, '-o', out_dir, '--header-only')):
+        mne_anonymize.run()
+    assert 'test_raw-1.fif' in os.listdir(in_dir)
+    # split files are rewritten (and only once)
+    assert sorted(os.listdir(out_dir)) == ['sub', 'test_raw.fif']
+    raw_hdr = read_raw_fif(op.join(out_dir, 'sub', 'test_raw.fif'))
+    assert_array_equal(raw_hdr.get_data(),
+                       read_raw_fif(raw_fname).get_data())
+    assert raw_hdr.info['meas_date'] == info['meas_date']
+    raw_split = read_raw_fif(op.join(out_dir, 'test_raw.fif'))
+    assert_allclose(raw_split.get_data(), raw.get_data(), rtol=1e-6)
+    assert raw_split.info['meas_date'] == info['meas_date']
 
 
 run_tests_if_main()
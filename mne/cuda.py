@@ -2,6 +2,8 @@
 #
 # License: BSD (3-clause)
 
+from functools import partial
+
 import numpy as np
 
 from .fixes import _import_fft
@@ -121,7 +123,8 @@ def _setup_cuda_fft_multiply_repeated(n_jobs, h, n_fft,
     ----------
     n_jobs : int | str
         If n_jobs == 'cuda', the function will attempt to set up for CUDA
-        FFT multiplication.
+        FFT multiplication. If n_jobs == 'fft-threads', the FFTs will use
+        :func:`scipy.fft.rfft` with multiple worker threads.
     h : array
         The filtering function that will be used repeatedly.
     n_fft : int
@@ -132,8 +135,8 @@ def _setup_cuda_fft_multiply_repeated(n_jobs, h, n_fft,
     Returns
     -------
     n_jobs : int
-        Sets n_jobs = 1 if n_jobs == 'cuda' was passed in, otherwise
-        original n_jobs is passed.
+        Sets n_jobs = 1 if n_jobs == 'cuda' or 'fft-threads' was passed in,
+        otherwise original n_jobs is passed.
     cuda_dict : dict
         Dictionary with the following CUDA-related variables:
             use_cuda : bool
@@ -176,6 +179,9 @@ def _setup_cuda_fft_multiply_repeated(n_jobs, h, n_fft,
         else:
             logger.info('CUDA not used, CUDA could not be initialized, '
                         'falling back to n_jobs=1')
+    elif n_jobs == 'fft-threads':
+        n_jobs = 1
+        cuda_dict.update(_setup_fft_threads(kind))
     return n_jobs, cuda_dict
 
 
@@ -215,7 +221,8 @@ def _setup_cuda_fft_resample(n_jobs, W, new_len):
     ----------
     n_jobs : int | str
         If n_jobs == 'cuda', the function will attempt to set up for CUDA
-        FFT resampling.
+        FFT resampling. If n_jobs == 'fft-threads', the FFTs will use
+        :func:`scipy.fft.rfft` with multiple worker threads.
     W : array
         The filtering function to be used during resampling.
         If n_jobs='cuda', this function will be shortened (since CUDA
@@ -227,8 +234,8 @@ def _setup_cuda_fft_resample(n_jobs, W, new_len):
     Returns
     -------
     n_jobs : int
-        Sets n_jobs = 1 if n_jobs == 'cuda' was passed in, otherwise
-        original n_jobs is passed.
+        Sets n_jobs = 1 if n_jobs == 'cuda' or 'fft-threads' was passed in,
+        otherwise original n_jobs is passed.
     cuda_dict : dict
         Dictionary with the following CUDA-related variables:
             use_cuda : bool
@@ -274,10 +281,36 @@ def _setup_cuda_fft_resample(n_jobs, W, new_len):
         else:
             logger.info('CUDA not used, CUDA could not be initialized, '
                         'falling back to n_jobs=1')
+    elif n_jobs == 'fft-threads':
+        n_jobs = 1
+        cuda_dict.update(_setup_fft_threads('FFT resampling'))
     cuda_dict['W'] = W
     return n_jobs, cuda_dict
 
 
+def _threaded_fft(workers):
+    """Get rfft and irfft functions that use FFT worker threads."""
+    rfft, irfft = _import_fft(('rfft', 'irfft'))
+    # only scipy.fft can use threads, numpy.fft is always single-threaded
+    if workers != 1 and rfft.__module__.startswith('scipy.fft'):
+        rfft = partial(rfft, workers=workers)
+        irfft = partial(irfft, workers=workers)
+    return rfft, irfft
+
+
+def _setup_fft_threads(kind):
+    """Set up threaded CPU FFTs, using MNE_FFT_THREADS threads."""
+    from .parallel import check_n_jobs
+    workers = check_n_jobs(int(get_config('MNE_FFT_THREADS', '-1')))
+    rfft, irfft = _threaded_fft(workers)
+    if isinstance(rfft, partial):
+        logger.info('Using %d FFT threads for %s' % (workers, kind))
+    else:
+        logger.info('Using 1 FFT thread for %s' % (kind,))
+    # pocketfft caches and reuses the plan of each FFT length and thread
+    return dict(rfft=rfft, irfft=irfft)
+
+
 def _cuda_upload_rfft(x, n, axis=-1):
     """Upload and compute rfft."""
     import cupy
@@ -296,8 +329,9 @@ def _fft_resample(x, new_len, npads, to_removes, cuda_dict=None,
 
     Parameters
     ----------
-    x : 1-d array
-        The array to resample. Will be converted to float64 if necessary.
+    x : array, shape (..., n_times)
+        The array to resample along its last axis. Will be converted to
+        float64 if necessary.
     new_len : int
         The size of the output array (before removing padding).
     npads : tuple of int
@@ -317,7 +351,7 @@ def _fft_resample(x, new_len, npads, to_removes, cuda_dict=None,
 
     Returns
     -------
-    x : 1-d array
+    x : array, shape (..., n_times_new)
         Filtered version of x.
     """
     cuda_dict = dict(use_cuda=False) if cuda_dict is None else cuda_dict
@@ -325,19 +359,19 @@ def _fft_resample(x, new_len, npads, to_removes, cuda_dict=None,
     if x.dtype != np.float64:
         x = x.astype(np.float64)
     x = _smart_pad(x, npads, pad)
-    old_len = len(x)
+    old_len = x.shape[-1]
     shorter = new_len < old_len
     use_len = new_len if shorter else old_len
     x_fft = cuda_dict['rfft'](x, None)
     if use_len % 2 == 0:
         nyq = use_len // 2
-        x_fft[nyq:nyq + 1] *= 2 if shorter else 0.5
+        x_fft[..., nyq:nyq + 1] *= 2 if shorter else 0.5
     x_fft *= cuda_dict['W']
     y = cuda_dict['irfft'](x_fft, new_len)
 
     # now let's trim it back to the correct size (if there was padding)
     if (to_removes > 0).any():
-        y = y[to_removes[0]:y.shape[0] - to_removes[1]]
+        y = y[..., to_removes[0]:y.shape[-1] - to_removes[1]]
 
     return y
 
@@ -347,7 +381,7 @@ def _fft_resample(x, new_len, npads, to_removes, cuda_dict=None,
 
 # this has to go in mne.cuda instead of mne.filter to avoid import errors
 def _smart_pad(x, n_pad, pad='reflect_limited'):
-    """Pad vector x."""
+    """Pad vector x, or each vector along the last axis of x."""
     n_pad = np.asarray(n_pad)
     assert n_pad.shape == (2,)
     if (n_pad == 0).all():
@@ -356,9 +390,11 @@ def _smart_pad(x, n_pad, pad='reflect_limited'):
         raise RuntimeError('n_pad must be non-negative')
     if pad == 'reflect_limited':
         # need to pad with zeros if len(x) <= npad
-        l_z_pad = np.zeros(max(n_pad[0] - len(x) + 1, 0), dtype=x.dtype)
-        r_z_pad = np.zeros(max(n_pad[1] - len(x) + 1, 0), dtype=x.dtype)
-        return np.concatenate([l_z_pad, 2 * x[0] - x[n_pad[0]:0:-1], x,
-                               2 * x[-1] - x[-2:-n_pad[1] - 2:-1], r_z_pad])
+        shape, n_x = x.shape[:-1], x.shape[-1]
+        l_z_pad = np.zeros(shape + (max(n_pad[0] - n_x + 1, 0),), x.dtype)
+        r_z_pad = np.zeros(shape + (max(n_pad[1] - n_x + 1, 0),), x.dtype)
+        return np.concatenate([
+            l_z_pad, 2 * x[..., :1] - x[..., n_pad[0]:0:-1], x,
+            2 * x[..., -1:] - x[..., -2:-n_pad[1] - 2:-1], r_z_pad], axis=-1)
     else:
-        return np.pad(x, (tuple(n_pad),), pad)
+        return np.pad(x, ((0, 0),) * (x.ndim - 1) + (tuple(n_pad),), pad)
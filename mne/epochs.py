@@ -13,9 +13,11 @@
 
 from collections import Counter
 from copy import deepcopy
+from functools import partial
 import json
 import operator
 import os.path as op
+import threading
 
 import numpy as np
 
@@ -34,17 +36,19 @@ from .io.pick import (channel_indices_by_type, channel_type,
                       pick_channels, pick_info, _pick_data_channels,
                       _DATA_CH_TYPES_SPLIT, _picks_to_idx)
 from .io.proj import setup_proj, ProjMixin, _proj_equal
-from .io.base import BaseRaw, TimeMixin
+from .io.base import BaseRaw, TimeMixin, _allocate_data
 from .bem import _check_origin
 from .evoked import EvokedArray, _check_decim
+from .annotations import _bad_annotation_overlaps
 from .baseline import rescale, _log_rescale, _check_baseline
 from .channels.channels import (ContainsMixin, UpdateChannelsMixin,
                                 SetChannelsMixin, InterpolationMixin)
 from .filter import detrend, FilterMixin, _check_fun
-from .parallel import parallel_func
+from .parallel import (parallel_func, check_n_jobs, _prefetch,
+                       _shared_empty, _is_shared, _shared_ref, _run_inplace)
 
 from .event import _read_events_fif, make_fixed_length_events
-from .fixes import _get_args, rng_uniform
+from .fixes import _get_args, rng_uniform, _median_complex
 from .viz import (plot_epochs, plot_epochs_psd, plot_epochs_psd_topomap,
                   plot_epochs_image, plot_topo_image_epochs, plot_drop_log)
 from .utils import (_check_fname, check_fname, logger, verbose,
@@ -56,10 +60,14 @@ from .utils import (_check_fname, check_fname, logger, verbose,
                     _check_combine, ShiftTimeMixin, _build_data_frame,
                     _check_pandas_index_arguments, _convert_times,
                     _scale_dataframe_data, _check_time_format, object_size,
-                    _on_missing, _validate_type, _ensure_events)
+                    _on_missing, _validate_type, _ensure_events,
+                    _check_preload_dtype)
 from .utils.docs import fill_doc
 from .data.html_templates import epochs_template
 
+# Maximum size (in bytes) of the raw windows read at once by lazy Epochs
+_RAW_WINDOW_SIZE = 64 * 1024 * 1024
+
 
 def _pack_reject_params(epochs):
     reject_params = dict()
@@ -343,7 +351,7 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
     %(epochs_detrend)s
     %(proj_epochs)s
     %(epochs_on_missing)s
-    preload_at_end : bool
+    preload_at_end : bool | str
         %(epochs_preload)s
     selection : iterable | None
         Iterable of indices of selected epochs. If ``None``, will be
@@ -364,6 +372,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
     used as a constructor for Epochs objects (use instead :class:`mne.Epochs`).
     """
 
+    _preload_dtype = None  # precision used by load_data (None for float64)
+
     @verbose
     def __init__(self, info, data, events, event_id=None, tmin=-0.2, tmax=0.5,
                  baseline=(None, 0), raw=None, picks=None, reject=None,
@@ -546,7 +556,9 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         if preload_at_end:
             assert self._data is None
             assert self.preload is False
-            self.load_data()  # this will do the projection
+            # this will do the projection
+            self._load_data(data_buffer=None if isinstance(
+                preload_at_end, (bool, np.bool_)) else preload_at_end)
         elif proj is True and self._projector is not None and data is not None:
             # let's make sure we project if data was provided and proj
             # requested
@@ -583,9 +595,15 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         self.drop_log = (tuple(),) * len(self.events)
         self._check_consistency()
 
-    def load_data(self):
+    @fill_doc
+    def load_data(self, dtype=None, shared_memory=False):
         """Load the data if not already preloaded.
 
+        Parameters
+        ----------
+        %(preload_dtype)s
+        %(preload_shared_memory)s
+
         Returns
         -------
         epochs : instance of Epochs
@@ -593,13 +611,34 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
 
         Notes
         -----
-        This function operates in-place.
+        This function operates in-place. If data were already preloaded,
+        they are only converted to ``dtype`` or moved to shared memory (if
+        requested).
 
         .. versionadded:: 0.10.0
         """
+        _validate_type(shared_memory, bool, 'shared_memory')
+        return self._load_data(dtype, shared_memory)
+
+    def _load_data(self, dtype=None, shared_memory=False, data_buffer=None):
+        """Load the data, optionally into a memory-mapped file."""
+        if dtype is None:
+            dtype = self._preload_dtype
         if self.preload:
+            dtype = _check_preload_dtype(dtype, self._data.dtype)
+            if shared_memory and not _is_shared(self._data):
+                data = _shared_empty(self._data.shape, dtype)
+                data[:] = self._data
+                self._data = data
+            elif data_buffer is not None:
+                data = _allocate_data(data_buffer, self._data.shape, dtype)
+                data[:] = self._data
+                self._data = data
+            elif dtype != self._data.dtype:
+                self._data = self._data.astype(dtype)
             return self
-        self._data = self._get_data()
+        self._data = self._get_data(dtype=dtype, shared_memory=shared_memory,
+                                    data_buffer=data_buffer)
         self.preload = True
         self._do_baseline = False
         self._decim_slice = slice(None, None, None)
@@ -651,9 +690,13 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         self.info['sfreq'] = new_sfreq
         if self.preload:
             if decim != 1:
-                self._data = self._data[:, :, decim_slice].copy()
+                if isinstance(self._data, np.memmap) and \
+                        self._data.flags['C_CONTIGUOUS']:
+                    self._data = _decimate_inplace(self._data, decim_slice)
+                else:
+                    self._data = self._data[:, :, decim_slice].copy()
                 self._raw_times = self._raw_times[decim_slice].copy()
-            else:
+            elif not self._data.flags['C_CONTIGUOUS']:
                 self._data = np.ascontiguousarray(self._data)
             self._decim_slice = slice(None)
             self._decim = 1
@@ -796,6 +839,65 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
                             self.reject, self.flat, full_report=True,
                             ignore_chs=self.info['bads'])
 
+    def _check_epochs(self, epochs):
+        """Get the drop log entries of many epochs (None for good ones)."""
+        bad_tuples = [None] * len(epochs)
+        n_times = len(self.times)
+        check = list()
+        for ii, epoch in enumerate(epochs):
+            if isinstance(epoch, str):
+                bad_tuples[ii] = (epoch,)
+            elif epoch is None:
+                bad_tuples[ii] = ('NO_DATA',)
+            elif epoch.shape[1] < n_times:
+                bad_tuples[ii] = ('TOO_SHORT',)
+            else:
+                check.append(ii)
+        if (self.reject is None and self.flat is None) or len(check) == 0:
+            return bad_tuples
+        if isinstance(epochs, np.ndarray):
+            data = epochs
+        else:
+            data = np.array([epochs[ii] for ii in check])
+        if self._reject_time is not None:
+            data = data[..., self._reject_time]
+        for ii, bad_tuple in zip(check, _get_bad_tuples(
+                data, self.ch_names, self._channel_type_idx, self.reject,
+                self.flat, ignore_chs=self.info['bads'])):
+            bad_tuples[ii] = bad_tuple
+        return bad_tuples
+
+    def _iter_checked_epochs(self):
+        """Iterate over the epochs along with their drop log entries.
+
+        Rejection is evaluated for blocks of epochs at once.
+        """
+        n_events = len(self.events)
+        n_block = self._block_size()
+        if not self.preload:
+            detrend_picks = self._detrend_picks
+            raw_epochs = self._get_epochs_from_raw(range(n_events))
+        for start in range(0, n_events, n_block):
+            stop = min(start + n_block, n_events)
+            if self.preload:  # from memory
+                epochs = self._data[start:stop]
+                if self._do_delayed_proj:
+                    epochs_noproj = epochs
+                    epochs = np.empty(epochs.shape, epochs.dtype)
+                    for ii, epoch in enumerate(epochs_noproj):
+                        epochs[ii] = self._project_epoch(epoch)
+                else:
+                    epochs_noproj = [None] * len(epochs)
+            else:  # from disk
+                epochs_noproj = [
+                    self._detrend_offset_decim(next(raw_epochs), detrend_picks)
+                    for _ in range(start, stop)]
+                epochs = [self._project_epoch(epoch)
+                          for epoch in epochs_noproj]
+            bad_tuples = self._check_epochs(epochs)
+            for ii in range(stop - start):
+                yield epochs_noproj[ii], epochs[ii], bad_tuples[ii]
+
     @verbose
     def _detrend_offset_decim(self, epoch, picks, verbose=None):
         """Aux Function: detrend, baseline correct, offset, decim.
@@ -857,6 +959,104 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
 
             yield EvokedArray(data, info, tmin, comment=str(event_id))
 
+    def iter_data(self, batch_size=None, prefetch=1, n_jobs=1,
+                  return_event_id=False):
+        """Iterate over the epochs data, preparing the next epochs ahead.
+
+        Parameters
+        ----------
+        batch_size : int | None
+            Number of epochs in each mini-batch. If None (default), the epochs
+            are yielded one at a time.
+        prefetch : int
+            Number of epochs (or mini-batches) that are read and processed in
+            the background while the current one is used.
+        n_jobs : int
+            Number of threads used to process the epochs ahead. Reading from
+            disk is done by one thread at a time, while projection and
+            rejection run in parallel.
+        return_event_id : bool
+            If True, also yield the event IDs.
+
+        Yields
+        ------
+        data : array
+            The data of one epoch, shape (n_channels, n_times) or, if
+            ``batch_size`` is not None, of a mini-batch of epochs, shape
+            (n_epochs, n_channels, n_times).
+        event_id : int | array of int, shape (n_epochs,)
+            The event ID(s). Only yielded if ``return_event_id`` is True.
+
+        See Also
+        --------
+        mne.Epochs.next
+
+        Notes
+        -----
+        The epochs are yielded in order, and bad epochs are skipped as
+        when iterating over the Epochs object, so the output does not depend
+        on ``prefetch`` or ``n_jobs``. As with iteration, ``drop_log`` is
+        not updated (see :meth:`mne.Epochs.drop_bad`). With ``batch_size``,
+        the last mini-batch can be smaller than the others.
+
+        This does not change the iteration state of the object.
+
+        .. versionadded:: 0.23
+        """
+        _validate_type(batch_size, (None, 'int-like'), 'batch_size')
+        _validate_type(prefetch, 'int-like', 'prefetch')
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('batch_size must be at least 1, got %s'
+                             % (batch_size,))
+        if prefetch < 0:
+            raise ValueError('prefetch must be at least 0, got %s'
+                             % (prefetch,))
+        n_jobs = check_n_jobs(n_jobs)
+        step = 1 if batch_size is None else int(batch_size)
+        n_epochs = len(self._data) if self.preload else len(self.events)
+        chunks = [np.arange(start, min(start + step, n_epochs))
+                  for start in range(0, n_epochs, step)]
+        detrend_picks = self._detrend_picks
+        lock = threading.Lock()
+
+        def _prepare(idxs):
+            if self.preload:
+                return list(self._data[idxs[0]:idxs[-1] + 1]), idxs
+            # reading (and everything that sets the logging level) is done
+            # by one thread at a time
+            with lock:
+                epochs_noproj = [
+                    self._detrend_offset_decim(epoch, detrend_picks)
+                    for epoch in self._get_epochs_from_raw(idxs)]
+            epochs = [self._project_epoch(epoch) for epoch in epochs_noproj]
+            if self._do_delayed_proj:
+                epochs_out = epochs_noproj
+            else:
+                epochs_out = epochs
+            good = [ii for ii, bad_tuple in enumerate(
+                self._check_epochs(epochs)) if bad_tuple is None]
+            return [epochs_out[ii] for ii in good], idxs[good]
+
+        data, idxs = list(), list()
+        for chunk_data, chunk_idxs in _prefetch(
+                _prepare, chunks, int(prefetch), n_jobs):
+            data.extend(chunk_data)
+            idxs.extend(chunk_idxs)
+            while len(data) >= step:
+                yield self._make_batch(data[:step], idxs[:step], batch_size,
+                                       return_event_id)
+                del data[:step], idxs[:step]
+        if len(data) > 0:
+            yield self._make_batch(data, idxs, batch_size, return_event_id)
+
+    def _make_batch(self, data, idxs, batch_size, return_event_id):
+        """Assemble epochs and event IDs for iter_data."""
+        if batch_size is None:
+            data, event_id = data[0], self.events[idxs[0], 2]
+        else:
+            data, event_id = np.array(data), self.events[idxs, 2]
+        return (data, event_id) if return_event_id else data
+
     def subtract_evoked(self, evoked=None):
         """Subtract an evoked response from each epoch.
 
@@ -930,7 +1130,7 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         return self
 
     @fill_doc
-    def average(self, picks=None, method="mean"):
+    def average(self, picks=None, method="mean", by_event_type=False):
         """Compute an average over epochs.
 
         Parameters
@@ -938,23 +1138,26 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         %(picks_all_data)s
         method : str | callable
             How to combine the data. If "mean"/"median", the mean/median
-            are returned.
+            are returned. If "approx_median", an approximation of the median
+            is computed in a single pass with bounded memory (see Notes).
             Otherwise, must be a callable which, when passed an array of shape
             (n_epochs, n_channels, n_time) returns an array of shape
             (n_channels, n_time).
             Note that due to file type limitations, the kind for all
             these will be "average".
+        %(by_event_type)s
 
         Returns
         -------
-        evoked : instance of Evoked | dict of Evoked
-            The averaged epochs.
+        %(evoked_by_event_type_returns)s
 
         Notes
         -----
         Computes an average of all epochs in the instance, even if
         they correspond to different conditions. To average by condition,
-        do ``epochs[condition].average()`` for each condition separately.
+        use ``by_event_type=True``, which reads the data only once for all
+        conditions (instead of ``epochs[condition].average()`` for each
+        condition separately).
 
         When picks is None and epochs contain only ICA channels, no channels
         are selected, resulting in an error. This is because ICA channels
@@ -969,25 +1172,42 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
             >>> epochs.average(method=trim)  # doctest:+SKIP
 
         This would compute the trimmed mean.
+
+        If the data are not preloaded, only "mean" and "approx_median" can be
+        used, and the epochs are read once. "approx_median" uses the remedian
+        :footcite:`RousseeuwBassett1990`: the medians of groups of 11
+        epochs are combined recursively, so the result is exact for up to 11
+        epochs and only a few groups of epochs are kept in memory.
+
+        References
+        ----------
+        .. footbibliography::
         """
-        return self._compute_aggregate(picks=picks, mode=method)
+        return self._compute_aggregate(picks=picks, mode=method,
+                                       by_event_type=by_event_type)
 
     @fill_doc
-    def standard_error(self, picks=None):
+    def standard_error(self, picks=None, by_event_type=False):
         """Compute standard error over epochs.
 
         Parameters
         ----------
         %(picks_all_data)s
+        %(by_event_type)s
 
         Returns
         -------
-        evoked : instance of Evoked
-            The standard error over epochs.
+        %(std_err_by_event_type_returns)s
+
+        Notes
+        -----
+        If the data are not preloaded, the mean and variance are computed
+        in a single pass over the epochs.
         """
-        return self._compute_aggregate(picks, "std")
+        return self._compute_aggregate(picks, "std",
+                                       by_event_type=by_event_type)
 
-    def _compute_aggregate(self, picks, mode='mean'):
+    def _compute_aggregate(self, picks, mode='mean', by_event_type=False):
         """Compute the mean, median, or std over epochs and return Evoked."""
         # if instance contains ICA channels they won't be included unless picks
         # is specified
@@ -999,54 +1219,77 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
             elif np.any(check_ICA):
                 warn('ICA channels will not be included unless explicitly '
                      'selected in picks')
+        _validate_type(by_event_type, bool, 'by_event_type')
+        if by_event_type:
+            comments = list(self.event_id)
+            groups = [np.atleast_1d(self.event_id[key]) for key in comments]
+        else:
+            comments = [self._name]
+            groups = [np.unique(self.events[:, 2])]
 
-        n_channels = len(self.ch_names)
-        n_times = len(self.times)
-
-        if self.preload:
-            n_events = len(self.events)
+        if self.preload and mode != 'approx_median':
             fun = _check_combine(mode, valid=('mean', 'median', 'std'))
-            data = fun(self._data)
             assert len(self.events) == len(self._data)
-            if data.shape != self._data.shape[1:]:
-                raise RuntimeError(
-                    'You passed a function that resulted n data of shape {}, '
-                    'but it should be {}.'.format(
-                        data.shape, self._data.shape[1:]))
+            results = list()
+            for group in groups:
+                if by_event_type:
+                    data = self._data[np.in1d(self.events[:, 2], group)]
+                else:
+                    data = self._data
+                n_events = len(data)
+                data = fun(data)
+                if data.shape != self._data.shape[1:]:
+                    raise RuntimeError(
+                        'You passed a function that resulted n data of shape '
+                        '{}, but it should be {}.'.format(
+                            data.shape, self._data.shape[1:]))
+                results.append((data, n_events))
         else:
-            if mode not in {"mean", "std"}:
+            if mode not in {"mean", "std", "approx_median"}:
                 raise ValueError("If data are not preloaded, can only compute "
-                                 "mean or standard deviation.")
-            data = np.zeros((n_channels, n_times))
-            n_events = 0
-            for e in self:
-                if np.iscomplexobj(e):
-                    data = data.astype(np.complex128)
-                data += e
-                n_events += 1
-
-            if n_events > 0:
-                data /= n_events
-            else:
-                data.fill(np.nan)
-
-            # convert to stderr if requested, could do in one pass but do in
-            # two (slower) in case there are large numbers
-            if mode == "std":
-                data_mean = data.copy()
-                data.fill(0.)
-                for e in self:
-                    data += (e - data_mean) ** 2
-                data = np.sqrt(data / n_events)
+                                 "mean, approx_median or standard deviation.")
+            results = self._aggregate_stream(mode, groups)
 
         if mode == "std":
             kind = 'standard_error'
-            data /= np.sqrt(n_events)
         else:
             kind = "average"
+        evokeds = list()
+        for comment, (data, n_events) in zip(comments, results):
+            if mode == "std":
+                data /= np.sqrt(n_events)
+            evokeds.append(self._evoked_from_epoch_data(
+                data, self.info, picks, n_events, kind, comment))
+        return evokeds if by_event_type else evokeds[0]
+
+    def _aggregate_stream(self, mode, groups):
+        """Aggregate the epochs of each group in a single pass."""
+        if mode == 'approx_median':
+            stats = [_Remedian() for _ in groups]
+        else:
+            stats = [_Welford(var=mode == 'std') for _ in groups]
+        for data, event_ids in self.iter_data(
+                batch_size=self._block_size(), return_event_id=True):
+            for group, stat in zip(groups, stats):
+                if len(groups) > 1:
+                    mask = np.in1d(event_ids, group)
+                    if mask.any():
+                        stat.update(data[mask])
+                else:
+                    stat.update(data)
+        results = list()
+        for stat in stats:
+            if stat.n == 0:
+                data = np.full((len(self.ch_names), len(self.times)), np.nan)
+            else:
+                data = stat.result()
+            results.append((data, stat.n))
+        return results
 
-        return self._evoked_from_epoch_data(data, self.info, picks, n_events,
-                                            kind, self._name)
+    def _block_size(self):
+        """Get the number of epochs processed at once for out-of-core ops."""
+        return max(_RAW_WINDOW_SIZE // (
+            8 * len(self.ch_names) * len(self.times)), 1)
 
     @property
     def _name(self):
@@ -1297,6 +1540,11 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         """Get a given epoch from disk."""
         raise NotImplementedError
 
+    def _get_epochs_from_raw(self, idxs):
+        """Get the given epochs from disk (a generator)."""
+        for idx in idxs:
+            yield self._get_epoch_from_raw(idx)
+
     def _project_epoch(self, epoch):
         """Process a raw epoch based on the delayed param."""
         # whenever requested, the first epoch is being projected.
@@ -1309,7 +1557,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         return epoch
 
     @verbose
-    def _get_data(self, out=True, picks=None, item=None, verbose=None):
+    def _get_data(self, out=True, picks=None, item=None, dtype=None,
+                  shared_memory=False, data_buffer=None, verbose=None):
         """Load all data, dropping bad epochs along the way.
 
         Parameters
@@ -1318,8 +1567,20 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
             Return the data. Setting this to False is used to reject bad
             epochs without caching all the data, which saves memory.
         %(picks_all)s
+        dtype : None | str
+            Precision used to store the data (see ``load_data``).
+        shared_memory : bool
+            Store the data in shared memory (see ``load_data``).
+        data_buffer : None | str
+            Path to a memory-mapped file used to store the data.
         %(verbose_meth)s
         """
+        if shared_memory:
+            empty = _shared_empty
+        elif data_buffer is not None:
+            empty = partial(_allocate_data, data_buffer)
+        else:
+            empty = np.empty
         if item is None:
             item = slice(None)
         elif not self._bad_dropped:
@@ -1352,9 +1613,9 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
 
             # we need to load from disk, drop, and return data
             detrend_picks = self._detrend_picks
-            for ii, idx in enumerate(use_idx):
+            raw_epochs = self._get_epochs_from_raw(use_idx)
+            for ii, epoch_noproj in enumerate(raw_epochs):
                 # faster to pre-allocate memory here
-                epoch_noproj = self._get_epoch_from_raw(idx)
                 epoch_noproj = self._detrend_offset_decim(
                     epoch_noproj, detrend_picks)
                 if self._do_delayed_proj:
@@ -1362,8 +1623,10 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
                 else:
                     epoch_out = self._project_epoch(epoch_noproj)
                 if ii == 0:
-                    data = np.empty((n_events, len(self.ch_names),
-                                     len(self.times)), dtype=epoch_out.dtype)
+                    data = empty((n_events, len(self.ch_names),
+                                  len(self.times)),
+                                 dtype=_check_preload_dtype(
+                                     dtype, epoch_out.dtype))
                 data[ii] = epoch_out
         else:
             # bads need to be dropped, this might occur after a preload
@@ -1372,26 +1635,11 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
             n_out = 0
             drop_log = list(self.drop_log)
             assert n_events == len(self.selection)
-            if not self.preload:
-                detrend_picks = self._detrend_picks
-            for idx, sel in enumerate(self.selection):
-                if self.preload:  # from memory
-                    if self._do_delayed_proj:
-                        epoch_noproj = self._data[idx]
-                        epoch = self._project_epoch(epoch_noproj)
-                    else:
-                        epoch_noproj = None
-                        epoch = self._data[idx]
-                else:  # from disk
-                    epoch_noproj = self._get_epoch_from_raw(idx)
-                    epoch_noproj = self._detrend_offset_decim(
-                        epoch_noproj, detrend_picks)
-                    epoch = self._project_epoch(epoch_noproj)
-
+            checked_epochs = self._iter_checked_epochs()
+            for idx, (sel, (epoch_noproj, epoch, bad_tuple)) in enumerate(
+                    zip(self.selection, checked_epochs)):
                 epoch_out = epoch_noproj if self._do_delayed_proj else epoch
-                is_good, bad_tuple = self._is_good_epoch(
-                    epoch, verbose=verbose)
-                if not is_good:
+                if bad_tuple is not None:
                     assert isinstance(bad_tuple, tuple)
                     assert all(isinstance(x, str) for x in bad_tuple)
                     drop_log[sel] = drop_log[sel] + bad_tuple
@@ -1402,9 +1650,10 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
                 if out or self.preload:
                     # faster to pre-allocate, then trim as necessary
                     if n_out == 0 and not self.preload:
-                        data = np.empty((n_events, epoch_out.shape[0],
-                                         epoch_out.shape[1]),
-                                        dtype=epoch_out.dtype, order='C')
+                        data = empty((n_events, epoch_out.shape[0],
+                                      epoch_out.shape[1]),
+                                     dtype=_check_preload_dtype(
+                                         dtype, epoch_out.dtype))
                     data[n_out] = epoch_out
                     n_out += 1
             self.drop_log = tuple(drop_log)
@@ -1505,6 +1754,11 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
                 for idx in picks:
                     self._data[:, idx, :] = _check_fun(fun, data_in[:, idx, :],
                                                        *args, **kwargs)
+            elif _is_shared(self._data):  # workers modify data in place
+                parallel, p_fun, _ = parallel_func(_run_inplace, n_jobs)
+                parallel(p_fun(partial(_check_fun, fun),
+                               _shared_ref(self._data[:, p, :]), *args,
+                               **kwargs) for p in picks)
             else:
                 # use parallel function
                 parallel, p_fun, _ = parallel_func(_check_fun, n_jobs)
@@ -1617,9 +1871,14 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         Notes
         -----
         %(notes_tmax_included_by_default)s
+
+        Epochs read from a FIF file with ``preload=False`` can be cropped
+        without loading the data; only the cropped time window is then read
+        from disk.
         """
-        # XXX this could be made to work on non-preloaded data...
-        _check_preload(self, 'Modifying data of epochs')
+        # XXX this could be made to work on other non-preloaded data...
+        if not isinstance(self, EpochsFIF):
+            _check_preload(self, 'Modifying data of epochs')
 
         if tmin is None:
             tmin = self.tmin
@@ -1637,9 +1896,18 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
 
         tmask = _time_mask(self.times, tmin, tmax, sfreq=self.info['sfreq'],
                            include_tmax=include_tmax)
+        if self.preload:
+            self._raw_times = self._raw_times[tmask]
+            self._data = self._data[:, :, tmask]
+        else:
+            # keep the decimation phase of the time window read from disk
+            decim_start = self._decim_slice.start or 0
+            first, last = np.where(tmask)[0][[0, -1]]
+            self._raw_times = self._raw_times[
+                decim_start + first * self._decim:
+                decim_start + last * self._decim + 1]
+            self._decim_slice = slice(0, None, self._decim)
         self._set_times(self.times[tmask])
-        self._raw_times = self._raw_times[tmask]
-        self._data = self._data[:, :, tmask]
 
         # Adjust rejection period
         if self.reject_tmin is not None and self.reject_tmin < self.tmin:
@@ -1673,6 +1941,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
             # deepcopy)
             if k in ('drop_log', '_raw', '_times_readonly'):
                 memodict[id(v)] = v
+            elif k == '_raw_epochs':  # a generator (while iterating)
+                v = None
             else:
                 v = deepcopy(v, memodict)
             result.__dict__[k] = v
@@ -1737,12 +2007,14 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         else:
             d = self[0].get_data()
             # this should be guaranteed by subclasses
-            assert d.dtype in ('>f8', '<f8', '>c16', '<c16')
-            total_size = d.nbytes * len(self)
+            assert d.dtype in ('>f8', '<f8', '>c16', '<c16',
+                               '>f4', '<f4', '>c8', '<c8')
+            # data are converted to fmt before writing
+            n_bytes = (4 if fmt == 'single' else 8) * (
+                2 if np.iscomplexobj(d) else 1)
+            total_size = d.size * n_bytes * len(self)
         self._check_consistency()
         over_size = 0
-        if fmt == "single":
-            total_size //= 2  # 64bit data converted to 32bit before writing.
         over_size += 32  # FIF tags
         # Account for all the other things we write, too
         # 1. meas_id block plus main epochs block
@@ -2013,6 +2285,101 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin, ShiftTimeMixin,
         return _as_meg_type_inst(self, ch_type=ch_type, mode=mode)
 
 
+def _decimate_inplace(data, decim_slice):
+    """Decimate C-contiguous epochs data within their own buffer."""
+    n_epochs, n_channels, n_times = data.shape
+    n_times = len(range(n_times)[decim_slice])
+    size = n_channels * n_times
+    flat = data.reshape(-1)
+    for ei in range(n_epochs):
+        # the decimated epoch is copied out before it is written, and it
+        # never overlaps the epochs that remain to be read
+        flat[ei * size:(ei + 1) * size] = data[ei][:, decim_slice].ravel()
+    return flat[:n_epochs * size].reshape(n_epochs, n_channels, n_times)
+
+
+class _Welford(object):
+    """Compute the mean (and variance) over batches of epochs in one pass."""
+
+    def __init__(self, var=False):  # noqa: D102
+        self.var = var
+        self.n = 0
+        self.mean = self.m2 = None
+
+    def update(self, data):
+        """Add a batch of epochs."""
+        n = len(data)
+        mean = np.mean(data, axis=0,
+                       dtype=np.result_type(data.dtype, np.float64))
+        m2 = np.sum(np.abs(data - mean) ** 2, axis=0) if self.var else None
+        if self.n == 0:
+            self.n, self.mean, self.m2 = n, mean, m2
+            return
+        # combine the statistics of the two sets (Chan et al.)
+        n_tot = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / n_tot)
+        if self.var:
+            self.m2 = self.m2 + m2 + np.abs(delta) ** 2 * (self.n * n / n_tot)
+        self.n = n_tot
+
+    def result(self):
+        """Get the mean (or the standard deviation)."""
+        return np.sqrt(self.m2 / self.n) if self.var else self.mean
+
+
+class _Remedian(object):
+    """Approximate the median over epochs with bounded memory.
+
+    Medians of ``base`` epochs are computed as they come, and medians of
+    ``base`` of those at the next level, and so on, so only about
+    ``base * log(n_epochs) / log(base)`` epochs are stored.
+    """
+
+    def __init__(self, base=11):  # noqa: D102
+        self.base = base
+        self.n = 0
+        self.buffers = list()
+
+    def update(self, data):
+        """Add a batch of epochs."""
+        for epoch in data:
+            self._add(epoch, 0)
+            self.n += 1
+
+    def _add(self, value, level):
+        if level == len(self.buffers):
+            self.buffers.append(list())
+        self.buffers[level].append(value)
+        if len(self.buffers[level]) == self.base:
+            value = _median_complex(np.array(self.buffers[level]), axis=0)
+            self.buffers[level] = list()
+            self._add(value, level + 1)
+
+    def result(self):
+        """Get the (approximate) median."""
+        values, weights = list(), list()
+        for level, buffer in enumerate(self.buffers):
+            values.extend(buffer)
+            weights.extend([self.base ** level] * len(buffer))
+        values = np.array(values)
+        if self.n < self.base:  # exact
+            return _median_complex(values, axis=0)
+        return _weighted_median(values, np.array(weights, float))
+
+
+def _weighted_median(values, weights):
+    """Compute the weighted median along the first axis."""
+    if np.iscomplexobj(values):
+        return (_weighted_median(values.real, weights) +
+                1j * _weighted_median(values.imag, weights))
+    order = np.argsort(values, axis=0)
+    cum_weights = np.cumsum(weights[order], axis=0)
+    idx = np.argmax(cum_weights >= cum_weights[-1] / 2., axis=0)
+    values = np.take_along_axis(values, order, axis=0)
+    return np.take_along_axis(values, idx[np.newaxis], axis=0)[0]
+
+
 def _drop_log_stats(drop_log, ignore=('IGNORED',)):
     """Compute drop log stats.
 
@@ -2219,16 +2586,63 @@ def make_metadata(events, event_id, tmin, tmax, sfreq,
     start_sample = int(round(tmin * sfreq))
     stop_sample = int(round(tmax * sfreq)) + 1
 
-    # Make indexing easier
-    # We create the DataFrame before subsetting the events so we end up with
-    # indices corresponding to the original event indices. Not used for now,
-    # but might come in handy sometime later
-    events_df = pd.DataFrame(events, columns=('sample', 'prev_id', 'id'))
+    # Only keep events that are of interest. The rows of the metadata follow
+    # the order of the events, and their index corresponds to the original
+    # event indices. Not used for now, but might come in handy sometime later
     id_to_name_map = {v: k for k, v in event_id.items()}
-
-    # Only keep events that are of interest
-    events = events[np.in1d(events[:, 2], list(event_id.values()))]
-    events_df = events_df.loc[events_df['id'].isin(event_id.values()), :]
+    keep = np.in1d(events[:, 2], list(event_id.values()))
+    events = events[keep]
+    ids, id_idx = np.unique(events[:, 2], return_inverse=True)
+    id_names = np.array([id_to_name_map[id_] for id_ in ids], object)
+
+    # Find the events that fall into each time window with a binary search
+    # over the event samples, so that all rows are handled at once
+    order = np.argsort(events[:, 0], kind='stable')
+    samples = events[order, 0]
+    row_samples = events[:, 0]
+    win_start = np.searchsorted(samples, row_samples + start_sample, 'left')
+    win_stop = np.searchsorted(samples, row_samples + stop_sample, 'right')
+
+    found_events = dict()
+
+    def _find_event(event_name, last):
+        """Find the first (or last) event of a given type in each window."""
+        if (event_name, last) in found_events:
+            return found_events[(event_name, last)]
+        match = np.flatnonzero(id_names[id_idx[order]] == event_name)
+        first = np.searchsorted(match, win_start)
+        stop = np.searchsorted(match, win_stop)
+        found = stop > first
+        pos = np.full(len(events), -1)
+        if last:
+            # of simultaneous events, the first one is kept
+            match_samples = samples[match]
+            which = np.searchsorted(match_samples,
+                                    match_samples[stop[found] - 1])
+        else:
+            which = first[found]
+        pos[found] = match[which]
+        found_events[(event_name, last)] = pos
+        return pos
+
+    def _find_events(event_names, last):
+        """Find the first (or last) of several event types in each window."""
+        # only the first occurrence of an event type counts, unless the type
+        # itself is in keep_last (and we look for the last event)
+        pos = np.array([_find_event(event_name, last and
+                                    event_name in keep_last)
+                        for event_name in event_names])
+        found = pos >= 0
+        if last:  # the latest event, and the first of simultaneous ones
+            found &= samples[pos] == samples[pos.max(axis=0)]
+        pos = np.where(found, pos, len(events)).min(axis=0)
+        found = pos < len(events)
+        times = np.full(len(events), np.nan)
+        times[found] = (samples[pos[found]] - row_samples[found]) / sfreq
+        times[np.isclose(times, 0)] = 0
+        kinds = np.full(len(events), -1)
+        kinds[found] = id_idx[order[pos[found]]]
+        return times, kinds
 
     # Prepare & condition the metadata DataFrame
 
@@ -2246,84 +2660,33 @@ def make_metadata(events, event_id, tmin, tmax, sfreq,
                *first_cols,
                *last_cols]
 
-    data = np.empty((len(events_df), len(columns)))
-    metadata = pd.DataFrame(data=data, columns=columns, index=events_df.index)
-
-    # Event names
-    metadata.iloc[:, 0] = ''
-
-    # Event times
-    start_idx = 1
-    stop_idx = (start_idx + len(event_id.keys()) +
-                len(keep_first_cols + keep_last_cols))
-    metadata.iloc[:, start_idx:stop_idx] = np.nan
+    # Event names and times. Events that are part of keep_first and keep_last
+    # also aggregate all events matched by their (hierarchical) name
+    data = dict(event_name=id_names[id_idx])
+    for event_name in event_id:
+        event_names = [event_name]
+        if event_name in keep_first + keep_last:
+            event_names = _hid_match(event_id, event_names)
+        data[event_name] = _find_events(
+            event_names, event_name in keep_last)[0]
 
     # keep_first and keep_last names
-    start_idx = stop_idx
-    metadata.iloc[:, start_idx:] = None
-
-    # We're all set, let's iterate over all eventns and fill in in the
-    # respective cells in the metadata. We will subset this to include only
-    # `row_events` later
-    for row_event in events_df.itertuples(name='RowEvent'):
-        row_idx = row_event.Index
-        metadata.loc[row_idx, 'event_name'] = \
-            id_to_name_map[row_event.id]
-
-        # Determine which events fall into the current epoch
-        window_start_sample = row_event.sample + start_sample
-        window_stop_sample = row_event.sample + stop_sample
-        events_in_window = events_df.loc[
-            (events_df['sample'] >= window_start_sample) &
-            (events_df['sample'] <= window_stop_sample), :]
-
-        assert not events_in_window.empty
-
-        # Store the metadata
-        for event in events_in_window.itertuples(name='Event'):
-            event_sample = event.sample - row_event.sample
-            event_time = event_sample / sfreq
-            event_time = 0 if np.isclose(event_time, 0) else event_time
-            event_name = id_to_name_map[event.id]
-
-            if not np.isnan(metadata.loc[row_idx, event_name]):
-                # Event already exists in current time window!
-                assert metadata.loc[row_idx, event_name] <= event_time
-
-                if event_name not in keep_last:
-                    continue
-
-            metadata.loc[row_idx, event_name] = event_time
-
-            # Handle keep_first and keep_last event aggregation
-            for event_group_name in keep_first + keep_last:
-                if event_name not in _hid_match(event_id, [event_group_name]):
-                    continue
-
-                if event_group_name in keep_first:
-                    first_last_col = f'first_{event_group_name}'
-                else:
-                    first_last_col = f'last_{event_group_name}'
-
-                old_time = metadata.loc[row_idx, event_group_name]
-                if not np.isnan(old_time):
-                    if ((event_group_name in keep_first and
-                         old_time <= event_time) or
-                        (event_group_name in keep_last and
-                         old_time >= event_time)):
-                        continue
-
-                if event_group_name not in event_id:
-                    # This is an HED. Strip redundant information from the
-                    # event name
-                    name = (event_name
-                            .replace(event_group_name, '')
-                            .replace('//', '/')
-                            .strip('/'))
-                    metadata.loc[row_idx, first_last_col] = name
-                    del name
-
-                metadata.loc[row_idx, event_group_name] = event_time
+    for event_group_name in keep_first_cols + keep_last_cols:
+        if event_group_name in keep_first:
+            first_last_col = f'first_{event_group_name}'
+        else:
+            first_last_col = f'last_{event_group_name}'
+        times, kinds = _find_events(_hid_match(event_id, [event_group_name]),
+                                    event_group_name in keep_last)
+        data[event_group_name] = times
+        # This is an HED. Strip redundant information from the event names
+        names = [name.replace(event_group_name, '')
+                 .replace('//', '/')
+                 .strip('/') for name in id_names] + [None]
+        data[first_last_col] = np.array(names, object)[kinds]
+
+    metadata = pd.DataFrame(data, columns=columns,
+                            index=pd.Index(np.flatnonzero(keep)))
 
     # Only keep rows of interest
     if row_events:
@@ -2352,7 +2715,7 @@ class Epochs(BaseEpochs):
         Defaults to ``(None, 0)``, i.e. beginning of the the data until
         time point zero.
     %(picks_all)s
-    preload : bool
+    preload : bool | str
         %(epochs_preload)s
     %(reject_epochs)s
     %(flat)s
@@ -2364,6 +2727,12 @@ class Epochs(BaseEpochs):
     %(reject_by_annotation_epochs)s
     %(epochs_metadata)s
     %(epochs_event_repeated)s
+    preload_dtype : None | 'float32' | 'float64'
+        Floating-point precision used to store the data in memory when they
+        are loaded (see :meth:`mne.Epochs.load_data`). None (default) uses
+        ``'float64'``. ``'float32'`` halves the memory usage.
+
+        .. versionadded:: 0.23
     %(verbose)s
 
     Attributes
@@ -2437,11 +2806,15 @@ class Epochs(BaseEpochs):
                  flat=None, proj=True, decim=1, reject_tmin=None,
                  reject_tmax=None, detrend=None, on_missing='raise',
                  reject_by_annotation=True, metadata=None,
-                 event_repeated='error', verbose=None):  # noqa: D102
+                 event_repeated='error', preload_dtype=None,
+                 verbose=None):  # noqa: D102
         if not isinstance(raw, BaseRaw):
             raise ValueError('The first argument to `Epochs` must be an '
                              'instance of mne.io.BaseRaw')
         info = deepcopy(raw.info)
+        if preload_dtype is not None:
+            _check_preload_dtype(preload_dtype)
+        self._preload_dtype = preload_dtype
 
         # proj is on when applied in Raw
         proj = proj or raw.proj
@@ -2500,6 +2873,68 @@ class Epochs(BaseEpochs):
                                             self.reject_by_annotation)
         return data
 
+    def _get_epochs_from_raw(self, idxs):
+        """Load epochs from disk, reading overlapping epochs together.
+
+        This yields the same as ``_get_epoch_from_raw`` for each index, but
+        epochs that overlap (or are close) in time are sliced out of a
+        single raw window that is read only once.
+        """
+        raw = self._raw
+        if raw is None:
+            raise ValueError('An error has occurred, no valid raw file found. '
+                             'Please report this to the mne-python '
+                             'developers.')
+        idxs = np.array(idxs, int)
+        sfreq = raw.info['sfreq']
+        n_times = len(self._raw_times)
+        event_samps = self.events[idxs, 0]
+        starts = np.round(event_samps + self._raw_times[0] * sfreq).astype(int)
+        starts -= raw.first_samp
+        stops = starts + n_times
+        # reject_by_annotation boundaries (see _get_epoch_from_raw)
+        reject_tmin = self.reject_tmin
+        if reject_tmin is None:
+            reject_tmin = self._raw_times[0]
+        reject_starts = np.round(event_samps + reject_tmin * sfreq).astype(int)
+        reject_starts -= raw.first_samp
+        reject_tmax = self.reject_tmax
+        if reject_tmax is None:
+            reject_tmax = self._raw_times[-1]
+        reject_stops = stops - int(round(
+            (self._raw_times[-1] - reject_tmax) * sfreq))
+        # None (no data), a bad annotation description, or True (to read)
+        status = [None if start < 0 else True for start in starts]
+        if self.reject_by_annotation and len(raw.annotations) > 0:
+            descs = _bad_annotation_overlaps(raw, reject_starts, reject_stops)
+            for ii in np.flatnonzero(starts >= 0):
+                if descs[ii] is not None:
+                    status[ii] = descs[ii]
+        max_len = max(n_times, _RAW_WINDOW_SIZE // (8 * len(self.picks)))
+        w_start = w_stop = 0
+        window = None
+        for ii, this_status in enumerate(status):
+            if this_status is not True:
+                yield this_status
+                continue
+            start, stop = starts[ii], stops[ii]
+            if window is None or not w_start <= start < stop <= w_stop:
+                # extend the window over the following epochs that are close
+                w_start, w_stop = start, stop
+                for jj in range(ii + 1, len(status)):
+                    if status[jj] is not True:
+                        continue
+                    if not (w_start <= starts[jj] <= w_stop + n_times and
+                            stops[jj] - w_start <= max_len):
+                        break
+                    w_stop = max(w_stop, stops[jj])
+                logger.debug('    Getting epochs for %d-%d'
+                             % (w_start, w_stop))
+                window = raw._getitem((self.picks, slice(w_start, w_stop)),
+                                      return_times=False)
+            # epochs are modified in place later, so we need copies
+            yield window[:, start - w_start:stop - w_start].copy()
+
 
 @fill_doc
 class EpochsArray(BaseEpochs):
@@ -2552,6 +2987,7 @@ class EpochsArray(BaseEpochs):
         Can be None to use ``np.arange(len(events))``.
 
         .. versionadded:: 0.16
+    %(preload_dtype)s
     %(verbose)s
 
     See Also
@@ -2577,8 +3013,9 @@ class EpochsArray(BaseEpochs):
                  reject=None, flat=None, reject_tmin=None,
                  reject_tmax=None, baseline=None, proj=True,
                  on_missing='raise', metadata=None, selection=None,
-                 verbose=None):  # noqa: D102
-        dtype = np.complex128 if np.any(np.iscomplex(data)) else np.float64
+                 dtype=None, verbose=None):  # noqa: D102
+        dtype = _check_preload_dtype(
+            dtype, np.complex128 if np.any(np.iscomplex(data)) else np.float64)
         data = np.asanyarray(data, dtype=dtype)
         if data.ndim != 3:
             raise ValueError('Data must be a 3D array of shape (n_epochs, '
@@ -2807,6 +3244,36 @@ def _is_good(e, ch_names, channel_type_idx, reject, flat, full_report=False,
             return False, bad_tuple
 
 
+def _get_bad_tuples(data, ch_names, channel_type_idx, reject, flat,
+                    ignore_chs=()):
+    """Test many epochs at once according to reject and flat.
+
+    This gives the same result as ``_is_good(..., full_report=True)`` for
+    each epoch in data, with None for the good ones.
+    """
+    checkable = np.array([c not in ignore_chs for c in ch_names], bool)
+    deltas = np.max(data, axis=-1) - np.min(data, axis=-1)
+    bad_tuples = [()] * len(data)
+    messages = dict()
+    for refl, f, t in zip([reject, flat], [np.greater, np.less], ['', 'flat']):
+        if refl is not None:
+            for key, thresh in refl.items():
+                idx = channel_type_idx[key]
+                if len(idx) == 0:
+                    continue
+                bad = np.logical_and(f(deltas[:, idx], thresh), checkable[idx])
+                for ei in np.where(bad.any(axis=1))[0]:
+                    bad_names = [ch_names[idx[ci]]
+                                 for ci in np.where(bad[ei])[0]]
+                    if ei not in messages:
+                        messages[ei] = ('    Rejecting %s epoch based on %s : '
+                                        '%s' % (t, key.upper(), bad_names))
+                    bad_tuples[ei] += tuple(bad_names)
+    for ei in sorted(messages):
+        logger.info(messages[ei])
+    return [bad_tuple if bad_tuple else None for bad_tuple in bad_tuples]
+
+
 def _read_one_epoch_file(f, tree, preload):
     """Read a single FIF file."""
     with f as fid:
@@ -2964,9 +3431,13 @@ def read_epochs(fname, proj=True, preload=True, verbose=None):
         -epo.fif.gz. If a file-like object is provided, preloading must be
         used.
     %(proj_epochs)s
-    preload : bool
+    preload : bool | str
         If True, read all epochs from disk immediately. If False, epochs will
-        be read on demand.
+        be read on demand. If a string, it is the file name of a
+        memory-mapped file which is used to store the data on the hard drive.
+
+        .. versionchanged:: 0.23
+           Support for memory-mapped files.
     %(verbose)s
 
     Returns
@@ -2981,7 +3452,7 @@ class _RawContainer(object):
     """Helper for a raw data container."""
 
     def __init__(self, fid, data_tag, event_samps, epoch_shape,
-                 cals, fmt):  # noqa: D102
+                 cals, fmt, first_samp, sfreq):  # noqa: D102
         self.fid = fid
         self.data_tag = data_tag
         self.event_samps = event_samps
@@ -2989,6 +3460,8 @@ class _RawContainer(object):
         self.cals = cals
         self.proj = False
         self.fmt = fmt
+        self.first_samp = first_samp  # of the stored epoch time window
+        self.sfreq = sfreq
 
     def __del__(self):  # noqa: D105
         self.fid.close()
@@ -3004,9 +3477,13 @@ class EpochsFIF(BaseEpochs):
         The name of the file, which should end with -epo.fif or -epo.fif.gz. If
         a file-like object is provided, preloading must be used.
     %(proj_epochs)s
-    preload : bool
+    preload : bool | str
         If True, read all epochs from disk immediately. If False, epochs will
-        be read on demand.
+        be read on demand. If a string, it is the file name of a
+        memory-mapped file which is used to store the data on the hard drive.
+
+        .. versionchanged:: 0.23
+           Support for memory-mapped files.
     %(verbose)s
 
     See Also
@@ -3019,6 +3496,11 @@ class EpochsFIF(BaseEpochs):
     @verbose
     def __init__(self, fname, proj=True, preload=True,
                  verbose=None):  # noqa: D102
+        data_buffer = None
+        if not isinstance(preload, (bool, np.bool_)):
+            # fill the memory-mapped file from disk one epoch at a time
+            _validate_type(preload, 'path-like', 'preload')
+            data_buffer, preload = preload, not isinstance(fname, str)
         if isinstance(fname, str):
             check_fname(fname, 'epochs', ('-epo.fif', '-epo.fif.gz',
                                           '_epo.fif', '_epo.fif.gz'))
@@ -3060,9 +3542,10 @@ class EpochsFIF(BaseEpochs):
 
             if not preload:
                 # store everything we need to index back to the original data
-                raw.append(_RawContainer(fiff_open(fname)[0], data_tag,
-                                         events[:, 0].copy(), epoch_shape,
-                                         cals, fmt))
+                raw.append(_RawContainer(
+                    fiff_open(fname)[0], data_tag, events[:, 0].copy(),
+                    epoch_shape, cals, fmt, int(round(tmin * info['sfreq'])),
+                    info['sfreq']))
 
             if next_fname is not None:
                 fnames.append(next_fname)
@@ -3070,6 +3553,8 @@ class EpochsFIF(BaseEpochs):
         (info, data, events, event_id, tmin, tmax, metadata, baseline,
          selection, drop_log, _) = \
             _concatenate_epochs(ep_list, with_data=preload, add_offset=False)
+        # the data on disk are projected if all projectors were active
+        self._raw_projected = all(p['active'] for p in info['projs'])
         # we need this uniqueness for non-preloaded data to work properly
         if len(np.unique(events[:, 0])) != len(events):
             raise RuntimeError('Event time samples were not unique')
@@ -3099,6 +3584,8 @@ class EpochsFIF(BaseEpochs):
         # use the private property instead of drop_bad so that epochs
         # are not all read from disk for preload=False
         self._bad_dropped = True
+        if data_buffer is not None:
+            self._load_data(data_buffer=data_buffer)
 
     @verbose
     def _get_epoch_from_raw(self, idx, verbose=None):
@@ -3125,22 +3612,35 @@ class EpochsFIF(BaseEpochs):
         #
         # Eventually this could be refactored in io/tag.py if other functions
         # could make use of it
-        raw.fid.seek(raw.data_tag.pos + offset, 0)
         if fmt == '>c8':
             read_fmt = '>f4'
         elif fmt == '>c16':
             read_fmt = '>f8'
         else:
             read_fmt = fmt
-        data = np.frombuffer(raw.fid.read(size), read_fmt)
-        if read_fmt != fmt:
-            data = data.view(fmt)
-            data = data.astype(np.complex128)
-        else:
-            data = data.astype(np.float64)
-
-        data.shape = raw.epoch_shape
-        data *= raw.cals
+        # only the picked channels and the (cropped) time window are read,
+        # with one read for each run of consecutive channels
+        itemsize = np.dtype(fmt).itemsize
+        n_times = raw.epoch_shape[1]
+        first = int(round(self._raw_times[0] * raw.sfreq)) - raw.first_samp
+        n_read = len(self._raw_times)
+        rows, inverse = np.unique(self.picks, return_inverse=True)
+        data = np.empty((len(rows), n_read),
+                        np.complex128 if read_fmt != fmt else np.float64)
+        runs = np.split(np.arange(len(rows)),
+                        np.where(np.diff(rows) != 1)[0] + 1)
+        for run in runs:
+            raw.fid.seek(raw.data_tag.pos + offset +
+                         (rows[run[0]] * n_times + first) * itemsize, 0)
+            count = (len(run) - 1) * n_times + n_read
+            block = np.frombuffer(raw.fid.read(count * itemsize), read_fmt)
+            if read_fmt != fmt:
+                block = block.view(fmt)
+            data[run] = np.lib.stride_tricks.as_strided(
+                block, (len(run), n_read), (n_times * itemsize, itemsize))
+        if not np.array_equal(inverse, np.arange(len(inverse))):
+            data = data[inverse]
+        data *= raw.cals[self.picks]
         return data
 
 
@@ -1,8 +1,9 @@
 """IIR and FIR filtering and resampling functions."""
 
-from collections import Counter
+from collections import Counter, OrderedDict
 from copy import deepcopy
 from functools import partial
+import threading
 
 import numpy as np
 
@@ -11,9 +12,10 @@ from .fixes import _import_fft
 from .io.pick import _picks_to_idx
 from .cuda import (_setup_cuda_fft_multiply_repeated, _fft_multiply_repeated,
                    _setup_cuda_fft_resample, _fft_resample, _smart_pad)
-from .parallel import parallel_func, check_n_jobs
+from .parallel import (parallel_func, check_n_jobs, _is_shared, _run_inplace,
+                       _run_shared, _shared_ref)
 from .time_frequency.multitaper import _mt_spectra, _compute_mt_params
-from .utils import (logger, verbose, sum_squared, warn, _pl,
+from .utils import (logger, verbose, sum_squared, warn, _pl, sizeof_fmt,
                     _check_preload, _validate_type, _check_option, _ensure_int)
 from ._ola import _COLA
 
@@ -146,7 +148,8 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
         See calling functions.
     n_jobs : int | str
         Number of jobs to run in parallel. Can be 'cuda' if ``cupy``
-        is installed properly.
+        is installed properly, or 'fft-threads' to compute the FFTs with
+        ``MNE_FFT_THREADS`` threads.
     copy : bool
         If True, a copy of x, filtered, is returned. Otherwise, it operates
         on x in place.
@@ -201,23 +204,111 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
     n_jobs, cuda_dict = _setup_cuda_fft_multiply_repeated(
         n_jobs, h, n_fft)
 
-    # Process each row separately
     picks = _picks_to_idx(len(x), picks)
-    if n_jobs == 1:
+    if not isinstance(cuda_dict['h_fft'], np.ndarray):  # CUDA, row by row
         for p in picks:
             x[p] = _1d_overlap_filter(x[p], len(h), n_edge, phase,
                                       cuda_dict, pad, n_fft)
-    else:
-        parallel, p_fun, _ = parallel_func(_1d_overlap_filter, n_jobs)
-        data_new = parallel(p_fun(x[p], len(h), n_edge, phase,
-                                  cuda_dict, pad, n_fft) for p in picks)
-        for pp, p in enumerate(picks):
-            x[p] = data_new[pp]
+    elif n_jobs == 1:  # blocks of rows at once
+        n_rows = max(_MAX_FFT_SIZE // n_fft, 1)
+        for start in range(0, len(picks), n_rows):
+            rows = picks[start:start + n_rows]
+            if (np.diff(rows) == 1).all():  # a view is faster to index
+                rows = slice(rows[0], rows[-1] + 1)
+            _2d_overlap_filter(x, rows, len(h), n_edge, phase, cuda_dict,
+                               pad)
+    else:  # blocks of rows in each job
+        n_rows = int(np.ceil(len(picks) / float(n_jobs)))
+        n_rows = max(min(_MAX_FFT_SIZE // n_fft, n_rows), 1)
+        args = (len(h), n_edge, phase, cuda_dict, pad)
+        if _is_shared(x):  # workers filter contiguous rows in place
+            # split the picks where they are not contiguous
+            runs = np.split(picks, np.flatnonzero(np.diff(picks) != 1) + 1)
+            blocks = [slice(run[start], run[start:start + n_rows][-1] + 1)
+                      for run in runs for start in range(0, len(run), n_rows)]
+            parallel, p_fun, _ = parallel_func(_run_shared, n_jobs)
+            parallel(p_fun(_2d_overlap_filter, _shared_ref(x[rows]),
+                           slice(None), *args) for rows in blocks)
+        else:
+            blocks = [picks[start:start + n_rows]
+                      for start in range(0, len(picks), n_rows)]
+            parallel, p_fun, _ = parallel_func(_overlap_filter_rows, n_jobs)
+            data_new = parallel(p_fun(x[rows], *args) for rows in blocks)
+            for rows, block in zip(blocks, data_new):
+                x[rows] = block
 
     x.shape = orig_shape
     return x
 
 
+# Maximum number of samples transformed by each multi-row FFT
+_MAX_FFT_SIZE = 2 ** 18
+
+
+def _smart_pad_edges(x, n_edge, pad):
+    """Get the samples that _smart_pad adds before and after each row."""
+    if pad in ('reflect_limited', 'reflect', 'symmetric', 'edge',
+               'constant', 'linear_ramp') and x.shape[1] > 2 * n_edge + 2:
+        # these modes only use the n_edge + 1 samples closest to each edge
+        x = np.concatenate([x[:, :n_edge + 1], x[:, -n_edge - 1:]], axis=1)
+    x_ext = _smart_pad(x, (n_edge, n_edge), pad)
+    return x_ext[:, :n_edge], x_ext[:, x_ext.shape[1] - n_edge:]
+
+
+def _2d_overlap_filter(x, rows, n_h, n_edge, phase, cuda_dict, pad):
+    """Do overlap-add FFT FIR filtering of rows of x in place.
+
+    This is equivalent to using :func:`_1d_overlap_filter` on each row, but
+    each segment of all rows is transformed by a single FFT call, and the
+    padded rows are never built in full. Filtered samples are written to x as
+    soon as they are complete, at which point the input samples they replace
+    are no longer needed.
+    """
+    n_fft, rfft, irfft = (cuda_dict[key] for key in ('n_fft', 'rfft',
+                                                     'irfft'))
+    kwargs = dict(n=n_fft, axis=-1)
+    n_times = x.shape[1]
+    n_seg = n_fft - n_h + 1
+    n_segments = int(np.ceil((n_times + 2 * n_edge) / float(n_seg)))
+    shift = ((n_h - 1) // 2 if phase.startswith('zero') else 0) + n_edge
+    pre, post = _smart_pad_edges(x[rows], n_edge, pad)
+    # the padded signal is pre, x[rows], post at these offsets
+    parts = ((0, n_edge, pre), (n_edge, n_times, None),
+             (n_edge + n_times, n_edge, post))
+
+    def _put(filtered, start):
+        """Write the filtered samples starting at the padded index start."""
+        lims = np.clip([start - shift, start - shift + filtered.shape[1]],
+                       0, n_times)
+        x[rows, lims[0]:lims[1]] = \
+            filtered[:, lims[0] - start + shift:lims[1] - start + shift]
+
+    # the last n_h - 1 samples stay zero, so the FFTs do not need to pad
+    seg = np.zeros((len(pre), n_fft), x.dtype)
+    overlap = np.zeros((len(pre), n_h - 1))
+    for start in range(0, n_segments * n_seg, n_seg):
+        seg[:, :n_seg] = 0.
+        for offset, n_part, part in parts:
+            lims = np.clip([start - offset, start + n_seg - offset],
+                           0, n_part)
+            seg[:, lims[0] + offset - start:lims[1] + offset - start] = \
+                x[rows, lims[0]:lims[1]] if part is None else \
+                part[:, lims[0]:lims[1]]
+        seg_fft = rfft(seg, **kwargs)
+        seg_fft *= cuda_dict['h_fft']
+        prod = irfft(seg_fft, **kwargs)
+        prod[:, :n_h - 1] += overlap
+        overlap = prod[:, n_seg:]
+        _put(prod[:, :n_seg], start)
+    _put(overlap, n_segments * n_seg)
+
+
+def _overlap_filter_rows(x, n_h, n_edge, phase, cuda_dict, pad):
+    """Filter all rows of x in place and return it (in a worker)."""
+    _2d_overlap_filter(x, slice(None), n_h, n_edge, phase, cuda_dict, pad)
+    return x
+
+
 def _1d_overlap_filter(x, n_h, n_edge, phase, cuda_dict, pad, n_fft):
     """Do one-dimensional overlap-add FFT FIR filtering."""
     # pad to reduce ringing
@@ -284,6 +375,122 @@ def _prep_for_filtering(x, copy, picks=None):
     return x, orig_shape, picks
 
 
+class _FilterCache(object):
+    """LRU cache of filter designs, shared by the whole process.
+
+    Designs are tuples of arrays and scalars stored under a hashable key of
+    all of their parameters. Copies are returned, so that callers can modify
+    them freely.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self.hits = self.misses = 0
+        self._designs = OrderedDict()
+        self._n_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def info(self):
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses,
+                        n_filters=len(self._designs), n_bytes=self._n_bytes,
+                        max_bytes=self.max_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._designs.clear()
+            self._n_bytes = 0
+            self.hits = self.misses = 0
+
+    def get(self, key, design):
+        """Get a design, calling ``design()`` if it is not cached."""
+        with self._lock:
+            out = self._designs.get(key, None)
+            if out is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._designs.move_to_end(key)
+        if out is None:
+            out = design()
+            n_bytes = _nbytes(out)
+            with self._lock:
+                if key not in self._designs and n_bytes <= self.max_bytes:
+                    self._designs[key] = out
+                    self._n_bytes += n_bytes
+                    while self._n_bytes > self.max_bytes:
+                        self._n_bytes -= _nbytes(
+                            self._designs.popitem(last=False)[1])
+        return deepcopy(out)
+
+
+def _nbytes(out):
+    if isinstance(out, np.ndarray):
+        return out.nbytes
+    elif isinstance(out, (tuple, list)):
+        return sum(_nbytes(o) for o in out)
+    return 0
+
+
+def _design_key(kind, **kwargs):
+    """Make a hashable key from design parameters."""
+    return (kind,) + tuple(
+        (key, (val.shape, tuple(val.ravel().tolist()))
+         if isinstance(val, np.ndarray) else val)
+        for key, val in sorted(kwargs.items()))
+
+
+_filter_cache = _FilterCache(64 * 2 ** 20)
+
+
+def get_filter_cache_info():
+    """Get statistics about the cache of filter designs.
+
+    FIR and IIR filters designed by MNE (e.g., by :func:`create_filter`,
+    :func:`filter_data`, :func:`notch_filter` or the ``filter`` methods of
+    data containers) are kept in a least-recently-used cache, so that
+    filtering many recordings or epochs with the same parameters designs
+    each filter only once.
+
+    Returns
+    -------
+    info : dict
+        The number of cache ``hits`` and ``misses``, the number of filters
+        (``n_filters``) and bytes (``n_bytes``) currently cached, and the
+        maximum number of bytes cached (``max_bytes``).
+
+    See Also
+    --------
+    clear_filter_cache
+
+    Notes
+    -----
+    .. versionadded:: 0.23
+    """
+    return _filter_cache.info
+
+
+def clear_filter_cache():
+    """Clear the cache of filter designs.
+
+    This also resets the statistics of the cache.
+
+    See Also
+    --------
+    get_filter_cache_info
+
+    Notes
+    -----
+    .. versionadded:: 0.23
+    """
+    info = _filter_cache.info
+    _filter_cache.clear()
+    logger.info('Cleared %d cached filter%s (%s)'
+                % (info['n_filters'], _pl(info['n_filters']),
+                   sizeof_fmt(info['n_bytes'])))
+
+
 def _firwin_design(N, freq, gain, window, sfreq):
     """Construct a FIR filter using firwin."""
     from scipy.signal import firwin
@@ -362,33 +569,22 @@ def _construct_fir_filter(sfreq, freq, gain, filter_length, phase, fir_window,
         Filter coefficients.
     """
     assert freq[0] == 0
-    if fir_design == 'firwin2':
-        from scipy.signal import firwin2 as fir_design
-    else:
-        assert fir_design == 'firwin'
-        fir_design = partial(_firwin_design, sfreq=sfreq)
-    from scipy.signal import minimum_phase
-
     # issue a warning if attenuation is less than this
     min_att_db = 12 if phase == 'minimum' else 20
 
     # normalize frequencies
-    freq = np.array(freq) / (sfreq / 2.)
+    freq = np.array(freq, float) / (sfreq / 2.)
     if freq[0] != 0 or freq[-1] != 1:
         raise ValueError('freq must start at 0 and end an Nyquist (%s), got %s'
                          % (sfreq / 2., freq))
-    gain = np.array(gain)
+    gain = np.array(gain, float)
 
     # Use overlap-add filter with a fixed length
     N = _check_zero_phase_length(filter_length, phase, gain[-1])
-    # construct symmetric (linear phase) filter
-    if phase == 'minimum':
-        h = fir_design(N * 2 - 1, freq, gain, window=fir_window)
-        h = minimum_phase(h)
-    else:
-        h = fir_design(N, freq, gain, window=fir_window)
-    assert h.size == N
-    att_db, att_freq = _filter_attenuation(h, freq, gain)
+    kwargs = dict(sfreq=float(sfreq), freq=freq, gain=gain, N=N, phase=phase,
+                  fir_window=fir_window, fir_design=fir_design)
+    h, att_db, att_freq = _filter_cache.get(
+        _design_key('fir', **kwargs), partial(_design_fir_filter, **kwargs))
     if phase == 'zero-double':
         att_db += 6
     if att_db < min_att_db:
@@ -399,6 +595,25 @@ def _construct_fir_filter(sfreq, freq, gain, filter_length, phase, fir_window,
     return h
 
 
+def _design_fir_filter(sfreq, freq, gain, N, phase, fir_window, fir_design):
+    """Design an FIR filter and compute its stop-band attenuation."""
+    if fir_design == 'firwin2':
+        from scipy.signal import firwin2 as fir_design
+    else:
+        assert fir_design == 'firwin'
+        fir_design = partial(_firwin_design, sfreq=sfreq)
+    from scipy.signal import minimum_phase
+    # construct symmetric (linear phase) filter
+    if phase == 'minimum':
+        h = fir_design(N * 2 - 1, freq, gain, window=fir_window)
+        h = minimum_phase(h)
+    else:
+        h = fir_design(N, freq, gain, window=fir_window)
+    assert h.size == N
+    att_db, att_freq = _filter_attenuation(h, freq, gain)
+    return h, att_db, att_freq
+
+
 def _check_zero_phase_length(N, phase, gain_nyq=0):
     N = int(N)
     if N % 2 == 0:
@@ -442,6 +657,9 @@ def _filtfilt(x, iir_params, picks, n_jobs, copy):
     if n_jobs == 1:
         for p in picks:
             x[p] = fun(x=x[p])
+    elif _is_shared(x):  # workers filter the rows in place
+        parallel, p_fun, _ = parallel_func(_run_inplace, n_jobs)
+        parallel(p_fun(_filt_x, _shared_ref(x[p]), fun) for p in picks)
     else:
         parallel, p_fun, _ = parallel_func(fun, n_jobs)
         data_new = parallel(p_fun(x=x[p]) for p in picks)
@@ -451,6 +669,10 @@ def _filtfilt(x, iir_params, picks, n_jobs, copy):
     return x
 
 
+def _filt_x(x, fun):
+    return fun(x=x)
+
+
 def estimate_ringing_samples(system, max_try=100000):
     """Estimate filter ringing.
 
@@ -467,6 +689,14 @@ def estimate_ringing_samples(system, max_try=100000):
     n : int
         The approximate ringing.
     """
+    n, converged = _estimate_ringing_samples(system, max_try)
+    if not converged:
+        warn('Could not properly estimate ringing for the filter')
+    return n
+
+
+def _estimate_ringing_samples(system, max_try=100000):
+    """Estimate filter ringing, and whether it could be estimated."""
     from scipy import signal
     if isinstance(system, tuple):  # TF
         kind = 'ba'
@@ -497,9 +727,8 @@ def estimate_ringing_samples(system, max_try=100000):
             idx = (ii - 1) * n_per_chunk + last_good
             break
     else:
-        warn('Could not properly estimate ringing for the filter')
-        idx = n_per_chunk * n_chunks_max
-    return idx
+        return n_per_chunk * n_chunks_max, False
+    return idx, True
 
 
 _ftype_dict = {
@@ -636,7 +865,7 @@ def construct_iir_filter(iir_params, f_pass=None, f_stop=None, sfreq=None,
     if not isinstance(iir_params, dict):
         raise TypeError('iir_params must be a dict, got %s' % type(iir_params))
     # if the filter has been designed, we're good to go
-    Wp = None
+    Wp = key = None
     if 'sos' in iir_params:
         system = iir_params['sos']
         output = 'sos'
@@ -676,7 +905,8 @@ def construct_iir_filter(iir_params, f_pass=None, f_stop=None, sfreq=None,
             for key in ('rp', 'rs'):
                 if key in iir_params:
                     kwargs[key] = iir_params[key]
-            system = iirfilter(**kwargs)
+            key = _design_key('iirfilter', **kwargs)
+            system = _filter_cache.get(key, partial(iirfilter, **kwargs))
             logger.info('- Filter order %d (effective, after forward-backward)'
                         % (2 * iir_params['order'] * len(Wp),))
         else:
@@ -685,8 +915,11 @@ def construct_iir_filter(iir_params, f_pass=None, f_stop=None, sfreq=None,
             if 'gpass' not in iir_params or 'gstop' not in iir_params:
                 raise ValueError('iir_params must have at least ''gstop'' and'
                                  ' ''gpass'' (or ''N'') entries')
-            system = iirdesign(Wp, Ws, iir_params['gpass'],
-                               iir_params['gstop'], ftype=ftype, output=output)
+            kwargs = dict(wp=Wp, ws=Ws, gpass=iir_params['gpass'],
+                          gstop=iir_params['gstop'], ftype=ftype,
+                          output=output)
+            key = _design_key('iirdesign', **kwargs)
+            system = _filter_cache.get(key, partial(iirdesign, **kwargs))
 
     if system is None:
         raise RuntimeError('coefficients could not be created from iir_params')
@@ -706,7 +939,13 @@ def construct_iir_filter(iir_params, f_pass=None, f_stop=None, sfreq=None,
                     % (_pl(f_pass), edge_freqs, cutoffs))
     # now deal with padding
     if 'padlen' not in iir_params:
-        padlen = estimate_ringing_samples(system)
+        if key is None:
+            padlen = estimate_ringing_samples(system)
+        else:  # the ringing of designed filters is cached, too
+            padlen, converged = _filter_cache.get(
+                ('ringing',) + key, partial(_estimate_ringing_samples, system))
+            if not converged:
+                warn('Could not properly estimate ringing for the filter')
     else:
         padlen = iir_params['padlen']
 
@@ -1159,7 +1398,24 @@ def notch_filter(x, Fs, freqs, filter_length='auto', notch_widths=None,
     cite this in publications if method 'spectrum_fit' is used.
     """
     iir_params, method = _check_method(method, iir_params, ['spectrum_fit'])
+    freqs, notch_widths = _check_notch_widths(freqs, notch_widths, method)
 
+    if method in ('fir', 'iir'):
+        # Speed this up by computing the fourier coefficients once
+        lows, highs = _notch_stop_bands(freqs, notch_widths, trans_bandwidth)
+        tb_2 = trans_bandwidth / 2.0
+        xf = filter_data(x, Fs, highs, lows, picks, filter_length, tb_2, tb_2,
+                         n_jobs, method, iir_params, copy, phase, fir_window,
+                         fir_design, pad=pad)
+    elif method == 'spectrum_fit':
+        xf = _mt_spectrum_proc(x, Fs, freqs, notch_widths, mt_bandwidth,
+                               p_value, picks, n_jobs, copy, filter_length)
+
+    return xf
+
+
+def _check_notch_widths(freqs, notch_widths, method):
+    """Check the notch frequencies and widths."""
     if freqs is not None:
         freqs = np.atleast_1d(freqs)
     elif method != 'spectrum_fit':
@@ -1179,22 +1435,17 @@ def notch_filter(x, Fs, freqs, filter_length='auto', notch_widths=None,
             elif len(notch_widths) != len(freqs):
                 raise ValueError('notch_widths must be None, scalar, or the '
                                  'same length as freqs')
+    return freqs, notch_widths
 
-    if method in ('fir', 'iir'):
-        # Speed this up by computing the fourier coefficients once
-        tb_2 = trans_bandwidth / 2.0
-        lows = [freq - nw / 2.0 - tb_2
-                for freq, nw in zip(freqs, notch_widths)]
-        highs = [freq + nw / 2.0 + tb_2
-                 for freq, nw in zip(freqs, notch_widths)]
-        xf = filter_data(x, Fs, highs, lows, picks, filter_length, tb_2, tb_2,
-                         n_jobs, method, iir_params, copy, phase, fir_window,
-                         fir_design, pad=pad)
-    elif method == 'spectrum_fit':
-        xf = _mt_spectrum_proc(x, Fs, freqs, notch_widths, mt_bandwidth,
-                               p_value, picks, n_jobs, copy, filter_length)
 
-    return xf
+def _notch_stop_bands(freqs, notch_widths, trans_bandwidth):
+    """Get the edges of the stop bands of a notch filter."""
+    tb_2 = trans_bandwidth / 2.0
+    lows = [freq - nw / 2.0 - tb_2
+            for freq, nw in zip(freqs, notch_widths)]
+    highs = [freq + nw / 2.0 + tb_2
+             for freq, nw in zip(freqs, notch_widths)]
+    return lows, highs
 
 
 def _get_window_thresh(n_times, sfreq, mt_bandwidth, p_value):
@@ -1372,7 +1623,7 @@ def _mt_spectrum_remove(x, sfreq, line_freqs, notch_widths,
 
 def _check_filterable(x, kind='filtered'):
     x = np.asanyarray(x)
-    if x.dtype != np.float64:
+    if x.dtype not in (np.float64, np.float32):
         raise ValueError('Data to be %s must be real floating, got %s'
                          % (kind, x.dtype,))
     return x
@@ -1385,7 +1636,7 @@ def _resamp_ratio_len(up, down, n):
 
 @verbose
 def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
-             pad='reflect_limited', verbose=None):
+             pad='reflect_limited', method='fft', verbose=None):
     """Resample an array.
 
     Operates along the last dimension of the array.
@@ -1407,6 +1658,9 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
         The default is ``'reflect_limited'``.
 
         .. versionadded:: 0.15
+    %(method-resample)s
+
+        .. versionadded:: 0.23
     %(verbose)s
 
     Returns
@@ -1422,10 +1676,11 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     important consequences, and the default choices should work well
     for most natural signals.
 
-    Resampling arguments are broken into "up" and "down" components for future
-    compatibility in case we decide to use an upfirdn implementation. The
-    current implementation is functionally equivalent to passing
-    up=up/down and down=1.
+    Resampling arguments are broken into "up" and "down" components for
+    compatibility with the ``method='polyphase'`` implementation, which
+    reduces up/down to a fraction of small integers and uses
+    :func:`scipy.signal.resample_poly`. The ``'fft'`` implementation is
+    functionally equivalent to passing up=up/down and down=1.
     """
     from scipy.signal import get_window
     ifftshift, fftfreq = _import_fft(('ifftshift', 'fftfreq'))
@@ -1437,6 +1692,8 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
                "subsequent window parameter." % repr(axis))
         raise TypeError(err)
 
+    _check_option('method', method, ('fft', 'polyphase'))
+
     # make sure our arithmetic will work
     x = _check_filterable(x, 'resampled')
     ratio, final_len = _resamp_ratio_len(up, down, x.shape[axis])
@@ -1466,6 +1723,12 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
         npads = np.array([npad, npad], int)
     del npad
 
+    if method == 'polyphase':
+        y = _resample_polyphase(x.reshape((-1, x_len)), ratio, final_len,
+                                n_jobs, pad)
+        y.shape = orig_shape[:-1] + (final_len,)
+        return y.swapaxes(axis, orig_last_axis)
+
     # prep for resampling now
     x_flat = x.reshape((-1, x_len))
     orig_len = x_len + npads.sum()  # length after padding
@@ -1496,14 +1759,18 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     # use of the 'flat' window is recommended for minimal ringing
     if n_jobs == 1:
         y = np.zeros((len(x_flat), new_len - to_removes.sum()), dtype=x.dtype)
-        for xi, x_ in enumerate(x_flat):
-            y[xi] = _fft_resample(x_, new_len, npads, to_removes,
-                                  cuda_dict, pad)
+        # on the CPU, resample blocks of rows with multi-row FFTs
+        n_rows = 1 if cuda_dict['use_cuda'] else \
+            max(_MAX_FFT_SIZE // orig_len, 1)
+        for start in range(0, len(x_flat), n_rows):
+            y[start:start + n_rows] = _fft_resample(
+                x_flat[start:start + n_rows], new_len, npads, to_removes,
+                cuda_dict, pad)
     else:
-        parallel, p_fun, _ = parallel_func(_fft_resample, n_jobs)
-        y = parallel(p_fun(x_, new_len, npads, to_removes, cuda_dict, pad)
-                     for x_ in x_flat)
-        y = np.array(y)
+        parallel, p_fun, _ = parallel_func(_run_shared, n_jobs)
+        y = parallel(p_fun(_fft_resample, _shared_ref(x_), new_len, npads,
+                           to_removes, cuda_dict, pad) for x_ in x_flat)
+        y = np.array(y, dtype=x.dtype)
 
     # Restore the original array shape (modified for resampling)
     y.shape = orig_shape[:-1] + (y.shape[1],)
@@ -1514,6 +1781,78 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     return y
 
 
+def _polyphase_up_down(ratio):
+    """Get the integer up and down factors of a resampling ratio."""
+    from fractions import Fraction
+    frac = Fraction(ratio).limit_denominator(1000)
+    if not np.isclose(float(frac), ratio, rtol=1e-12, atol=0):
+        raise ValueError('method="polyphase" requires the ratio of the new '
+                         'and old sampling rates to be a fraction with a '
+                         'denominator of at most 1000, got %s' % (ratio,))
+    return frac.numerator, frac.denominator
+
+
+def _resample_polyphase(x, ratio, final_len, n_jobs, pad):
+    """Resample the rows of x with an up/down polyphase FIR filter."""
+    from scipy.signal import firwin
+    up, down = _polyphase_up_down(ratio)
+    if up == down == 1:
+        return x.copy()
+    # the same low-pass filter that scipy.signal.resample_poly designs
+    max_rate = max(up, down)
+    h = firwin(20 * max_rate + 1, 1. / max_rate, window=('kaiser', 5.0))
+    logger.info('Polyphase resampling with up=%d, down=%d (%d-tap FIR filter)'
+                % (up, down, len(h)))
+    if isinstance(n_jobs, str):  # 'cuda' and 'fft-threads' are for FFTs
+        n_jobs = 1
+    parallel, p_fun, n_jobs = parallel_func(_run_shared, n_jobs)
+    if n_jobs == 1:
+        return _polyphase_chunks(x, up, down, h, final_len, pad)
+    y = parallel(p_fun(_polyphase_chunks, _shared_ref(x_), up, down, h,
+                       final_len, pad)
+                 for x_ in np.array_split(x, n_jobs) if len(x_))
+    return np.concatenate(y)
+
+
+# Maximum number of input samples in each chunk of polyphase resampling
+_MAX_POLYPHASE_SIZE = 2 ** 20
+
+
+def _polyphase_chunks(x, up, down, h, final_len, pad):
+    """Resample the rows of x with resample_poly, one time chunk at a time.
+
+    Each chunk of output samples starts on a multiple of ``up``, so that it
+    is aligned with an input sample, and is computed from the input chunk
+    extended by n_margin samples on each side (a multiple of ``down``). The
+    margins cover the filter, so the zeros that resample_poly adds at the
+    ends of the extended chunk do not change the kept output samples, and
+    the concatenated chunks match resampling the (padded) signal at once.
+    """
+    from scipy.signal import resample_poly
+    n_rows, n_times = x.shape
+    n_margin = down * int(np.ceil(((len(h) - 1) // 2 / up + 1) / down))
+    n_pad = n_margin + down  # the last chunk can need down more samples
+    pre, post = _smart_pad_edges(x, n_pad, pad)
+    parts = ((-n_pad, pre), (0, x), (n_times, post))
+    n_chunk = max(_MAX_POLYPHASE_SIZE // (max(n_rows, 1) * down),
+                  4 * n_margin // down, 1) * up
+    y = np.empty((n_rows, final_len), x.dtype)
+    n_skip = n_margin // down * up
+    for m_start in range(0, final_len, n_chunk):
+        m_stop = min(m_start + n_chunk, final_len)
+        start = m_start // up * down - n_margin
+        stop = -(-m_stop * down // up) + n_margin
+        seg = np.zeros((n_rows, stop - start))
+        for offset, part in parts:
+            lims = np.clip([start - offset, stop - offset], 0, part.shape[1])
+            seg[:, lims[0] + offset - start:lims[1] + offset - start] = \
+                part[:, lims[0]:lims[1]]
+        y[:, m_start:m_stop] = resample_poly(
+            seg, up, down, axis=-1, window=h)[:, n_skip:n_skip + m_stop -
+                                              m_start]
+    return y
+
+
 def _resample_stim_channels(stim_data, up, down):
     """Resample stim channels, carefully.
 
@@ -1840,6 +2179,83 @@ def _triage_filter_params(x, sfreq, l_freq, h_freq,
             fir_window, fir_design)
 
 
+def _check_stream(inst, preload, method, msg):
+    """Check whether non-preloaded raw data can be filtered in blocks."""
+    from .io.base import BaseRaw
+    _validate_type(preload, (bool, 'path-like'), 'preload')
+    if isinstance(inst, BaseRaw) and not inst.preload and \
+            preload is not False:
+        if method in ('fir', 'fft'):
+            return True
+        # other methods need all of the data at once
+        inst._preload_data(preload)
+    _check_preload(inst, msg)
+    return False
+
+
+def _filter_raw_stream(raw, preload, filts, picks, phase, pad, n_jobs):
+    """Load raw data in blocks, FIR filtering them on the fly.
+
+    ``filts`` is a list of ``(start, stop, h)`` segments to filter, samples
+    outside of these segments are loaded as they are.
+    """
+    from .io.base import _allocate_data
+    logger.info('Reading and filtering %d ... %d  =  %9.3f ... %9.3f secs...'
+                % (0, len(raw.times) - 1, 0., raw.times[-1]))
+    raw.set_block_cache(None)  # every sample is only read once
+    data = _allocate_data(preload, (raw.info['nchan'], raw.n_times),
+                          raw._dtype)
+    last = 0
+    for start, stop, h in filts:
+        _filter_raw_blocks(raw, data, None, picks, last, start, phase, pad,
+                           n_jobs)
+        _filter_raw_blocks(raw, data, h, picks, start, stop, phase, pad,
+                           n_jobs)
+        last = stop
+    _filter_raw_blocks(raw, data, None, picks, last, raw.n_times, phase, pad,
+                       n_jobs)
+    # like BaseRaw._preload_data
+    raw._data = data
+    raw.preload = True
+    raw._comp = None
+    raw.close()
+
+
+def _filter_raw_blocks(raw, data, h, picks, start, stop, phase, pad, n_jobs):
+    """Read a segment of raw data in blocks and store it filtered in data.
+
+    Each block is read with enough samples on either side for the result to
+    be the same as filtering the whole segment at once.
+    """
+    n_edge = 0 if h is None else max(min(len(h), stop - start) - 1, 0)
+    n_block = max(raw._get_buffer_size(), 4 * n_edge)
+    if stop - start <= n_block + 2 * n_edge:
+        n_block = max(stop - start, 1)
+    for first in range(start, stop, n_block):
+        last = min(first + n_block, stop)
+        if h is None:
+            raw._read_segment(first, last, data_buffer=data[:, first:last],
+                              projector=raw._projector)
+            continue
+        read_first = max(first - n_edge, start)
+        read_last = min(last + n_edge, stop)
+        block = raw._read_segment(read_first, read_last,
+                                  projector=raw._projector)
+        if n_block >= stop - start:  # the whole segment at once
+            _overlap_add_filter(block, h, None, phase, picks, n_jobs,
+                                copy=False, pad=pad)
+        else:
+            # pad the edges of the segment like _overlap_add_filter does
+            n_pad = (n_edge - (first - read_first),
+                     n_edge - (read_last - last))
+            x = np.array([_smart_pad(row, n_pad, pad) for row in block[picks]])
+            _overlap_add_filter(x, h, None, phase, None, n_jobs, copy=False,
+                                pad=pad)
+            block[picks, first - read_first:last - read_first] = \
+                x[:, n_edge:n_edge + last - first]
+        data[:, first:last] = block[:, first - read_first:last - read_first]
+
+
 class FilterMixin(object):
     """Object for Epoch/Evoked filtering."""
 
@@ -1908,7 +2324,7 @@ class FilterMixin(object):
                method='fir', iir_params=None, phase='zero',
                fir_window='hamming', fir_design='firwin',
                skip_by_annotation=('edge', 'bad_acq_skip'), pad='edge',
-               verbose=None):
+               preload=False, verbose=None):
         """Filter a subset of channels.
 
         Parameters
@@ -1937,6 +2353,7 @@ class FilterMixin(object):
 
             .. versionadded:: 0.16.
         %(pad-fir)s
+        %(preload_filter)s
         %(verbose_meth)s
 
         Returns
@@ -1961,7 +2378,8 @@ class FilterMixin(object):
         The data are modified inplace.
 
         The object has to have the data loaded e.g. with ``preload=True``
-        or ``self.load_data()``.
+        or ``self.load_data()``, unless raw data are filtered while they are
+        loaded with the ``preload`` parameter.
 
         ``l_freq`` and ``h_freq`` are the frequencies below which and above
         which, respectively, to filter out of the data. Thus the uses are:
@@ -1985,7 +2403,7 @@ class FilterMixin(object):
         .. versionadded:: 0.15
         """
         from .io.base import BaseRaw
-        _check_preload(self, 'inst.filter')
+        stream = _check_stream(self, preload, method, 'inst.filter')
         if pad is None and method != 'iir':
             pad = 'edge'
         update_info, picks = _filt_check_picks(self.info, picks,
@@ -1999,16 +2417,26 @@ class FilterMixin(object):
         else:
             onsets, ends = np.array([0]), np.array([self._data.shape[1]])
         max_idx = (ends - onsets).argmax()
+        filts = list()
         for si, (start, stop) in enumerate(zip(onsets, ends)):
             # Only output filter params once (for info level), and only warn
             # once about the length criterion (longest segment is too short)
             use_verbose = verbose if si == max_idx else 'error'
+            if stream:  # only the length of the data is needed for now
+                filts.append((start, stop, create_filter(
+                    np.empty((0, stop - start), self._dtype),
+                    self.info['sfreq'], l_freq, h_freq, filter_length,
+                    l_trans_bandwidth, h_trans_bandwidth, method, iir_params,
+                    phase, fir_window, fir_design, verbose=use_verbose)))
+                continue
             filter_data(
                 self._data[:, start:stop], self.info['sfreq'], l_freq, h_freq,
                 picks, filter_length, l_trans_bandwidth, h_trans_bandwidth,
                 n_jobs, method, iir_params, copy=False, phase=phase,
                 fir_window=fir_window, fir_design=fir_design, pad=pad,
                 verbose=use_verbose)
+        if stream:
+            _filter_raw_stream(self, preload, filts, picks, phase, pad, n_jobs)
         # update info if filter is applied to all data channels,
         # and it's not a band-stop filter
         _filt_update_info(self.info, update_info, l_freq, h_freq)
@@ -2016,7 +2444,7 @@ class FilterMixin(object):
 
     @verbose
     def resample(self, sfreq, npad='auto', window='boxcar', n_jobs=1,
-                 pad='edge', verbose=None):  # lgtm
+                 pad='edge', method='fft', verbose=None):  # lgtm
         """Resample data.
 
         If appropriate, an anti-aliasing filter is applied before resampling.
@@ -2036,6 +2464,9 @@ class FilterMixin(object):
             vector.
 
             .. versionadded:: 0.15
+        %(method-resample)s
+
+            .. versionadded:: 0.23
         %(verbose_meth)s
 
         Returns
@@ -2063,7 +2494,7 @@ class FilterMixin(object):
         sfreq = float(sfreq)
         o_sfreq = self.info['sfreq']
         self._data = resample(self._data, sfreq, o_sfreq, npad, window=window,
-                              n_jobs=n_jobs, pad=pad)
+                              n_jobs=n_jobs, pad=pad, method=method)
         self.info['sfreq'] = float(sfreq)
         lowpass = self.info.get('lowpass')
         lowpass = np.inf if lowpass is None else lowpass
@@ -2170,6 +2601,11 @@ class FilterMixin(object):
             for idx in picks:
                 self._data[..., idx, :] = _check_fun(
                     _my_hilbert, data_in[..., idx, :], *args, **kwargs)
+        elif _is_shared(self._data):  # workers modify the data in place
+            parallel, p_fun, _ = parallel_func(_run_inplace, n_jobs)
+            parallel(p_fun(partial(_check_fun, _my_hilbert),
+                           _shared_ref(self._data[..., p, :]), *args, **kwargs)
+                     for p in picks)
         else:
             # use parallel function
             parallel, p_fun, _ = parallel_func(_check_fun, n_jobs)
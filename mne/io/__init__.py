@@ -51,6 +51,7 @@ from .eximia import read_raw_eximia
 from .nirx import read_raw_nirx
 from .boxy import read_raw_boxy
 from .snirf import read_raw_snirf
+from .hdf5 import read_raw_hdf5
 from .persyst import read_raw_persyst
 from .fieldtrip import (read_raw_fieldtrip, read_epochs_fieldtrip,
                         read_evoked_fieldtrip)
@@ -12,7 +12,7 @@ from . import (read_raw_edf, read_raw_bdf, read_raw_gdf, read_raw_brainvision,
                read_raw_fif, read_raw_eeglab, read_raw_cnt, read_raw_egi,
                read_raw_eximia, read_raw_nirx, read_raw_fieldtrip,
                read_raw_artemis123, read_raw_nicolet, read_raw_kit,
-               read_raw_ctf, read_raw_boxy)
+               read_raw_ctf, read_raw_boxy, read_raw_hdf5)
 from ..utils import fill_doc
 
 
@@ -46,6 +46,7 @@ supported = {
     ".con": read_raw_kit,
     ".ds": read_raw_ctf,
     ".txt": read_raw_boxy,
+    ".h5": read_raw_hdf5,
 }
 
 # known but unsupported file formats
@@ -71,7 +72,8 @@ def read_raw(fname, *, preload=False, verbose=None, **kwargs):
     `~mne.io.read_raw_cnt`, `~mne.io.read_raw_ctf`, `~mne.io.read_raw_edf`,
     `~mne.io.read_raw_eeglab`, `~mne.io.read_raw_egi`,
     `~mne.io.read_raw_eximia`, `~mne.io.read_raw_fieldtrip`,
-    `~mne.io.read_raw_fif`,  `~mne.io.read_raw_gdf`, `~mne.io.read_raw_kit`,
+    `~mne.io.read_raw_fif`,  `~mne.io.read_raw_gdf`, `~mne.io.read_raw_hdf5`,
+    `~mne.io.read_raw_kit`,
     `~mne.io.read_raw_nicolet`, and `~mne.io.read_raw_nirx`.
 
     Parameters
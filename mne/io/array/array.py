@@ -7,7 +7,8 @@
 import numpy as np
 
 from ..base import BaseRaw
-from ...utils import verbose, logger, _validate_type, fill_doc, _check_option
+from ...utils import (verbose, logger, _validate_type, fill_doc, _check_option,
+                      _check_preload_dtype)
 
 
 @fill_doc
@@ -28,9 +29,10 @@ class RawArray(BaseRaw):
     copy : {'data', 'info', 'both', 'auto', None}
         Determines what gets copied on instantiation. "auto" (default)
         will copy info, and copy "data" only if necessary to get to
-        double floating point precision.
+        double floating point precision (or to ``dtype``).
 
         .. versionadded:: 0.18
+    %(preload_dtype)s
     %(verbose)s
 
     See Also
@@ -51,11 +53,12 @@ class RawArray(BaseRaw):
     """
 
     @verbose
-    def __init__(self, data, info, first_samp=0, copy='auto',
+    def __init__(self, data, info, first_samp=0, copy='auto', dtype=None,
                  verbose=None):  # noqa: D102
         _validate_type(info, 'info', 'info')
         _check_option('copy', copy, ('data', 'info', 'both', 'auto', None))
-        dtype = np.complex128 if np.any(np.iscomplex(data)) else np.float64
+        dtype = _check_preload_dtype(
+            dtype, np.complex128 if np.any(np.iscomplex(data)) else np.float64)
         orig_data = data
         data = np.asanyarray(orig_data, dtype=dtype)
         if data.ndim != 2:
@@ -73,10 +76,10 @@ class RawArray(BaseRaw):
                 data = data.copy()
         elif copy != 'auto' and data is not orig_data:
             raise ValueError('data copying was not requested by copy=%r but '
-                             'it was required to get to double floating point '
-                             'precision' % (copy,))
+                             'it was required to get to %s precision'
+                             % (copy, dtype.name))
         logger.info('Creating RawArray with %s data, n_channels=%s, n_times=%s'
-                    % (dtype.__name__, data.shape[0], data.shape[1]))
+                    % (dtype.name, data.shape[0], data.shape[1]))
         super(RawArray, self).__init__(info, data,
                                        first_samps=(int(first_samp),),
                                        dtype=dtype, verbose=verbose)
@@ -73,6 +73,14 @@ def test_array_copy():
     assert raw.info is info
     with pytest.raises(ValueError, match='data copying was not .* copy=None'):
         RawArray(data.astype(np.float32), info, copy=None)
+    # dtype
+    data_32 = data.astype(np.float32)
+    raw = RawArray(data_32, info, copy=None, dtype='float32')
+    assert raw._data is data_32
+    raw = RawArray(data, info, dtype=np.float32)
+    assert raw._data.dtype == np.float32
+    with pytest.raises(ValueError, match='data copying was not .* copy=None'):
+        RawArray(data, info, copy=None, dtype='float32')
 
 
 @pytest.mark.slowtest
@@ -10,17 +10,21 @@
 #
 # License: BSD (3-clause)
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import timedelta
+from functools import partial
 import os
 import os.path as op
 import shutil
-from collections import defaultdict
+import threading
+from collections import defaultdict, deque, OrderedDict
 
 import numpy as np
 
 from .constants import FIFF
-from .utils import _construct_bids_filename, _check_orig_units
+from .utils import (_construct_bids_filename, _check_orig_units,
+                    _mult_cal_one)
 from .pick import (pick_types, pick_channels, pick_info, _picks_to_idx,
                    channel_type)
 from .meas_info import write_meas_info
@@ -35,11 +39,15 @@ from .write import (start_file, end_file, start_block, end_block,
                     write_id, write_string, _get_split_size, _NEXT_FILE_BUFFER)
 
 from ..annotations import (_annotations_starts_stops, _write_annotations,
-                           _handle_meas_date)
+                           _handle_meas_date, _merge_onsets_ends,
+                           _bad_annotation_overlaps)
 from ..filter import (FilterMixin, notch_filter, resample, _resamp_ratio_len,
-                      _resample_stim_channels, _check_fun)
+                      _resample_stim_channels, _check_fun, _check_method,
+                      _check_notch_widths, _check_stream, _filter_raw_stream,
+                      _notch_stop_bands, create_filter)
 from ..fixes import nullcontext
-from ..parallel import parallel_func
+from ..parallel import (parallel_func, check_n_jobs, _prefetch, _shared_empty,
+                        _is_shared, _shared_ref, _run_inplace)
 from ..utils import (_check_fname, _check_pandas_installed, sizeof_fmt,
                      _check_pandas_index_arguments, fill_doc, copy_doc,
                      check_fname, _get_stim_channel, _stamp_to_dt,
@@ -47,7 +55,7 @@ from ..utils import (_check_fname, _check_pandas_installed, sizeof_fmt,
                      copy_function_doc_to_method_doc, _validate_type,
                      _check_preload, _get_argvalues, _check_option,
                      _build_data_frame, _convert_times, _scale_dataframe_data,
-                     _check_time_format, _arange_div)
+                     _check_time_format, _arange_div, _check_preload_dtype)
 from ..defaults import _handle_default
 from ..viz import plot_raw, plot_raw_psd, plot_raw_psd_topo, _RAW_CLIP_DEF
 from ..event import find_events, concatenate_events
@@ -158,10 +166,12 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
                  verbose=None):  # noqa: D102
         # wait until the end to preload data, but triage here
         if isinstance(preload, np.ndarray):
-            # some functions (e.g., filtering) only work w/64-bit data
-            if preload.dtype not in (np.float64, np.complex128):
-                raise RuntimeError('datatype must be float64 or complex128, '
-                                   'not %s' % preload.dtype)
+            # some functions (e.g., filtering) only work w/floating data
+            if preload.dtype not in (np.float64, np.complex128,
+                                     np.float32, np.complex64):
+                raise RuntimeError('datatype must be float64, complex128, '
+                                   'float32 or complex64, not %s'
+                                   % preload.dtype)
             if preload.dtype != dtype:
                 raise ValueError('preload and dtype must match')
             self._data = preload
@@ -248,6 +258,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         self._projectors = list()
         self._projector = None
         self._dtype_ = dtype
+        self._block_cache = None
+        self._bad_spans = None
         self.set_annotations(None)
         # If we have True or a string, actually do the preloading
         if load_from_disk:
@@ -309,7 +321,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
 
     @verbose
     def _read_segment(self, start=0, stop=None, sel=None, data_buffer=None,
-                      projector=None, verbose=None):
+                      projector=None, n_jobs=1, dtype=None, verbose=None):
         """Read a chunk of raw data.
 
         Parameters
@@ -328,6 +340,10 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             to store the data.
         projector : array
             SSP operator to apply to the data.
+        n_jobs : int
+            Number of threads to use to read from multiple files at once.
+        dtype : numpy.dtype | None
+            The data type of the output. If None, ``self._dtype`` is used.
         %(verbose_meth)s
 
         Returns
@@ -352,7 +368,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         del sel
         assert n_out <= self.info['nchan']
         data_shape = (n_out, stop - start)
-        dtype = self._dtype
+        if dtype is None:
+            dtype = self._dtype
         if isinstance(data_buffer, np.ndarray):
             if data_buffer.shape != data_shape:
                 raise ValueError('data_buffer has incorrect shape: %s != %s'
@@ -403,6 +420,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
 
         # read from necessary files
         offset = 0
+        reads = list()
         for fi in np.nonzero(files_used)[0]:
             start_file = self._first_samps[fi]
             # first iteration (only) could start in the middle somewhere
@@ -416,12 +434,33 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             this_sl = slice(offset, offset + n_read)
             # reindex back to original file
             orig_idx = _convert_slice(self._read_picks[fi][need_idx])
-            _ReadSegmentFileProtector(self)._read_segment_file(
-                data[:, this_sl], orig_idx, fi,
-                int(start_file), int(stop_file), cals, mult)
+            reads.append((data[:, this_sl], orig_idx, fi,
+                          int(start_file), int(stop_file), cals, mult))
             offset += n_read
+        # each file goes to a disjoint slice of data, so these can be
+        # done in parallel
+        n_jobs = min(check_n_jobs(n_jobs), len(reads))
+        if n_jobs > 1:
+            logger.debug(f'Reading from {len(reads)} files using {n_jobs} '
+                         'threads')
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                for future in [executor.submit(self._read_file_chunk, *args)
+                               for args in reads]:
+                    future.result()
+        else:
+            for args in reads:
+                self._read_file_chunk(*args)
         return data
 
+    def _read_file_chunk(self, data, idx, fi, start, stop, cals, mult):
+        """Read from one file, through the block cache if there is one."""
+        if self._block_cache is not None:
+            self._block_cache.read(
+                self, data, idx, fi, start, stop, cals, mult)
+        else:
+            _ReadSegmentFileProtector(self)._read_segment_file(
+                data, idx, fi, start, stop, cals, mult)
+
     def _read_segment_file(self, data, idx, fi, start, stop, cals, mult):
         """Read a segment of data from a file.
 
@@ -489,23 +528,26 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         if start < 0:
             return None
         if reject_by_annotation and len(self.annotations) > 0:
-            annot = self.annotations
-            sfreq = self.info['sfreq']
-            onset = _sync_onset(self, annot.onset)
-            overlaps = np.where(onset < reject_stop / sfreq)
-            overlaps = np.where(onset[overlaps] + annot.duration[overlaps] >
-                                reject_start / sfreq)
-            for descr in annot.description[overlaps]:
-                if descr.lower().startswith('bad'):
-                    return descr
+            descr = _bad_annotation_overlaps(self, reject_start,
+                                             reject_stop)[0]
+            if descr is not None:
+                return descr
         return self._getitem((picks, slice(start, stop)), return_times=False)
 
     @verbose
-    def load_data(self, verbose=None):
+    def load_data(self, n_jobs=1, dtype=None, shared_memory=False,
+                  verbose=None):
         """Load raw data.
 
         Parameters
         ----------
+        n_jobs : int
+            Number of threads to use to read the data when it is stored in
+            multiple files (e.g., split files or concatenated raws).
+
+            .. versionadded:: 0.23
+        %(preload_dtype)s
+        %(preload_shared_memory)s
         %(verbose_meth)s
 
         Returns
@@ -516,23 +558,117 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         Notes
         -----
         This function will load raw data if it was not already preloaded.
-        If data were already preloaded, it will do nothing.
+        If data were already preloaded, it will do nothing (other than
+        converting them to ``dtype`` or moving them to shared memory, if
+        requested).
 
         .. versionadded:: 0.10.0
         """
+        _validate_type(shared_memory, bool, 'shared_memory')
         if not self.preload:
-            self._preload_data(True)
+            dtype = _check_preload_dtype(dtype, self._dtype)
+            preload = True
+            if shared_memory:
+                preload = _shared_empty((self.info['nchan'], self.n_times),
+                                        dtype)
+            self._preload_data(preload, n_jobs=n_jobs, dtype=dtype)
+        else:
+            dtype = _check_preload_dtype(dtype, self._data.dtype)
+            if shared_memory and not _is_shared(self._data):
+                data = _shared_empty(self._data.shape, dtype)
+                data[:] = self._data
+                self._data = data
+            elif dtype != self._data.dtype:
+                self._data = self._data.astype(dtype)
         return self
 
-    def _preload_data(self, preload):
+    @verbose
+    def set_block_cache(self, max_size='256MB', block_size=None,
+                        read_ahead=0, verbose=None):
+        """Cache blocks of data read from disk.
+
+        When data are not preloaded, each call to e.g. :meth:`get_data`
+        reads the requested samples from disk. With a block cache, data are
+        instead read in fixed-size blocks that are kept in memory (least
+        recently used blocks are discarded first), so that overlapping and
+        sequential reads (e.g., epoching, sliding windows, or the raw
+        browser) are served from memory.
+
+        Parameters
+        ----------
+        max_size : int | str | None
+            Maximum amount of memory to use for cached data, either in bytes
+            or as a string ending with ``'MB'`` or ``'GB'``. None or 0
+            disables the cache.
+        block_size : int | None
+            Number of samples per block. None (default) uses the buffer size
+            of the data (``raw.buffer_size_sec``).
+        read_ahead : int
+            Number of blocks following each read to load ahead of time in a
+            background thread. 0 (default) disables reading ahead.
+        %(verbose_meth)s
+
+        Returns
+        -------
+        raw : instance of Raw
+            The raw object. Operates in place.
+
+        Notes
+        -----
+        This has no effect on preloaded data. Statistics about the cache
+        usage are available as ``raw.block_cache_info``.
+
+        .. versionadded:: 0.23
+        """
+        if isinstance(max_size, str):
+            exp = dict(MB=20, GB=30).get(max_size[-2:], None)
+            if exp is None:
+                raise ValueError('max_size must end with either "MB" or '
+                                 f'"GB", got {max_size!r}')
+            max_size = int(float(max_size[:-2]) * 2 ** exp)
+        _validate_type(max_size, ('int-like', None), 'max_size')
+        if block_size is None:
+            block_size = self._get_buffer_size()
+        _validate_type(block_size, 'int-like', 'block_size')
+        _validate_type(read_ahead, 'int-like', 'read_ahead')
+        if block_size < 1 or read_ahead < 0:
+            raise ValueError('block_size must be positive and read_ahead '
+                             'non-negative, got %s and %s'
+                             % (block_size, read_ahead))
+        if self._block_cache is not None:
+            self._block_cache.close()
+            self._block_cache = None
+        if self.preload:
+            logger.info('Data are preloaded, not using a block cache')
+        elif max_size:
+            self._block_cache = _BlockCache(max_size, block_size, read_ahead)
+            logger.info('Caching up to %s of data in blocks of %d samples'
+                        % (sizeof_fmt(max_size), block_size))
+        return self
+
+    @property
+    def block_cache_info(self):
+        """Statistics of the block cache (None if not used).
+
+        A dict with the number of cache ``hits`` and ``misses`` (in blocks),
+        the number of blocks (``n_blocks``) and bytes (``n_bytes``) currently
+        cached, and the cache settings.
+        """
+        return None if self._block_cache is None else self._block_cache.info
+
+    def _preload_data(self, preload, n_jobs=1, dtype=None):
         """Actually preload the data."""
         data_buffer = preload
         if isinstance(preload, (bool, np.bool_)) and not preload:
             data_buffer = None
         logger.info('Reading %d ... %d  =  %9.3f ... %9.3f secs...' %
                     (0, len(self.times) - 1, 0., self.times[-1]))
+        block_cache, self._block_cache = self._block_cache, None
+        if block_cache is not None:  # no longer needed
+            block_cache.close()
         self._data = self._read_segment(
-            data_buffer=data_buffer, projector=self._projector)
+            data_buffer=data_buffer, projector=self._projector, n_jobs=n_jobs,
+            dtype=dtype)
         assert len(self._data) == self.info['nchan']
         self.preload = True
         self._comp = None  # no longer needed
@@ -772,13 +908,14 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         """  # noqa: E501
         return self._getitem(item)
 
-    def _getitem(self, item, return_times=True):
+    def _getitem(self, item, return_times=True, n_jobs=1):
         sel, start, stop = self._parse_get_set_params(item)
         if self.preload:
             data = self._data[sel, start:stop]
         else:
             data = self._read_segment(start=start, stop=stop, sel=sel,
-                                      projector=self._projector)
+                                      projector=self._projector,
+                                      n_jobs=n_jobs)
 
         if return_times:
             # Rather than compute the entire thing just compute the subset
@@ -797,10 +934,45 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         # set the data
         self._data[sel, start:stop] = value
 
+    def _get_bad_spans(self):
+        """Get the merged BAD annotation spans (in samples, end exclusive).
+
+        The result is cached until the annotations or timing change.
+        """
+        annot = self.annotations
+        key = (annot.onset.tobytes(), annot.duration.tobytes(),
+               annot.description.tobytes(), annot.orig_time,
+               self.info['meas_date'], self.info['sfreq'], self.first_samp)
+        if self._bad_spans is None or self._bad_spans[0] != key:
+            onsets, ends = _annotations_starts_stops(self, ['BAD'])
+            self._bad_spans = (key, _merge_onsets_ends(onsets, ends))
+        return self._bad_spans[1]
+
+    def _read_good_runs(self, picks, starts, stops, n_jobs=1):
+        """Read the given runs of samples from disk into a single array."""
+        lengths = stops - starts
+        data = np.empty((len(picks), lengths.sum()), self._dtype)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        # runs separated by less than a second are read together
+        gaps = starts[1:] - stops[:-1]
+        splits = np.flatnonzero(gaps >= self.info['sfreq']) + 1
+        for ri, rj in zip(np.concatenate([[0], splits]),
+                          np.concatenate([splits, [len(starts)]])):
+            first = starts[ri]
+            block = self._read_segment(
+                start=first, stop=stops[rj - 1], sel=picks,
+                projector=self._projector, n_jobs=n_jobs)
+            if rj - ri > 1:
+                block = block[:, _runs_to_mask(
+                    starts[ri:rj] - first, stops[ri:rj] - first,
+                    block.shape[1])]
+            data[:, offsets[ri]:offsets[rj]] = block
+        return data
+
     @verbose
     def get_data(self, picks=None, start=0, stop=None,
                  reject_by_annotation=None, return_times=False, units=None,
-                 verbose=None):
+                 n_jobs=1, verbose=None):
         """Get data in the given range.
 
         Parameters
@@ -833,6 +1005,11 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             ``dict(grad='fT/cm', mag='fT')`` will scale the corresponding types
             accordingly, but all other channel types will remain in their
             channel-type-specific default unit.
+        n_jobs : int
+            Number of threads to use to read data that are not preloaded and
+            span multiple files (e.g., split files or concatenated raws).
+
+            .. versionadded:: 0.23
         %(verbose_meth)s
 
         Returns
@@ -882,7 +1059,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         stop = min(self.n_times if stop is None else stop, self.n_times)
         if len(self.annotations) == 0 or reject_by_annotation is None:
             getitem = self._getitem(
-                (picks, slice(start, stop)), return_times=return_times)
+                (picks, slice(start, stop)), return_times=return_times,
+                n_jobs=n_jobs)
             if return_times:
                 data, times = getitem
                 if needs_conversion:
@@ -893,54 +1071,48 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             return getitem
         _check_option('reject_by_annotation', reject_by_annotation.lower(),
                       ['omit', 'nan'])
-        onsets, ends = _annotations_starts_stops(self, ['BAD'])
+        onsets, ends = self._get_bad_spans()
         keep = (onsets < stop) & (ends > start)
         onsets = np.maximum(onsets[keep], start)
         ends = np.minimum(ends[keep], stop)
         if len(onsets) == 0:
-            data, times = self[picks, start:stop]
+            data, times = self._getitem(
+                (picks, slice(start, stop)), n_jobs=n_jobs)
             if needs_conversion:
                 data *= ch_factors[:, np.newaxis]
             if return_times:
                 return data, times
             return data
         n_samples = stop - start  # total number of samples
-        used = np.ones(n_samples, bool)
-        for onset, end in zip(onsets, ends):
-            if onset >= end:
-                continue
-            used[onset - start: end - start] = False
-        used = np.concatenate([[False], used, [False]])
-        starts = np.where(~used[:-1] & used[1:])[0] + start
-        stops = np.where(used[:-1] & ~used[1:])[0] + start
+        # the bad spans are disjoint and sorted, so the good runs lie between
+        starts = np.concatenate([[start], ends])
+        stops = np.concatenate([onsets, [stop]])
+        nonempty = starts < stops
+        starts, stops = starts[nonempty], stops[nonempty]
         n_kept = (stops - starts).sum()  # kept samples
         n_rejected = n_samples - n_kept  # rejected samples
-        if n_rejected > 0:
-            if reject_by_annotation == 'omit':
-                msg = ("Omitting {} of {} ({:.2%}) samples, retaining {}"
-                       " ({:.2%}) samples.")
-                logger.info(msg.format(n_rejected, n_samples,
-                                       n_rejected / n_samples,
-                                       n_kept, n_kept / n_samples))
-                data = np.zeros((len(picks), n_kept))
-                times = np.zeros(data.shape[1])
-                idx = 0
-                for start, stop in zip(starts, stops):  # get the data
-                    if start == stop:
-                        continue
-                    end = idx + stop - start
-                    data[:, idx:end], times[idx:end] = self[picks, start:stop]
-                    idx = end
+        used = _runs_to_mask(starts - start, stops - start, n_samples)
+        if reject_by_annotation == 'omit':
+            msg = ("Omitting {} of {} ({:.2%}) samples, retaining {}"
+                   " ({:.2%}) samples.")
+            logger.info(msg.format(n_rejected, n_samples,
+                                   n_rejected / n_samples,
+                                   n_kept, n_kept / n_samples))
+            samples = np.flatnonzero(used) + start
+            times = samples / self.info['sfreq']
+            if self.preload:
+                data = self._data[picks[:, np.newaxis], samples]
             else:
-                msg = ("Setting {} of {} ({:.2%}) samples to NaN, retaining {}"
-                       " ({:.2%}) samples.")
-                logger.info(msg.format(n_rejected, n_samples,
-                                       n_rejected / n_samples,
-                                       n_kept, n_kept / n_samples))
-                data, times = self[picks, start:stop]
-                data[:, ~used[1:-1]] = np.nan
+                data = self._read_good_runs(picks, starts, stops, n_jobs)
         else:
-            data, times = self[picks, start:stop]
+            msg = ("Setting {} of {} ({:.2%}) samples to NaN, retaining {}"
+                   " ({:.2%}) samples.")
+            logger.info(msg.format(n_rejected, n_samples,
+                                   n_rejected / n_samples,
+                                   n_kept, n_kept / n_samples))
+            data, times = self._getitem(
+                (picks, slice(start, stop)), n_jobs=n_jobs)
+            data[:, ~used] = np.nan
 
         if needs_conversion:
             data *= ch_factors[:, np.newaxis]
@@ -989,6 +1161,11 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
                 for idx in picks:
                     self._data[idx, :] = _check_fun(fun, data_in[idx, :],
                                                     *args, **kwargs)
+            elif _is_shared(self._data):  # workers modify rows in place
+                parallel, p_fun, _ = parallel_func(_run_inplace, n_jobs)
+                parallel(p_fun(partial(_check_fun, fun),
+                               _shared_ref(self._data[p]), *args, **kwargs)
+                         for p in picks)
             else:
                 # use parallel function
                 parallel, p_fun, _ = parallel_func(_check_fun, n_jobs)
@@ -1009,18 +1186,21 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
                method='fir', iir_params=None, phase='zero',
                fir_window='hamming', fir_design='firwin',
                skip_by_annotation=('edge', 'bad_acq_skip'),
-               pad='reflect_limited', verbose=None):  # noqa: D102
+               pad='reflect_limited', preload=False,
+               verbose=None):  # noqa: D102
         return super().filter(
             l_freq, h_freq, picks, filter_length, l_trans_bandwidth,
             h_trans_bandwidth, n_jobs, method, iir_params, phase,
-            fir_window, fir_design, skip_by_annotation, pad, verbose)
+            fir_window, fir_design, skip_by_annotation, pad, preload,
+            verbose)
 
     @verbose
     def notch_filter(self, freqs, picks=None, filter_length='auto',
                      notch_widths=None, trans_bandwidth=1.0, n_jobs=1,
                      method='fir', iir_params=None, mt_bandwidth=None,
                      p_value=0.05, phase='zero', fir_window='hamming',
-                     fir_design='firwin', pad='reflect_limited', verbose=None):
+                     fir_design='firwin', pad='reflect_limited', preload=False,
+                     verbose=None):
         """Notch filter a subset of channels.
 
         Parameters
@@ -1056,6 +1236,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             The default is ``'reflect_limited'``.
 
             .. versionadded:: 0.15
+        %(preload_filter)s
         %(verbose_meth)s
 
         Returns
@@ -1074,7 +1255,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         "picks". By default the data of the Raw object is modified inplace.
 
         The Raw object has to have the data loaded e.g. with ``preload=True``
-        or ``self.load_data()``.
+        or ``self.load_data()``, unless the data are filtered while they are
+        loaded with the ``preload`` parameter.
 
         .. note:: If n_jobs > 1, more memory is required as
                   ``len(picks) * n_times`` additional time points need to
@@ -1084,7 +1266,21 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         """
         fs = float(self.info['sfreq'])
         picks = _picks_to_idx(self.info, picks, exclude=(), none='data_or_ica')
-        _check_preload(self, 'raw.notch_filter')
+        iir_params, method = _check_method(method, iir_params,
+                                           ['spectrum_fit'])
+        if _check_stream(self, preload, method, 'raw.notch_filter'):
+            freqs, notch_widths = _check_notch_widths(
+                freqs, notch_widths, method)
+            lows, highs = _notch_stop_bands(freqs, notch_widths,
+                                            trans_bandwidth)
+            tb_2 = trans_bandwidth / 2.0
+            h = create_filter(
+                np.empty((0, self.n_times), self._dtype), fs, highs, lows,
+                filter_length, tb_2, tb_2, method, iir_params, phase,
+                fir_window, fir_design)
+            _filter_raw_stream(self, preload, [(0, self.n_times, h)], picks,
+                               phase, pad, n_jobs)
+            return self
         self._data = notch_filter(
             self._data, fs, freqs, filter_length=filter_length,
             notch_widths=notch_widths, trans_bandwidth=trans_bandwidth,
@@ -1096,7 +1292,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
 
     @verbose
     def resample(self, sfreq, npad='auto', window='boxcar', stim_picks=None,
-                 n_jobs=1, events=None, pad='reflect_limited',
+                 n_jobs=1, events=None, pad='reflect_limited', method='fft',
                  verbose=None):  # lgtm
         """Resample all channels.
 
@@ -1141,6 +1337,10 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             The default is ``'reflect_limited'``.
 
             .. versionadded:: 0.15
+        %(method-resample)s
+            Stim channels are subsampled or supersampled with either method.
+
+            .. versionadded:: 0.23
         %(verbose_meth)s
 
         Returns
@@ -1190,7 +1390,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
                                        with_ref_meg=False)
 
         kwargs = dict(up=sfreq, down=o_sfreq, npad=npad, window=window,
-                      n_jobs=n_jobs, pad=pad)
+                      n_jobs=n_jobs, pad=pad, method=method)
         ratio, n_news = zip(*(_resamp_ratio_len(sfreq, o_sfreq, old_len)
                               for old_len in self._raw_lengths))
         ratio, n_news = ratio[0], np.array(n_news, int)
@@ -1330,7 +1530,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
     def save(self, fname, picks=None, tmin=0, tmax=None, buffer_size_sec=None,
              drop_small_buffer=False, proj=False, fmt='single',
              overwrite=False, split_size='2GB', split_naming='neuromag',
-             verbose=None):
+             split_parallel=False, verbose=None):
         """Save raw data to file.
 
         Parameters
@@ -1344,6 +1544,10 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             ``_meg.fif`` (common MEG data), ``_eeg.fif`` (common EEG data),
             or ``_ieeg.fif`` (common intracranial EEG data). You may also
             append an additional ``.gz`` suffix to enable gzip compression.
+            Filenames ending with ``.h5`` (e.g., ``raw.h5``) are saved in a
+            chunked, compressed HDF5 format that supports reading channel
+            subsets and time windows without loading the whole file (see
+            :func:`mne.io.read_raw_hdf5` and Notes).
         %(picks_all)s
         %(raw_tmin)s
         %(raw_tmax)s
@@ -1368,6 +1572,9 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             and neither complex data types nor real data stored as 'double'
             can be loaded with the MNE command-line tools. See raw.orig_format
             to determine the format the original data were stored in.
+            For HDF5 files, 'double' keeps full precision, and 'int' and
+            'short' store integers with an offset and scale per channel and
+            per buffer.
         %(overwrite)s
             To overwrite original file (the same one that was loaded),
             data must be preloaded upon reading.
@@ -1383,10 +1590,28 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             Add the filename partition with the appropriate naming schema.
 
             .. versionadded:: 0.17
+        split_parallel : bool
+            If True, the split parts are written to their files concurrently
+            (up to 4 at a time) rather than one after the other. The resulting
+            files are identical.
+
+            .. versionadded:: 0.23
         %(verbose_meth)s
 
         Notes
         -----
+        Data are read and converted to the output format in a background
+        thread while the previous buffer is written to disk, so reading and
+        writing overlap.
+
+        When saving to ``.h5``, the data are stored compressed in chunks of
+        one channel by ``buffer_size_sec`` seconds, and ``drop_small_buffer``,
+        ``split_size``, ``split_naming`` and ``split_parallel`` are ignored.
+        Requires h5py.
+
+        .. versionadded:: 0.23
+           Support for ``.h5`` files.
+
         If Raw is a concatenation of several raw files, **be warned** that
         only the measurement information from the first raw file is stored.
         This likely means that certain operations with external tools may not
@@ -1398,7 +1623,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         endings = ('raw.fif', 'raw_sss.fif', 'raw_tsss.fif',
                    '_meg.fif', '_eeg.fif', '_ieeg.fif')
         endings += tuple([f'{e}.gz' for e in endings])
-        endings_err = ('.fif', '.fif.gz')
+        endings += ('raw.h5', '_meg.h5', '_eeg.h5', '_ieeg.h5')
+        endings_err = ('.fif', '.fif.gz', '.h5')
         check_fname(fname, 'raw', endings, endings_err=endings_err)
 
         split_size = _get_split_size(split_size)
@@ -1444,12 +1670,20 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         start, stop = self._tmin_tmax_to_start_stop(tmin, tmax)
         buffer_size = self._get_buffer_size(buffer_size_sec)
 
+        if fname.endswith('.h5'):
+            from .hdf5._hdf5 import _write_raw_hdf5
+            _write_raw_hdf5(fname, self, info, picks, fmt, start, stop,
+                            buffer_size, projector)
+            return
+
         # write the raw file
         _validate_type(split_naming, str, 'split_naming')
         _check_option('split_naming', split_naming, ('neuromag', 'bids'))
-        _write_raw(fname, self, info, picks, fmt, data_type, reset_range,
-                   start, stop, buffer_size, projector, drop_small_buffer,
-                   split_size, split_naming, 0, None, overwrite)
+        _validate_type(split_parallel, bool, 'split_parallel')
+        with (_SplitPool() if split_parallel else nullcontext()) as pool:
+            _write_raw(fname, self, info, picks, fmt, data_type, reset_range,
+                       start, stop, buffer_size, projector, drop_small_buffer,
+                       split_size, split_naming, 0, None, overwrite, pool)
 
     def _tmin_tmax_to_start_stop(self, tmin, tmax):
         start = int(np.floor(tmin * self.info['sfreq']))
@@ -1680,10 +1914,12 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
     def close(self):
         """Clean up the object.
 
-        Does nothing for objects that close their file descriptors.
-        Things like RawFIF will override this method.
+        Empties the block cache (if any) and stops its read-ahead thread.
+        Otherwise does nothing for objects that close their file
+        descriptors. Things like RawFIF will override this method.
         """
-        pass  # noqa
+        if self._block_cache is not None:
+            self._block_cache.close()
 
     def copy(self):
         """Return copy of Raw instance.
@@ -1901,6 +2137,14 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
             print(msg)
 
 
+def _runs_to_mask(starts, stops, n_samples):
+    """Get a boolean mask that is True within the (disjoint) runs."""
+    mask = np.zeros(n_samples + 1, int)
+    np.add.at(mask, starts, 1)
+    np.add.at(mask, stops, -1)
+    return np.cumsum(mask[:-1]) > 0
+
+
 def _allocate_data(preload, shape, dtype):
     """Allocate data in memory or in memmap for preloading."""
     if preload in (None, True):  # None comes from _read_segment
@@ -2015,6 +2259,142 @@ class _ReadSegmentFileProtector(object):
             self, data, idx, fi, start, stop, cals, mult)
 
 
+class _BlockCache(object):
+    """LRU cache of uncalibrated blocks of data read from disk.
+
+    Blocks are aligned to multiples of ``block_size`` in the file sample
+    numbering, and contain all channels stored in the file with unit
+    calibration so that picking, calibration, compensation and projection
+    can be applied by :func:`mne.io.utils._mult_cal_one` on each request.
+    """
+
+    def __init__(self, max_bytes, block_size, read_ahead):
+        self.max_bytes = int(max_bytes)
+        self.block_size = int(block_size)
+        self.read_ahead = int(read_ahead)
+        self.hits = self.misses = 0
+        self._blocks = OrderedDict()
+        self._n_bytes = 0
+        self._pending = dict()
+        self._lock = threading.Lock()  # protects the dicts and counters
+        # serializes disk reads per file (different files are read in
+        # parallel when reading with n_jobs > 1)
+        self._read_locks = defaultdict(threading.Lock)
+        self._executor = None
+
+    def __getstate__(self):
+        # copies (and pickles) start out with an empty cache
+        return dict(max_bytes=self.max_bytes, block_size=self.block_size,
+                    read_ahead=self.read_ahead)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def info(self):
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses,
+                        n_blocks=len(self._blocks), n_bytes=self._n_bytes,
+                        max_bytes=self.max_bytes,
+                        block_size=self.block_size,
+                        read_ahead=self.read_ahead)
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._n_bytes = 0
+
+    def close(self):
+        """Stop reading ahead and empty the cache (it remains usable)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._pending.clear()
+        self._read_locks.clear()
+        self.clear()
+
+    def _block_lims(self, raw, fi, bi):
+        start = max(bi * self.block_size, raw._first_samps[fi])
+        stop = min((bi + 1) * self.block_size, raw._last_samps[fi] + 1)
+        return int(start), int(stop)
+
+    def _get(self, raw, fi, start, stop, prefetch=False):
+        """Get a block, reading it from disk if necessary."""
+        extras = raw._raw_extras[fi]
+        # the extras are unique to a file of a given instance, so their id is
+        # a valid key (we keep a reference to them so it cannot be reused)
+        key = (id(extras), start, stop)
+        future = None
+        with self._lock:
+            block = self._blocks.get(key, None)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                self.hits += not prefetch
+                return block[1]
+            if not prefetch:
+                future = self._pending.get(key, None)
+                if future is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+        if future is not None:  # being read ahead, wait for it
+            return future.result()
+        block = np.zeros((extras['orig_nchan'], stop - start), raw._dtype)
+        with self._lock:
+            read_lock = self._read_locks[id(extras)]
+        with read_lock:
+            _ReadSegmentFileProtector(raw)._read_segment_file(
+                block, slice(0, len(block)), fi, start, stop,
+                np.ones((len(block), 1)), None)
+        with self._lock:
+            if block.nbytes <= self.max_bytes and key not in self._blocks:
+                self._blocks[key] = (extras, block)
+                self._n_bytes += block.nbytes
+                while self._n_bytes > self.max_bytes:
+                    _, old = self._blocks.popitem(last=False)
+                    self._n_bytes -= old[1].nbytes
+        return block
+
+    def _prefetch(self, raw, fi, bi):
+        start, stop = self._block_lims(raw, fi, bi)
+        if start >= stop:
+            return
+        key = (id(raw._raw_extras[fi]), start, stop)
+        with self._lock:
+            if key in self._blocks or key in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            future = self._executor.submit(
+                self._get, raw, fi, start, stop, True)
+            self._pending[key] = future
+
+        def _done(future):
+            with self._lock:
+                self._pending.pop(key, None)
+
+        future.add_done_callback(_done)
+
+    def read(self, raw, data, idx, fi, start, stop, cals, mult):
+        """Read data through the cache (same signature as the reader)."""
+        offset = 0
+        first_bi = start // self.block_size
+        last_bi = (stop - 1) // self.block_size
+        for bi in range(first_bi, last_bi + 1):
+            block_start, block_stop = self._block_lims(raw, fi, bi)
+            block = self._get(raw, fi, block_start, block_stop)
+            sl = slice(max(start, block_start) - block_start,
+                       min(stop, block_stop) - block_start)
+            n_read = sl.stop - sl.start
+            _mult_cal_one(data[:, offset:offset + n_read], block[:, sl],
+                          idx, cals, mult)
+            offset += n_read
+        assert offset == stop - start
+        for bi in range(last_bi + 1, last_bi + 1 + self.read_ahead):
+            self._prefetch(raw, fi, bi)
+
+
 class _RawShell(object):
     """Create a temporary raw object."""
 
@@ -2045,29 +2425,27 @@ class _RawShell(object):
 # Writing
 def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                stop, buffer_size, projector, drop_small_buffer,
-               split_size, split_naming, part_idx, prev_fname, overwrite):
-    """Write raw file with splitting."""
+               split_size, split_naming, part_idx, prev_fname, overwrite,
+               pool=None):
+    """Write raw file with splitting.
+
+    With a ``_SplitPool``, the next part is written by the pool while this
+    one is written.
+    """
     # we've done something wrong if we hit this
     n_times_max = len(raw.times)
     if start >= stop or stop > n_times_max:
         raise RuntimeError('Cannot write raw file with no data: %s -> %s '
                            '(max: %s) requested' % (start, stop, n_times_max))
 
-    base, ext = op.splitext(fname)
-    if part_idx > 0:
-        if split_naming == 'neuromag':
-            # insert index in filename
-            use_fname = '%s-%d%s' % (base, part_idx, ext)
-        else:
-            assert split_naming == 'bids'
-            use_fname = _construct_bids_filename(base, ext, part_idx + 1)
-            # check for file existence
-            _check_fname(use_fname, overwrite)
-    else:
-        use_fname = fname
+    use_fname = _split_fname(fname, part_idx, split_naming)
+    if part_idx > 0 and split_naming == 'bids':
+        # check for file existence
+        _check_fname(use_fname, overwrite)
     # reserve our BIDS split fname in case we need to split
     if split_naming == 'bids' and part_idx == 0:
         # reserve our possible split name
+        base, ext = op.splitext(fname)
         reserved_fname = _construct_bids_filename(base, ext, part_idx + 1)
         logger.info(
             f'Reserving possible split file {op.basename(reserved_fname)}')
@@ -2086,7 +2464,7 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
             raw, info, picks, fid, cals, part_idx, start, stop,
             buffer_size, prev_fname, split_size, use_fname,
             projector, drop_small_buffer, fmt, fname, reserved_fname,
-            data_type, reset_range, split_naming, overwrite)
+            data_type, reset_range, split_naming, overwrite, pool)
     if final_fname != use_fname:
         assert split_naming == 'bids'
         logger.info(f'Renaming BIDS split file {op.basename(final_fname)}')
@@ -2097,6 +2475,60 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
     return final_fname, part_idx
 
 
+def _split_fname(fname, part_idx, split_naming):
+    """Get the file name of a split part (before BIDS renaming)."""
+    if part_idx == 0:
+        return fname
+    base, ext = op.splitext(fname)
+    if split_naming == 'neuromag':
+        # insert index in filename
+        return '%s-%d%s' % (base, part_idx, ext)
+    assert split_naming == 'bids'
+    return _construct_bids_filename(base, ext, part_idx + 1)
+
+
+class _SplitPool(object):
+    """Write split parts in a bounded pool of threads.
+
+    Each part submits the next one as soon as it knows where it ends. On
+    exit, the submitted parts are waited for. If one of them (or the code in
+    the ``with`` block) fails, the pending parts are cancelled and the
+    running ones stop at their next buffer.
+    """
+
+    def __init__(self, n_threads=4):
+        self._executor = ThreadPoolExecutor(max_workers=n_threads)
+        self._futures = deque()
+        self._lock = threading.Lock()
+        self.aborted = threading.Event()
+
+    def submit(self, func, *args):
+        """Write a part in the pool."""
+        with self._lock:
+            if not self.aborted.is_set():
+                self._futures.append(self._executor.submit(func, *args))
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        try:
+            if exc_type is None:
+                while len(self._futures) > 0:  # parts can submit more parts
+                    self._futures[0].result()
+                    self._futures.popleft()
+        except BaseException:
+            exc_type = True
+            raise
+        finally:
+            if exc_type is not None:
+                with self._lock:
+                    self.aborted.set()
+                    for future in self._futures:
+                        future.cancel()
+            self._executor.shutdown(wait=True)
+
+
 class _ReservedFilename:
 
     def __init__(self, fname):
@@ -2117,7 +2549,8 @@ class _ReservedFilename:
 def _write_raw_fid(raw, info, picks, fid, cals, part_idx, start, stop,
                    buffer_size, prev_fname, split_size, use_fname,
                    projector, drop_small_buffer, fmt, fname, reserved_fname,
-                   data_type, reset_range, split_naming, overwrite):
+                   data_type, reset_range, split_naming, overwrite,
+                   pool=None):
     first_samp = raw.first_samp + start
     if first_samp != 0:
         write_int(fid, FIFF.FIFF_FIRST_SAMPLE, first_samp)
@@ -2155,11 +2588,41 @@ def _write_raw_fid(raw, info, picks, fid, cals, part_idx, start, stop,
                 warn('Acquisition skips detected but did not fit evenly into '
                      'output buffer_size, will be written as zeroes.')
 
+    is_skip = [do_skips and bool(((first >= sk_onsets) &
+                                  (last <= sk_ends)).any())
+               for first, last in zip(firsts, lasts)]
     n_current_skip = 0
     final_fname = use_fname
-    for first, last in zip(firsts, lasts):
-        if do_skips:
-            if ((first >= sk_onsets) & (last <= sk_ends)).any():
+
+    # Find where to split (if needed), before writing any data
+    split_first = _get_split_first(
+        raw, picks, fmt, pos_prev, split_size, firsts, lasts, is_skip, start,
+        stop, buffer_size, drop_small_buffer)
+    if split_first is not None and pool is not None:
+        # the next part does not depend on this one, so start it right away
+        pool.submit(_write_raw, fname, raw, info, picks, fmt, data_type,
+                    reset_range, split_first + buffer_size, stop,
+                    buffer_size, projector, drop_small_buffer, split_size,
+                    split_naming, part_idx + 1, reserved_fname, overwrite,
+                    pool)
+
+    # Read, project and convert the next buffer while this one is written
+    def _prepare(first_last):
+        data, times = raw[picks, slice(*first_last)]
+        assert len(times) == first_last[1] - first_last[0]
+        if projector is not None:
+            data = np.dot(projector, data)
+        return _prepare_raw_buffer(data, cals, fmt)
+
+    buffers = _prefetch(_prepare, [
+        (first, last) for first, last, skip in zip(firsts, lasts, is_skip)
+        if not skip])
+    try:
+        for first, last, skip in zip(firsts, lasts, is_skip):
+            if pool is not None and pool.aborted.is_set():
+                raise RuntimeError('Writing %s was aborted because another '
+                                   'split part failed' % (use_fname,))
+            if skip:
                 # Track how many we have
                 n_current_skip += 1
                 continue
@@ -2171,54 +2634,42 @@ def _write_raw_fid(raw, info, picks, fid, cals, part_idx, start, stop,
                 # write_nop(fid)
                 # write_nop(fid)
                 n_current_skip = 0
-        data, times = raw[picks, first:last]
-        assert len(times) == last - first
-
-        if projector is not None:
-            data = np.dot(projector, data)
 
-        if ((drop_small_buffer and (first > start) and
-             (len(times) < buffer_size))):
-            logger.info('Skipping data chunk due to small buffer ... '
-                        '[done]')
-            break
-        logger.debug('Writing ...')
-        _write_raw_buffer(fid, data, cals, fmt)
-
-        pos = fid.tell()
-        this_buff_size_bytes = pos - pos_prev
-        overage = pos - split_size + _NEXT_FILE_BUFFER
-        if overage > 0:
-            # This should occur on the first buffer write of the file, so
-            # we should mention the space required for the meas info
-            raise ValueError(
-                'buffer size (%s) is too large for the given split size (%s) '
-                'by %s bytes after writing info (%s) and leaving enough space '
-                'for end tags (%s): decrease "buffer_size_sec" or increase '
-                '"split_size".' % (this_buff_size_bytes, split_size, overage,
-                                   pos_prev, _NEXT_FILE_BUFFER))
-
-        # Split files if necessary, leave some space for next file info
-        # make sure we check to make sure we actually *need* another buffer
-        # with the "and" check
-        if pos >= split_size - this_buff_size_bytes - _NEXT_FILE_BUFFER and \
-                first + buffer_size < stop:
-            final_fname = reserved_fname
-            next_fname, next_idx = _write_raw(
-                fname, raw, info, picks, fmt,
-                data_type, reset_range, first + buffer_size, stop, buffer_size,
-                projector, drop_small_buffer, split_size, split_naming,
-                part_idx + 1, final_fname, overwrite)
-
-            start_block(fid, FIFF.FIFFB_REF)
-            write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
-            write_string(fid, FIFF.FIFF_REF_FILE_NAME, op.basename(next_fname))
-            if info['meas_id'] is not None:
-                write_id(fid, FIFF.FIFF_REF_FILE_ID, info['meas_id'])
-            write_int(fid, FIFF.FIFF_REF_FILE_NUM, next_idx)
-            end_block(fid, FIFF.FIFFB_REF)
-            break
-        pos_prev = pos
+            if ((drop_small_buffer and (first > start) and
+                 (last - first < buffer_size))):
+                logger.info('Skipping data chunk due to small buffer ... '
+                            '[done]')
+                break
+            logger.debug('Writing ...')
+            write_function, data = next(buffers)
+            write_function(fid, FIFF.FIFF_DATA_BUFFER, data)
+
+            # Split files if necessary
+            if first == split_first:
+                final_fname = reserved_fname
+                if pool is None:
+                    next_fname, next_idx = _write_raw(
+                        fname, raw, info, picks, fmt,
+                        data_type, reset_range, first + buffer_size,
+                        stop, buffer_size, projector, drop_small_buffer,
+                        split_size, split_naming, part_idx + 1,
+                        final_fname, overwrite)
+                else:  # it is being written by the pool
+                    next_fname = _split_fname(fname, part_idx + 1,
+                                              split_naming)
+                    next_idx = part_idx + 1
+
+                start_block(fid, FIFF.FIFFB_REF)
+                write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
+                write_string(fid, FIFF.FIFF_REF_FILE_NAME,
+                             op.basename(next_fname))
+                if info['meas_id'] is not None:
+                    write_id(fid, FIFF.FIFF_REF_FILE_ID, info['meas_id'])
+                write_int(fid, FIFF.FIFF_REF_FILE_NUM, next_idx)
+                end_block(fid, FIFF.FIFFB_REF)
+                break
+    finally:
+        buffers.close()
 
     logger.info('Closing %s' % use_fname)
     if info.get('maxshield', False):
@@ -2302,21 +2753,57 @@ def _start_writing_raw(name, info, sel, data_type,
     return fid, cals
 
 
-def _write_raw_buffer(fid, buf, cals, fmt):
-    """Write raw buffer.
+def _get_split_first(raw, picks, fmt, pos, split_size, firsts, lasts,
+                     is_skip, start, stop, buffer_size, drop_small_buffer):
+    """Get the first sample of the last buffer of a file before it is split.
 
-    Parameters
-    ----------
-    fid : file descriptor
-        an open raw data file.
-    buf : array
-        The buffer to write.
-    cals : array
-        Calibration factors.
-    fmt : str
-        'short', 'int', 'single', or 'double' for 16/32 bit int or 32/64 bit
-        float for each item. This will be doubled for complex datatypes. Note
-        that short and int formats cannot be used for complex data.
+    This follows the file position from ``pos`` (after the measurement info)
+    through the tags that ``_write_raw_fid`` writes for each buffer, and
+    returns None if the data fit in the file.
+    """
+    n_bytes = dict(short=2, int=4, single=4, double=8)[fmt] * len(picks)
+    if np.iscomplexobj(raw[picks[:1], start:start + 1][0]):
+        n_bytes *= 2
+    n_current_skip = 0
+    pos_prev = pos
+    for first, last, skip in zip(firsts, lasts, is_skip):
+        if skip:
+            n_current_skip += 1
+            continue
+        elif n_current_skip > 0:
+            pos += 20  # FIFF_DATA_SKIP int tag
+            n_current_skip = 0
+        if drop_small_buffer and first > start and \
+                last - first < buffer_size:
+            break
+        pos += 16 + n_bytes * (last - first)  # FIFF_DATA_BUFFER tag
+        this_buff_size_bytes = pos - pos_prev
+        overage = pos - split_size + _NEXT_FILE_BUFFER
+        if overage > 0:
+            # This should occur on the first buffer write of the file, so
+            # we should mention the space required for the meas info
+            raise ValueError(
+                'buffer size (%s) is too large for the given split size (%s) '
+                'by %s bytes after writing info (%s) and leaving enough space '
+                'for end tags (%s): decrease "buffer_size_sec" or increase '
+                '"split_size".' % (this_buff_size_bytes, split_size, overage,
+                                   pos_prev, _NEXT_FILE_BUFFER))
+
+        # Split files if necessary, leave some space for next file info
+        # make sure we check to make sure we actually *need* another buffer
+        # with the "and" check
+        if pos >= split_size - this_buff_size_bytes - _NEXT_FILE_BUFFER and \
+                first + buffer_size < stop:
+            return first
+        pos_prev = pos
+    return None
+
+
+def _prepare_raw_buffer(buf, cals, fmt):
+    """Convert a raw buffer to the stored format.
+
+    Returns the tag write function and the calibrated (and possibly
+    integer-cast) buffer, see ``_write_raw_buffer``.
     """
     if buf.shape[0] != len(cals):
         raise ValueError('buffer and calibration sizes do not match')
@@ -2347,6 +2834,26 @@ def _write_raw_buffer(fid, buf, cals, fmt):
     buf = buf / np.ravel(cals)[:, None]
     if cast_int:
         buf = buf.astype(np.int32)
+    return write_function, buf
+
+
+def _write_raw_buffer(fid, buf, cals, fmt):
+    """Write raw buffer.
+
+    Parameters
+    ----------
+    fid : file descriptor
+        an open raw data file.
+    buf : array
+        The buffer to write.
+    cals : array
+        Calibration factors.
+    fmt : str
+        'short', 'int', 'single', or 'double' for 16/32 bit int or 32/64 bit
+        float for each item. This will be doubled for complex datatypes. Note
+        that short and int formats cannot be used for complex data.
+    """
+    write_function, buf = _prepare_raw_buffer(buf, cals, fmt)
     write_function(fid, FIFF.FIFF_DATA_BUFFER, buf)
 
 
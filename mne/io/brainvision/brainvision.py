@@ -23,7 +23,7 @@ from ...utils import verbose, logger, warn, fill_doc, _DefaultEventParser
 from ..constants import FIFF
 from ..meas_info import _empty_info
 from ..base import BaseRaw
-from ..utils import _read_segments_file, _mult_cal_one
+from ..utils import _mult_cal_one
 from ...annotations import Annotations, read_annotations
 from ...channels import make_dig_montage
 
@@ -112,12 +112,9 @@ class RawBrainVision(BaseRaw):
         # read data
         n_data_ch = self._raw_extras[fi]['orig_nchan']
         fmt = self._raw_extras[fi]['fmt']
-        if self._raw_extras[fi]['order'] == 'C':
-            _read_segments_c(self, data, idx, fi, start, stop, cals, mult)
-        elif isinstance(fmt, str):
-            dtype = _fmt_dtype_dict[fmt]
-            _read_segments_file(self, data, idx, fi, start, stop, cals, mult,
-                                dtype=dtype, n_channels=n_data_ch)
+        if isinstance(fmt, str):
+            _read_segments_memmap(self, data, idx, fi, start, stop, cals,
+                                  mult)
         else:
             offsets = self._raw_extras[fi]['offsets']
             with open(self._filenames[fi], 'rb') as fid:
@@ -130,20 +127,25 @@ class RawBrainVision(BaseRaw):
             _mult_cal_one(data, block, idx, cals, mult)
 
 
-def _read_segments_c(raw, data, idx, fi, start, stop, cals, mult):
-    """Read chunk of vectorized raw data."""
+def _read_segments_memmap(raw, data, idx, fi, start, stop, cals, mult):
+    """Read chunk of binary raw data through a memory map.
+
+    Multiplexed files are mapped as (n_samples, n_channels) and vectorized
+    ones as (n_channels, n_samples), so picks and time windows are views.
+    """
     n_samples = raw._raw_extras[fi]['n_samples']
     fmt = raw._raw_extras[fi]['fmt']
-    dtype = _fmt_dtype_dict[fmt]
-    n_bytes = _fmt_byte_dict[fmt]
+    order = raw._raw_extras[fi]['order']
     n_channels = raw._raw_extras[fi]['orig_nchan']
-    block = np.zeros((n_channels, stop - start))
-    with open(raw._filenames[fi], 'rb', buffering=0) as fid:
-        ids = np.arange(idx.start, idx.stop) if isinstance(idx, slice) else idx
-        for ch_id in ids:
-            fid.seek(start * n_bytes + ch_id * n_bytes * n_samples)
-            block[ch_id] = np.fromfile(fid, dtype, stop - start)
-    _mult_cal_one(data, block, idx, cals, mult)
+    shape = (n_channels, n_samples)
+    if order == 'F':  # multiplexed, channels in columns
+        shape = shape[::-1]
+    block = np.memmap(raw._filenames[fi], dtype=_fmt_dtype_dict[fmt],
+                      mode='r', shape=shape)
+    if order == 'F':
+        block = block.T
+    _mult_cal_one(data, block[:, start:stop], idx, cals, mult)
+    del block
 
 
 def _read_vmrk(fname):
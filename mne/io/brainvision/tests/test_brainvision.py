@@ -273,6 +273,37 @@ def test_ascii(tmpdir):
     assert_allclose(times_new, times)
 
 
+@pytest.mark.parametrize('orientation, fmt', [
+    ('MULTIPLEXED', 'IEEE_FLOAT_32'),
+    ('VECTORIZED', 'INT_16'),
+    ('VECTORIZED', 'INT_32'),
+])
+def test_binary_layouts(tmpdir, orientation, fmt):
+    """Test reading binary BV data in different layouts and formats."""
+    raw = read_raw_brainvision(vhdr_path)
+    data = np.fromfile(eeg_path, '<i2').reshape(-1, raw.info['nchan'])
+    if orientation == 'VECTORIZED':
+        data = data.T
+    dtype = dict(IEEE_FLOAT_32='<f4', INT_16='<i2', INT_32='<i4')[fmt]
+    new_vhdr_path = op.join(tmpdir, 'test_layout.vhdr')
+    shutil.copy(vmrk_path, new_vhdr_path.replace('.vhdr', '.vmrk'))
+    data.astype(dtype).tofile(new_vhdr_path.replace('.vhdr', '.eeg'))
+    with open(vhdr_path, 'r') as fin:
+        header = fin.read()
+    header = header.replace('DataFile=test.eeg', 'DataFile=test_layout.eeg')
+    header = header.replace('MarkerFile=test.vmrk',
+                            'MarkerFile=test_layout.vmrk')
+    header = header.replace('DataOrientation=MULTIPLEXED',
+                            f'DataOrientation={orientation}')
+    header = header.replace('BinaryFormat=INT_16', f'BinaryFormat={fmt}')
+    with open(new_vhdr_path, 'w') as fout:
+        fout.write(header)
+    raw_new = _test_raw_reader(read_raw_brainvision, vhdr_fname=new_vhdr_path)
+    assert_allclose(raw_new.get_data(), raw.get_data(), atol=1e-15)
+    assert_allclose(raw_new.get_data([3, 1], 10, 500),
+                    raw.get_data([3, 1], 10, 500), atol=1e-15)
+
+
 def test_ch_names_comma(tmpdir):
     """Test that channel names containing commas are properly read."""
     # commas in BV are encoded as \1
@@ -218,12 +218,7 @@ def _read_ch(fid, subtype, samp, dtype_byte, dtype=None):
     # BDF
     if subtype == 'bdf':
         ch_data = np.fromfile(fid, dtype=dtype, count=samp * dtype_byte)
-        ch_data = ch_data.reshape(-1, 3).astype(INT32)
-        ch_data = ((ch_data[:, 0]) +
-                   (ch_data[:, 1] << 8) +
-                   (ch_data[:, 2] << 16))
-        # 24th bit determines the sign
-        ch_data[ch_data >= (1 << 23)] -= (1 << 24)
+        ch_data = _decode_bdf(ch_data.reshape(-1, 3))
 
     # GDF data and EDF data
     else:
@@ -232,6 +227,30 @@ def _read_ch(fid, subtype, samp, dtype_byte, dtype=None):
     return ch_data
 
 
+def _decode_bdf(ch_data):
+    """Decode little-endian 24-bit integers (last axis has the 3 bytes)."""
+    ch_data = ch_data.astype(INT32)
+    ch_data = ((ch_data[..., 0]) +
+               (ch_data[..., 1] << 8) +
+               (ch_data[..., 2] << 16))
+    # 24th bit determines the sign
+    ch_data[ch_data >= (1 << 23)] -= (1 << 24)
+    return ch_data
+
+
+def _memmap_records(fname, raw_extras, n_rec_samp):
+    """Memory-map the data records as (n_records, n_record_values)."""
+    dtype = np.dtype(raw_extras['dtype_np'])
+    n_per_samp = raw_extras['dtype_byte'] // dtype.itemsize  # 3 for BDF
+    n_values = int(n_rec_samp * n_per_samp)
+    data_offset = int(raw_extras['data_offset'])
+    n_records = (os.path.getsize(fname) - data_offset) // \
+        (n_values * dtype.itemsize)
+    n_records = int(min(n_records, raw_extras['n_records']))
+    return np.memmap(fname, dtype=dtype, mode='r', offset=data_offset,
+                     shape=(n_records, n_values))
+
+
 def _read_segment_file(data, idx, fi, start, stop, raw_extras, filenames,
                        cals, mult):
     """Read a chunk of raw data."""
@@ -239,9 +258,7 @@ def _read_segment_file(data, idx, fi, start, stop, raw_extras, filenames,
 
     n_samps = raw_extras['n_samps']
     buf_len = int(raw_extras['max_samp'])
-    dtype = raw_extras['dtype_np']
     dtype_byte = raw_extras['dtype_byte']
-    data_offset = raw_extras['data_offset']
     stim_channel_idxs = raw_extras['stim_channel_idxs']
     orig_sel = raw_extras['sel']
     tal_idx = raw_extras.get('tal_idx', np.empty(0, int))
@@ -257,66 +274,82 @@ def _read_segment_file(data, idx, fi, start, stop, raw_extras, filenames,
     # actually one of the requested channels
     idx_arr = np.arange(idx.start, idx.stop) if isinstance(idx, slice) else idx
 
-    # We could read this one EDF block at a time, which would be this:
+    # Channels sharing a sampling rate (and stim-ness) are decoded together
+    # with a single strided gather from the memory-mapped records
+    groups = dict()
+    tal_chs = list()
+    for ii, ci in enumerate(read_sel):
+        if ci in tal_idx:
+            tal_chs.append(ci)
+            continue
+        orig_idx = idx_arr[ii]
+        assert ci == orig_sel[orig_idx]
+        key = (n_samps[ci], orig_idx in stim_channel_idxs)
+        groups.setdefault(key, ([], []))
+        groups[key][0].append(ci)
+        groups[key][1].append(orig_idx)
+
     ch_offsets = np.cumsum(np.concatenate([[0], n_samps]), dtype=np.int64)
     block_start_idx, r_lims, d_lims = _blk_read_lims(start, stop, buf_len)
-    # But to speed it up, we really need to read multiple blocks at once,
-    # Otherwise we can end up with e.g. 18,181 chunks for a 20 MB file!
-    # Let's do ~10 MB chunks:
+    # Decode ~10 MB of records at a time to limit the memory overhead
     n_per = max(10 * 1024 * 1024 // (ch_offsets[-1] * dtype_byte), 1)
-    with open(filenames, 'rb', buffering=0) as fid:
-
-        # Extract data
-        start_offset = (data_offset +
-                        block_start_idx * ch_offsets[-1] * dtype_byte)
-        for ai in range(0, len(r_lims), n_per):
-            block_offset = ai * ch_offsets[-1] * dtype_byte
-            n_read = min(len(r_lims) - ai, n_per)
-            fid.seek(start_offset + block_offset, 0)
-            # Read and reshape to (n_chunks_read, ch0_ch1_ch2_ch3...)
-            many_chunk = _read_ch(fid, subtype, ch_offsets[-1] * n_read,
-                                  dtype_byte, dtype).reshape(n_read, -1)
-            r_sidx = r_lims[ai][0]
-            r_eidx = (buf_len * (n_read - 1) + r_lims[ai + n_read - 1][1])
-            d_sidx = d_lims[ai][0]
-            d_eidx = d_lims[ai + n_read - 1][1]
-            one = np.zeros((len(orig_sel), d_eidx - d_sidx), dtype=data.dtype)
-            for ii, ci in enumerate(read_sel):
-                # This now has size (n_chunks_read, n_samp[ci])
-                ch_data = many_chunk[:, ch_offsets[ci]:ch_offsets[ci + 1]]
-
-                if ci in tal_idx:
-                    tal_data.append(ch_data)
-                    continue
+    records = _memmap_records(filenames, raw_extras, ch_offsets[-1])
+    n_per_samp = records.shape[1] // ch_offsets[-1]
 
-                orig_idx = idx_arr[ii]
-                ch_data = ch_data * cal[orig_idx]
-                ch_data += offsets[orig_idx]
-                ch_data *= gains[orig_idx]
-
-                assert ci == orig_sel[orig_idx]
-
-                if n_samps[ci] != buf_len:
-                    if orig_idx in stim_channel_idxs:
-                        # Stim channel will be interpolated
-                        old = np.linspace(0, 1, n_samps[ci] + 1, True)
-                        new = np.linspace(0, 1, buf_len, False)
-                        ch_data = np.append(
-                            ch_data, np.zeros((len(ch_data), 1)), -1)
-                        ch_data = interp1d(old, ch_data,
-                                           kind='zero', axis=-1)(new)
-                    else:
-                        # XXX resampling each chunk isn't great,
-                        # it forces edge artifacts to appear at
-                        # each buffer boundary :(
-                        # it can also be very slow...
-                        ch_data = resample(
-                            ch_data.astype(np.float64), buf_len, n_samps[ci],
-                            npad=0, axis=-1)
-                elif orig_idx in stim_channel_idxs:
-                    ch_data = np.bitwise_and(ch_data.astype(int), 2**17 - 1)
-                one[orig_idx] = ch_data.ravel()[r_sidx:r_eidx]
-            _mult_cal_one(data[:, d_sidx:d_eidx], one, idx, cals, mult)
+    def _gather(many_chunk, chs, n_samp):
+        # (n_chunks_read, n_ch, n_samp) values from a strided gather
+        cols = ch_offsets[chs][:, np.newaxis] + np.arange(n_samp)
+        if subtype == 'bdf':
+            cols = 3 * cols[..., np.newaxis] + np.arange(3)
+            return _decode_bdf(many_chunk[:, cols])
+        return many_chunk[:, cols]
+
+    for ai in range(0, len(r_lims), n_per):
+        n_read = min(len(r_lims) - ai, n_per)
+        rec_start = block_start_idx + ai
+        many_chunk = np.asarray(records[rec_start:rec_start + n_read])
+        if many_chunk.shape != (n_read, ch_offsets[-1] * n_per_samp):
+            raise RuntimeError('Incorrect number of samples (%s != %s), '
+                               'please report this error to MNE-Python '
+                               'developers' % (many_chunk.size,
+                                               n_read * records.shape[1]))
+        r_sidx = r_lims[ai][0]
+        r_eidx = (buf_len * (n_read - 1) + r_lims[ai + n_read - 1][1])
+        d_sidx = d_lims[ai][0]
+        d_eidx = d_lims[ai + n_read - 1][1]
+        one = np.zeros((len(orig_sel), d_eidx - d_sidx), dtype=data.dtype)
+        for ci in tal_chs:
+            # This has size (n_chunks_read, n_samp[ci])
+            tal_data.append(_gather(many_chunk, [ci], n_samps[ci])[:, 0])
+        for (n_samp, is_stim), (chs, orig_idx) in groups.items():
+            # This now has size (n_ch, n_chunks_read, n_samp)
+            ch_data = _gather(many_chunk, chs, n_samp).transpose(1, 0, 2)
+            ch_data = ch_data * cal[orig_idx][:, np.newaxis, np.newaxis]
+            ch_data += offsets[orig_idx][:, np.newaxis, np.newaxis]
+            ch_data *= gains[orig_idx][:, np.newaxis, np.newaxis]
+
+            if n_samp != buf_len:
+                if is_stim:
+                    # Stim channel will be interpolated
+                    old = np.linspace(0, 1, n_samp + 1, True)
+                    new = np.linspace(0, 1, buf_len, False)
+                    ch_data = np.concatenate(
+                        [ch_data, np.zeros(ch_data.shape[:2] + (1,))], -1)
+                    ch_data = interp1d(old, ch_data,
+                                       kind='zero', axis=-1)(new)
+                else:
+                    # XXX resampling each chunk isn't great,
+                    # it forces edge artifacts to appear at
+                    # each buffer boundary :(
+                    ch_data = resample(
+                        ch_data.astype(np.float64), buf_len, n_samp,
+                        npad=0, axis=-1)
+            elif is_stim:
+                ch_data = np.bitwise_and(ch_data.astype(int), 2**17 - 1)
+            ch_data = ch_data.reshape(len(chs), -1)
+            one[orig_idx] = ch_data[:, r_sidx:r_eidx]
+        _mult_cal_one(data[:, d_sidx:d_eidx], one, idx, cals, mult)
+    del records
 
     if len(tal_data) > 1:
         tal_data = np.concatenate([tal.ravel() for tal in tal_data])
@@ -27,7 +27,7 @@ from mne.io import read_raw_edf, read_raw_bdf, read_raw_fif, edf, read_raw_gdf
 from mne.io.tests.test_raw import _test_raw_reader
 from mne.io.edf.edf import (_get_edf_default_event_id, _read_annotations_edf,
                             _read_ch, _parse_prefilter_string, _edf_str,
-                            _read_edf_header, _read_header)
+                            _read_edf_header, _read_header, _decode_bdf)
 from mne.io.pick import channel_indices_by_type, get_channel_type_constants
 from mne.annotations import events_from_annotations, read_annotations
 
@@ -392,6 +392,37 @@ def test_edf_stim_ch_pick_up(test_input, EXPECTED):
     assert ch_types == EXPECTED
 
 
+def test_bdf_decode(tmpdir):
+    """Test vectorized decoding of 24-bit BDF samples."""
+    rng = np.random.RandomState(0)
+    raw_bytes = rng.randint(0, 256, (4, 5, 3)).astype(np.uint8)
+    raw_bytes[0, 0] = [255, 255, 255]  # -1
+    raw_bytes[0, 1] = [0, 0, 128]  # most negative
+    fname = tmpdir.join('samples.bin')
+    raw_bytes.tofile(fname)
+    want = [int.from_bytes(bytes(sample), 'little', signed=True)
+            for sample in raw_bytes.reshape(-1, 3)]
+    with open(fname, 'rb') as fid:
+        assert_array_equal(
+            _read_ch(fid, 'bdf', raw_bytes.size // 3, 3, np.uint8), want)
+    got = _decode_bdf(raw_bytes)
+    assert got.shape == (4, 5)
+    assert_array_equal(got.ravel(), want)
+    assert got[0, 0] == -1
+    assert got[0, 1] == -(1 << 23)
+
+
+def test_edf_uneven_partial_reads():
+    """Test that multi-rate channels read the same in arbitrary windows."""
+    raw = read_raw_edf(edf_uneven_path, stim_channel=None)
+    data = raw.get_data()
+    for picks, start, stop in ((None, 0, 1), ([1], 3, 47), ([0, 1], 17, 999),
+                               (None, 5, raw.n_times)):
+        want = data[:, start:stop] if picks is None else \
+            data[picks, start:stop]
+        assert_allclose(raw.get_data(picks, start, stop), want, atol=1e-20)
+
+
 @testing.requires_testing_data
 def test_bdf_multiple_annotation_channels():
     """Test BDF with multiple annotation channels."""
@@ -13,7 +13,8 @@ import os.path as op
 import numpy as np
 
 from ..constants import FIFF
-from ..open import fiff_open, _fiff_get_fid, _get_next_fname
+from ..open import (fiff_open, _fiff_get_fid, _get_next_fname,
+                    _read_index_cache, _write_index_cache)
 from ..meas_info import read_meas_info
 from ..tree import dir_tree_find
 from ..tag import read_tag, read_tag_info
@@ -52,6 +53,13 @@ class Raw(BaseRaw):
         activity. Can also be "yes" to load without eliciting a warning.
     %(preload)s
     %(on_split_missing)s
+    memmap : bool
+        If True (and ``preload=False``), data buffers are accessed through a
+        read-only :class:`numpy.memmap` of the file rather than being read
+        into a new array for each buffer. Calibration and channel selection
+        then operate directly on the mapped buffers. Ignored for gzipped files.
+
+        .. versionadded:: 0.23
     %(verbose)s
 
     Attributes
@@ -73,14 +81,15 @@ class Raw(BaseRaw):
 
     @verbose
     def __init__(self, fname, allow_maxshield=False, preload=False,
-                 on_split_missing='raise', verbose=None):  # noqa: D102
+                 on_split_missing='raise', memmap=False,
+                 verbose=None):  # noqa: D102
         raws = []
         do_check_ext = not _file_like(fname)
         next_fname = fname
         while next_fname is not None:
             raw, next_fname, buffer_size_sec = \
                 self._read_raw_file(next_fname, allow_maxshield,
-                                    preload, do_check_ext)
+                                    preload, do_check_ext, memmap)
             do_check_ext = False
             raws.append(raw)
             if next_fname is not None:
@@ -132,7 +141,7 @@ class Raw(BaseRaw):
 
     @verbose
     def _read_raw_file(self, fname, allow_maxshield, preload,
-                       do_check_ext=True, verbose=None):
+                       do_check_ext=True, memmap=False, verbose=None):
         """Read in header information from a raw file."""
         logger.info('Opening raw data file %s...' % fname)
 
@@ -147,12 +156,14 @@ class Raw(BaseRaw):
             fname = _check_fname(fname, 'read', True, 'fname')
             ext = os.path.splitext(fname)[1].lower()
             whole_file = preload if '.gz' in ext else False
+            memmap = memmap and '.gz' not in ext
             del ext
         else:
             # file-like
             if not preload:
                 raise ValueError('preload must be used with file-like objects')
             whole_file = True
+            memmap = False
         fname_rep = _get_fname_rep(fname)
         ff, tree, _ = fiff_open(fname, preload=whole_file)
         with ff as fid:
@@ -176,125 +187,26 @@ class Raw(BaseRaw):
             if len(raw_node) == 1:
                 raw_node = raw_node[0]
 
-            #   Process the directory
-            directory = raw_node['directory']
-            nent = raw_node['nent']
-            nchan = int(info['nchan'])
-            first = 0
-            first_samp = 0
-            first_skip = 0
-
-            #   Get first sample tag if it is there
-            if directory[first].kind == FIFF.FIFF_FIRST_SAMPLE:
-                tag = read_tag(fid, directory[first].pos)
-                first_samp = int(tag.data)
-                first += 1
-                _check_entry(first, nent)
-
-            #   Omit initial skip
-            if directory[first].kind == FIFF.FIFF_DATA_SKIP:
-                # This first skip can be applied only after we know the bufsize
-                tag = read_tag(fid, directory[first].pos)
-                first_skip = int(tag.data)
-                first += 1
-                _check_entry(first, nent)
-
-            raw = _RawShell()
-            raw.filename = fname
-            raw.first_samp = first_samp
-            raw.set_annotations(annotations)
-
-            #   Go through the remaining tags in the directory
-            raw_extras = list()
-            nskip = 0
-            orig_format = None
-
-            for k in range(first, nent):
-                ent = directory[k]
-                # There can be skips in the data (e.g., if the user unclicked)
-                # an re-clicked the button
-                if ent.kind == FIFF.FIFF_DATA_SKIP:
-                    tag = read_tag(fid, ent.pos)
-                    nskip = int(tag.data)
-                elif ent.kind == FIFF.FIFF_DATA_BUFFER:
-                    #   Figure out the number of samples in this buffer
-                    if ent.type == FIFF.FIFFT_DAU_PACK16:
-                        nsamp = ent.size // (2 * nchan)
-                    elif ent.type == FIFF.FIFFT_SHORT:
-                        nsamp = ent.size // (2 * nchan)
-                    elif ent.type == FIFF.FIFFT_FLOAT:
-                        nsamp = ent.size // (4 * nchan)
-                    elif ent.type == FIFF.FIFFT_DOUBLE:
-                        nsamp = ent.size // (8 * nchan)
-                    elif ent.type == FIFF.FIFFT_INT:
-                        nsamp = ent.size // (4 * nchan)
-                    elif ent.type == FIFF.FIFFT_COMPLEX_FLOAT:
-                        nsamp = ent.size // (8 * nchan)
-                    elif ent.type == FIFF.FIFFT_COMPLEX_DOUBLE:
-                        nsamp = ent.size // (16 * nchan)
-                    else:
-                        raise ValueError('Cannot handle data buffers of type '
-                                         '%d' % ent.type)
-                    if orig_format is None:
-                        if ent.type == FIFF.FIFFT_DAU_PACK16:
-                            orig_format = 'short'
-                        elif ent.type == FIFF.FIFFT_SHORT:
-                            orig_format = 'short'
-                        elif ent.type == FIFF.FIFFT_FLOAT:
-                            orig_format = 'single'
-                        elif ent.type == FIFF.FIFFT_DOUBLE:
-                            orig_format = 'double'
-                        elif ent.type == FIFF.FIFFT_INT:
-                            orig_format = 'int'
-                        elif ent.type == FIFF.FIFFT_COMPLEX_FLOAT:
-                            orig_format = 'single'
-                        elif ent.type == FIFF.FIFFT_COMPLEX_DOUBLE:
-                            orig_format = 'double'
-
-                    #  Do we have an initial skip pending?
-                    if first_skip > 0:
-                        first_samp += nsamp * first_skip
-                        raw.first_samp = first_samp
-                        first_skip = 0
-
-                    #  Do we have a skip pending?
-                    if nskip > 0:
-                        raw_extras.append(dict(
-                            ent=None, first=first_samp, nsamp=nskip * nsamp,
-                            last=first_samp + nskip * nsamp - 1))
-                        first_samp += nskip * nsamp
-                        nskip = 0
-
-                    #  Add a data buffer
-                    raw_extras.append(dict(ent=ent, first=first_samp,
-                                           last=first_samp + nsamp - 1,
-                                           nsamp=nsamp))
-                    first_samp += nsamp
-
+            #   Process the directory (or use the cached result)
+            raw_index = _read_index_cache(fname, 'raw')
+            if raw_index is None:
+                raw_index = _read_raw_index(fid, raw_node, int(info['nchan']))
+                _write_index_cache(fname, 'raw', raw_index)
+            # not cached: the cache is keyed by the real path, but the next
+            # file is relative to the (possibly symlinked) path used here
             next_fname = _get_next_fname(fid, fname_rep, tree)
 
-        # reformat raw_extras to be a dict of list/ndarray rather than
-        # list of dict (faster access)
-        raw_extras = {key: [r[key] for r in raw_extras]
-                      for key in raw_extras[0]}
-        for key in raw_extras:
-            if key != 'ent':  # dict or None
-                raw_extras[key] = np.array(raw_extras[key], int)
-        if not np.array_equal(raw_extras['last'][:-1],
-                              raw_extras['first'][1:] - 1):
-            raise RuntimeError('FIF file appears to be broken')
-        bounds = np.cumsum(np.concatenate(
-            [raw_extras['first'][:1], raw_extras['nsamp']]))
-        raw_extras['bounds'] = bounds
-        assert len(raw_extras['bounds']) == len(raw_extras['ent']) + 1
+        raw = _RawShell()
+        raw.filename = fname
+        raw.first_samp = raw_index['first_samp']
+        raw.last_samp = raw_index['last_samp']
+        raw.orig_format = raw_index['orig_format']
+        raw.set_annotations(annotations)
+        raw_extras = raw_index['raw_extras']
+        raw_extras['memmap'] = bool(memmap)
         # store the original buffer size
-        buffer_size_sec = np.median(raw_extras['nsamp']) / info['sfreq']
-        del raw_extras['first']
-        del raw_extras['last']
-        del raw_extras['nsamp']
-
-        raw.last_samp = first_samp - 1
-        raw.orig_format = orig_format
+        buffer_size_sec = np.median(np.diff(raw_extras['bounds'])) / \
+            info['sfreq']
 
         #   Add the calibration factors
         cals = np.zeros(info['nchan'])
@@ -350,6 +262,9 @@ class Raw(BaseRaw):
             ents = self._raw_extras[fi]['ent']
             nchan = self._raw_extras[fi]['orig_nchan']
             use = (stop > bounds[:-1]) & (start < bounds[1:])
+            mmap = None
+            if self._raw_extras[fi].get('memmap', False):
+                mmap = np.memmap(fid, dtype=np.uint8, mode='r')
             offset = 0
             for ei in np.where(use)[0]:
                 first = bounds[ei]
@@ -361,9 +276,13 @@ class Raw(BaseRaw):
                 picksamp = last_pick - first_pick
                 # only read data if it exists
                 if ent is not None:
-                    one = read_tag(fid, ent.pos,
-                                   shape=(nsamp, nchan),
-                                   rlims=(first_pick, last_pick)).data
+                    if mmap is not None:
+                        one = _memmap_buffer(mmap, ent, nsamp, nchan,
+                                             first_pick, last_pick)
+                    else:
+                        one = read_tag(fid, ent.pos,
+                                       shape=(nsamp, nchan),
+                                       rlims=(first_pick, last_pick)).data
                     try:
                         one.shape = (picksamp, nchan)
                     except AttributeError:  # one is None
@@ -429,6 +348,141 @@ def _get_fname_rep(fname):
         return 'File-like'
 
 
+# dtypes of the data buffers as stored on disk
+_buffer_dtypes = {
+    FIFF.FIFFT_DAU_PACK16: '>i2',
+    FIFF.FIFFT_SHORT: '>i2',
+    FIFF.FIFFT_FLOAT: '>f4',
+    FIFF.FIFFT_DOUBLE: '>f8',
+    FIFF.FIFFT_INT: '>i4',
+    FIFF.FIFFT_COMPLEX_FLOAT: '>c8',
+    FIFF.FIFFT_COMPLEX_DOUBLE: '>c16',
+}
+
+
+def _memmap_buffer(mmap, ent, nsamp, nchan, first_pick, last_pick):
+    """Get a (n_samp, n_chan) view of a data buffer from a file memmap."""
+    start = ent.pos + 16  # skip the tag header
+    stop = start + ent.size
+    if stop > len(mmap):  # truncated file
+        return None
+    one = mmap[start:stop].view(_buffer_dtypes[ent.type])
+    return one.reshape(nsamp, nchan)[first_pick:last_pick]
+
+
+def _read_raw_index(fid, raw_node, nchan):
+    """Read the table of data buffers from a raw data node."""
+    directory = raw_node['directory']
+    nent = raw_node['nent']
+    first = 0
+    first_samp = 0
+    first_skip = 0
+
+    #   Get first sample tag if it is there
+    if directory[first].kind == FIFF.FIFF_FIRST_SAMPLE:
+        tag = read_tag(fid, directory[first].pos)
+        first_samp = int(tag.data)
+        first += 1
+        _check_entry(first, nent)
+
+    #   Omit initial skip
+    if directory[first].kind == FIFF.FIFF_DATA_SKIP:
+        # This first skip can be applied only after we know the bufsize
+        tag = read_tag(fid, directory[first].pos)
+        first_skip = int(tag.data)
+        first += 1
+        _check_entry(first, nent)
+
+    raw_first_samp = first_samp
+
+    #   Go through the remaining tags in the directory
+    raw_extras = list()
+    nskip = 0
+    orig_format = None
+
+    for k in range(first, nent):
+        ent = directory[k]
+        # There can be skips in the data (e.g., if the user unclicked)
+        # an re-clicked the button
+        if ent.kind == FIFF.FIFF_DATA_SKIP:
+            tag = read_tag(fid, ent.pos)
+            nskip = int(tag.data)
+        elif ent.kind == FIFF.FIFF_DATA_BUFFER:
+            #   Figure out the number of samples in this buffer
+            if ent.type == FIFF.FIFFT_DAU_PACK16:
+                nsamp = ent.size // (2 * nchan)
+            elif ent.type == FIFF.FIFFT_SHORT:
+                nsamp = ent.size // (2 * nchan)
+            elif ent.type == FIFF.FIFFT_FLOAT:
+                nsamp = ent.size // (4 * nchan)
+            elif ent.type == FIFF.FIFFT_DOUBLE:
+                nsamp = ent.size // (8 * nchan)
+            elif ent.type == FIFF.FIFFT_INT:
+                nsamp = ent.size // (4 * nchan)
+            elif ent.type == FIFF.FIFFT_COMPLEX_FLOAT:
+                nsamp = ent.size // (8 * nchan)
+            elif ent.type == FIFF.FIFFT_COMPLEX_DOUBLE:
+                nsamp = ent.size // (16 * nchan)
+            else:
+                raise ValueError('Cannot handle data buffers of type '
+                                 '%d' % ent.type)
+            if orig_format is None:
+                if ent.type == FIFF.FIFFT_DAU_PACK16:
+                    orig_format = 'short'
+                elif ent.type == FIFF.FIFFT_SHORT:
+                    orig_format = 'short'
+                elif ent.type == FIFF.FIFFT_FLOAT:
+                    orig_format = 'single'
+                elif ent.type == FIFF.FIFFT_DOUBLE:
+                    orig_format = 'double'
+                elif ent.type == FIFF.FIFFT_INT:
+                    orig_format = 'int'
+                elif ent.type == FIFF.FIFFT_COMPLEX_FLOAT:
+                    orig_format = 'single'
+                elif ent.type == FIFF.FIFFT_COMPLEX_DOUBLE:
+                    orig_format = 'double'
+
+            #  Do we have an initial skip pending?
+            if first_skip > 0:
+                first_samp += nsamp * first_skip
+                raw_first_samp = first_samp
+                first_skip = 0
+
+            #  Do we have a skip pending?
+            if nskip > 0:
+                raw_extras.append(dict(
+                    ent=None, first=first_samp, nsamp=nskip * nsamp,
+                    last=first_samp + nskip * nsamp - 1))
+                first_samp += nskip * nsamp
+                nskip = 0
+
+            #  Add a data buffer
+            raw_extras.append(dict(ent=ent, first=first_samp,
+                                   last=first_samp + nsamp - 1,
+                                   nsamp=nsamp))
+            first_samp += nsamp
+
+    # reformat raw_extras to be a dict of list/ndarray rather than
+    # list of dict (faster access)
+    raw_extras = {key: [r[key] for r in raw_extras]
+                  for key in raw_extras[0]}
+    for key in raw_extras:
+        if key != 'ent':  # dict or None
+            raw_extras[key] = np.array(raw_extras[key], int)
+    if not np.array_equal(raw_extras['last'][:-1],
+                          raw_extras['first'][1:] - 1):
+        raise RuntimeError('FIF file appears to be broken')
+    bounds = np.cumsum(np.concatenate(
+        [raw_extras['first'][:1], raw_extras['nsamp']]))
+    raw_extras['bounds'] = bounds
+    assert len(raw_extras['bounds']) == len(raw_extras['ent']) + 1
+    del raw_extras['first']
+    del raw_extras['last']
+    del raw_extras['nsamp']
+    return dict(first_samp=raw_first_samp, last_samp=first_samp - 1,
+                orig_format=orig_format, raw_extras=raw_extras)
+
+
 def _check_entry(first, nent):
     """Sanity check entries."""
     if first >= nent:
@@ -437,7 +491,7 @@ def _check_entry(first, nent):
 
 @fill_doc
 def read_raw_fif(fname, allow_maxshield=False, preload=False,
-                 on_split_missing='raise', verbose=None):
+                 on_split_missing='raise', memmap=False, verbose=None):
     """Reader function for Raw FIF data.
 
     Parameters
@@ -459,6 +513,13 @@ def read_raw_fif(fname, allow_maxshield=False, preload=False,
         activity. Can also be "yes" to load without eliciting a warning.
     %(preload)s
     %(on_split_missing)s
+    memmap : bool
+        If True (and ``preload=False``), data buffers are accessed through a
+        read-only :class:`numpy.memmap` of the file rather than being read
+        into a new array for each buffer. Calibration and channel selection
+        then operate directly on the mapped buffers. Ignored for gzipped files.
+
+        .. versionadded:: 0.23
     %(verbose)s
 
     Returns
@@ -472,4 +533,99 @@ def read_raw_fif(fname, allow_maxshield=False, preload=False,
     """
     return Raw(fname=fname, allow_maxshield=allow_maxshield,
                preload=preload, verbose=verbose,
-               on_split_missing=on_split_missing)
+               on_split_missing=on_split_missing, memmap=memmap)
+
+
+# tags that are rewritten (or dropped) when copying a FIF tree
+_skip_copy_kinds = (FIFF.FIFF_FILE_ID, FIFF.FIFF_DIR_POINTER,
+                    FIFF.FIFF_FREE_LIST, FIFF.FIFF_NOP, FIFF.FIFF_BLOCK_ID,
+                    FIFF.FIFF_PARENT_FILE_ID, FIFF.FIFF_PARENT_BLOCK_ID)
+
+
+def _write_anonymized_fif(raw, fname, overwrite=False):
+    """Copy a raw FIF file, rewriting only its measurement info.
+
+    ``raw.info`` and ``raw.annotations`` must already be anonymized. They
+    replace the measurement info and annotation blocks of the original file,
+    while all other tags (including the data buffers) are copied byte for
+    byte, so the data are neither decoded nor re-encoded.
+    """
+    from ..meas_info import write_meas_info
+    from ..write import start_file, end_file, start_block, end_block, write_id
+    from ...annotations import _write_annotations
+    if len(raw._filenames) != 1:
+        raise ValueError('Only single (non-split) files can be copied, got '
+                         '%d files' % (len(raw._filenames),))
+    fname = _check_fname(fname, overwrite=overwrite, name='fname')
+    in_fname = raw._filenames[0]
+    if op.realpath(fname) == op.realpath(in_fname):
+        raise ValueError('You cannot save data to the same file.'
+                         ' Please use a different filename.')
+    data_type = dict(short=FIFF.FIFFT_DAU_PACK16, int=FIFF.FIFFT_INT,
+                     single=FIFF.FIFFT_FLOAT,
+                     double=FIFF.FIFFT_DOUBLE).get(raw.orig_format)
+    info = raw.info
+    # the annotations of in-data skips are recreated from the skip tags
+    annotations = raw.annotations.copy()
+    extra = raw._raw_extras[0]
+    mask = [ent is None for ent in extra['ent']]
+    skip_onsets = extra['bounds'][:-1][mask] / info['sfreq']
+    annotations.delete([
+        ii for ii, (onset, desc) in enumerate(zip(annotations.onset,
+                                                  annotations.description))
+        if desc == 'BAD_ACQ_SKIP' and np.isclose(onset, skip_onsets).any()])
+    wrote_annot = False
+
+    def _copy_node(fidin, node, fidout):
+        nonlocal wrote_annot
+        if node['block'] == FIFF.FIFFB_MEAS_INFO:
+            write_meas_info(fidout, info, data_type=data_type,
+                            reset_range=False)
+            if len(annotations) > 0 and not wrote_annot:
+                _write_annotations(fidout, annotations)
+                wrote_annot = True
+            return
+        if node['block'] == FIFF.FIFFB_MNE_ANNOTATIONS:
+            return  # written after the measurement info
+        if node['block'] == FIFF.FIFFB_REF:
+            return  # references to other files are not kept
+        start_block(fidout, node['block'])
+        if node['id'] is not None:
+            write_id(fidout, FIFF.FIFF_BLOCK_ID)
+            if info['meas_id'] is not None:
+                write_id(fidout, FIFF.FIFF_PARENT_BLOCK_ID, info['meas_id'])
+        _copy_tags(fidin, node, fidout)
+        for child in node['children']:
+            _copy_node(fidin, child, fidout)
+        end_block(fidout, node['block'])
+
+    logger.info('Writing %s' % fname)
+    fidin, tree, _ = fiff_open(in_fname)
+    with fidin:
+        fidout = start_file(fname)
+        try:
+            _copy_tags(fidin, tree, fidout)
+            for child in tree['children']:
+                _copy_node(fidin, child, fidout)
+        except Exception:
+            fidout.close()
+            os.remove(fname)
+            raise
+        end_file(fidout)
+    logger.info('[done]')
+    return fname
+
+
+def _copy_tags(fidin, node, fidout):
+    """Copy the tags of a node (but not of its children) byte for byte."""
+    for ent in node['directory'] or []:
+        if ent.kind in _skip_copy_kinds:
+            continue
+        fidin.seek(ent.pos + 16, 0)  # skip the tag header
+        data = fidin.read(ent.size)
+        if len(data) != ent.size:
+            raise RuntimeError('Truncated tag %d in %s' % (ent.kind,
+                                                           fidin.name))
+        fidout.write(np.array([ent.kind, ent.type, ent.size,
+                               FIFF.FIFFV_NEXT_SEQ], '>i4').tobytes())
+        fidout.write(data)
@@ -13,6 +13,7 @@ import pathlib
 import pickle
 import shutil
 import sys
+import threading
 
 import numpy as np
 from numpy.testing import (assert_array_almost_equal, assert_array_equal,
@@ -20,8 +21,9 @@ from numpy.testing import (assert_array_almost_equal, assert_array_equal,
 import pytest
 
 from mne.datasets import testing
-from mne.filter import filter_data
+from mne.filter import filter_data, resample
 from mne.io.constants import FIFF
+from mne.io.fiff.raw import Raw
 from mne.io import RawArray, concatenate_raws, read_raw_fif, base
 from mne.io.tag import _read_tag_header
 from mne.io.tests.test_raw import _test_concat, _test_raw_reader
@@ -529,6 +531,62 @@ def test_split_numbers(tmpdir, monkeypatch):
     assert_allclose(raw.get_data(), raw_read.get_data(), atol=1e-16)
 
 
+@pytest.mark.parametrize('split_naming', ('neuromag', 'bids'))
+@pytest.mark.parametrize('preload', (True, False))
+def test_split_parallel(tmpdir, split_naming, preload):
+    """Test pipelined and parallel writing of split files."""
+    raw = read_raw_fif(test_fif_fname, preload=preload).pick('eeg')
+    # skips must be written the same way
+    buffer_size = raw._get_buffer_size(1.)
+    raw.set_annotations(Annotations(
+        np.array([2, 15]) * buffer_size / raw.info['sfreq'],
+        np.array([2, 1]) * buffer_size / raw.info['sfreq'], 'bad_acq_skip'))
+    fnames, sizes, data = dict(), dict(), dict()
+    for split_parallel in (False, True):
+        fname = tmpdir.mkdir(str(int(split_parallel))).join('test_eeg.fif')
+        raw.save(fname, split_size='5MB', buffer_size_sec=1.,
+                 split_naming=split_naming, split_parallel=split_parallel)
+        fnames[split_parallel] = sorted(os.listdir(op.dirname(fname)))
+        sizes[split_parallel] = [op.getsize(op.join(op.dirname(fname), f))
+                                 for f in fnames[split_parallel]]
+        if split_naming == 'bids':
+            fname = op.join(op.dirname(fname), 'test_split-01_eeg.fif')
+        raw_read = read_raw_fif(fname)
+        assert len(raw_read._raw_extras) > 2
+        assert_array_equal(raw.times, raw_read.times)
+        data[split_parallel] = raw_read.get_data()
+    assert_allclose(raw.get_data(stop=2 * buffer_size),
+                    data[True][:, :2 * buffer_size], atol=1e-16)
+    assert_array_equal(data[False], data[True])
+    assert sizes[False] == sizes[True]
+    assert max(sizes[True]) <= 5e6
+    assert fnames[False] == fnames[True]
+    with pytest.raises(TypeError, match='split_parallel must be'):
+        raw.save(tmpdir.join('bad_raw.fif'), split_parallel=1)
+
+
+def test_split_parallel_error(tmpdir, monkeypatch):
+    """Test that an error in one split part stops the others."""
+    raw = read_raw_fif(test_fif_fname)
+    write_raw_fid = base._write_raw_fid
+    n_parts = list()
+
+    def _write_raw_fid_err(*args, **kwargs):
+        part_idx = args[5]
+        n_parts.append(part_idx)
+        if part_idx == 2:
+            raise RuntimeError('Part failed')
+        return write_raw_fid(*args, **kwargs)
+
+    monkeypatch.setattr(base, '_write_raw_fid', _write_raw_fid_err)
+    fname = tmpdir.join('test_raw.fif')
+    # without the error this gives 24 parts
+    with pytest.raises(RuntimeError, match='Part failed|was aborted'):
+        raw.save(fname, split_size='5MB', buffer_size_sec=0.5,
+                 split_parallel=True)
+    assert 3 <= len(n_parts) < 24
+
+
 def test_load_bad_channels(tmpdir):
     """Test reading/writing of bad channels."""
     # Load correctly marked file (manually done in mne_process_raw)
@@ -859,6 +917,35 @@ def test_preload_modify(preload, tmpdir):
     assert_allclose(data, data_new)
 
 
+def test_load_data_dtype():
+    """Test reduced-precision storage of preloaded data."""
+    raw = read_raw_fif(test_fif_fname).crop(0, 5)
+    raw_64 = raw.copy().load_data()
+    raw_32 = raw.copy().load_data(dtype='float32')
+    assert raw_32._data.dtype == np.float32
+    assert raw_32._data.nbytes * 2 == raw_64._data.nbytes
+    with pytest.raises(ValueError, match='Invalid value for the .dtype'):
+        raw.copy().load_data(dtype='float16')
+    # operations keep the precision
+    for func in (lambda r: r.filter(1., 40.),
+                 lambda r: r.filter(1., None, method='iir'),
+                 lambda r: r.notch_filter(60., method='iir'),
+                 lambda r: r.resample(200.),
+                 lambda r: r.apply_proj()):
+        want = func(raw_64.copy()).get_data()
+        got = func(raw_32.copy()).get_data()
+        assert got.dtype == np.float32
+        assert_allclose(got, want, rtol=1e-4, atol=1e-6 * np.abs(want).max())
+    # converting already preloaded data
+    raw_64.load_data(dtype=np.float32)
+    assert raw_64._data.dtype == np.float32
+    raw_64.load_data()
+    assert raw_64._data.dtype == np.float32
+    raw_64.load_data(dtype='float64')
+    assert raw_64._data.dtype == np.float64
+    assert_allclose(raw_64.get_data(), raw_32.get_data(), rtol=0, atol=0)
+
+
 @pytest.mark.slowtest
 @testing.requires_testing_data
 def test_filter():
@@ -997,6 +1084,35 @@ def test_filter_picks():
         pytest.raises(ValueError, raw_.filter, 10, 30)
 
 
+@pytest.mark.parametrize('phase', ('zero', 'minimum'))
+def test_filter_stream(tmpdir, phase):
+    """Test filtering raw data while loading them in blocks."""
+    raw = read_raw_fif(test_fif_fname)
+    raw.set_annotations(Annotations([10.], [2.], ['bad_acq_skip']))
+    picks = pick_types(raw.info, meg='grad', eeg=True)[::3]
+    kwargs = dict(picks=picks, phase=phase, fir_design='firwin')
+    raw_want = raw.copy().load_data().filter(5., 40., **kwargs)
+    with pytest.raises(RuntimeError, match='loaded'):
+        raw.filter(5., 40., **kwargs)
+    assert not raw.preload
+    fname = tmpdir.join('data.dat')
+    raw.filter(5., 40., preload=fname, **kwargs)
+    assert raw.preload
+    assert isinstance(raw._data, np.memmap)
+    assert raw.info['lowpass'] == raw_want.info['lowpass']
+    assert_allclose(raw._data, raw_want._data, rtol=1e-7, atol=1e-18)
+    # notch filtering, and methods that are not applied in blocks
+    raw = read_raw_fif(test_fif_fname)
+    raw.notch_filter(60., preload=True)
+    raw_want = read_raw_fif(test_fif_fname, preload=True).notch_filter(60.)
+    assert_allclose(raw._data, raw_want._data, rtol=1e-7, atol=1e-18)
+    raw = read_raw_fif(test_fif_fname)
+    raw.filter(None, 40., method='iir', preload=True)
+    assert raw.preload
+    with pytest.raises(TypeError, match='preload must be'):
+        read_raw_fif(test_fif_fname).filter(None, 40., preload=1)
+
+
 @testing.requires_testing_data
 def test_crop():
     """Test cropping raw files."""
@@ -1067,6 +1183,27 @@ def test_resample_equiv():
     assert_allclose(raw._data, raw_preload._data)
 
 
+@pytest.mark.parametrize('preload', (True, False))
+def test_resample_polyphase(preload):
+    """Test polyphase resampling of raw data with stim channels."""
+    raw = read_raw_fif(test_fif_fname).crop(0, 2)
+    raw.pick_types(meg='mag', eeg=True, stim=True)
+    if preload:
+        raw.load_data()
+    sfreq = raw.info['sfreq'] / 4.
+    raw_poly = raw.copy().resample(sfreq, method='polyphase')
+    raw_fft = raw.copy().resample(sfreq, npad=0)
+    assert raw_poly.info['sfreq'] == sfreq
+    assert raw_poly._data.shape == raw_fft._data.shape
+    # stim channels are subsampled with either method
+    stim = pick_types(raw.info, meg=False, stim=True)
+    assert len(stim) > 0
+    assert_array_equal(raw_poly._data[stim], raw_fft._data[stim])
+    data = np.delete(raw.get_data(), stim, axis=0)
+    assert_allclose(np.delete(raw_poly._data, stim, axis=0),
+                    resample(data, 1, 4, method='polyphase'), atol=1e-20)
+
+
 @testing.requires_testing_data
 @pytest.mark.parametrize('preload, n, npad', [
     (True, 512, 'auto'),
@@ -1667,6 +1804,175 @@ def test_memmap(tmpdir):
     # require them.
 
 
+@pytest.mark.parametrize('fmt', ('short', 'int', 'single', 'double'))
+def test_memmap_read(fmt, tmpdir):
+    """Test reading data buffers through a memmap."""
+    fname = tmpdir.join('test_raw.fif')
+    read_raw_fif(test_fif_fname).save(fname, fmt=fmt, split_size='10MB')
+    raw = read_raw_fif(fname)
+    raw_mm = read_raw_fif(fname, memmap=True)
+    assert len(raw_mm._raw_extras) == len(raw._raw_extras) > 1
+    assert all(extra['memmap'] for extra in raw_mm._raw_extras)
+    assert not any(extra['memmap'] for extra in raw._raw_extras)
+    picks = [0, 5, 2, 310]
+    for start, stop in ((0, None), (10, 20), (1000, 5000)):
+        assert_array_equal(raw_mm.get_data(start=start, stop=stop),
+                           raw.get_data(start=start, stop=stop))
+        assert_array_equal(raw_mm.get_data(picks, start, stop),
+                           raw.get_data(picks, start, stop))
+    # projection path
+    raw.apply_proj()
+    raw_mm.apply_proj()
+    assert_allclose(raw_mm.get_data(picks), raw.get_data(picks), atol=1e-20)
+    # gzipped files fall back to regular reads
+    raw_gz = read_raw_fif(test_fif_gz_fname, memmap=True)
+    assert not raw_gz._raw_extras[0]['memmap']
+    raw_gz = raw_gz.load_data()
+    assert_array_equal(raw_gz.get_data(),
+                       read_raw_fif(test_fif_fname, memmap=True).get_data())
+
+
+def test_read_multiple_files_parallel(tmpdir):
+    """Test reading from multiple files using threads."""
+    fname = tmpdir.join('test_raw.fif')
+    read_raw_fif(test_fif_fname).save(fname, split_size='10MB')
+    raw = read_raw_fif(fname)
+    assert len(raw.filenames) > 2
+    want = raw.get_data()
+    picks = [0, 5, 2, 310]
+    assert_array_equal(raw.get_data(picks, n_jobs=2), want[picks])
+    assert_array_equal(raw.get_data(start=100, stop=10000, n_jobs=-1),
+                       want[:, 100:10000])
+    # concatenated raws (and through the block cache)
+    raw_concat = concatenate_raws([raw.copy(), raw.copy().crop(1, 5)])
+    raw_concat.set_block_cache(block_size=1000)
+    assert_array_equal(raw_concat.get_data(n_jobs=3),
+                       raw_concat.copy().load_data().get_data())
+    raw.load_data(n_jobs=2)
+    assert_array_equal(raw.get_data(), want)
+
+
+@pytest.mark.parametrize('read_ahead', (0, 2))
+def test_block_cache(read_ahead):
+    """Test the LRU block cache for non-preloaded data."""
+    raw = read_raw_fif(test_fif_fname)
+    want = raw.get_data()
+    assert raw.block_cache_info is None
+    raw.set_block_cache(max_size='10MB', block_size=500,
+                        read_ahead=read_ahead)
+    info = raw.block_cache_info
+    assert info['hits'] == info['misses'] == info['n_blocks'] == 0
+    picks = [0, 5, 2, 310]
+    assert_array_equal(raw.get_data(picks, 100, 1200), want[picks, 100:1200])
+    info = raw.block_cache_info
+    assert info['misses'] == 3
+    assert info['hits'] == 0
+    assert 0 < info['n_bytes'] <= info['max_bytes']
+    # overlapping reads are served from memory
+    assert_array_equal(raw.get_data(picks, 600, 900), want[picks, 600:900])
+    assert raw.block_cache_info['misses'] == 3
+    assert raw.block_cache_info['hits'] == 2
+    # sequential reads (possibly read ahead)
+    for start in range(1500, 5000, 500):
+        assert_array_equal(raw.get_data(start=start, stop=start + 500),
+                           want[:, start:start + 500])
+    info = raw.block_cache_info
+    assert info['n_bytes'] <= info['max_bytes']
+    if read_ahead:
+        assert info['hits'] > 1
+    # projection and compensation go through the same path
+    raw_proj = raw.copy().apply_proj()
+    assert raw_proj.block_cache_info['n_blocks'] == 0  # copies start empty
+    assert_allclose(raw_proj.get_data(picks),
+                    read_raw_fif(test_fif_fname).apply_proj().get_data(picks),
+                    atol=1e-20)
+    # closing stops reading ahead and empties the cache, which remains usable
+    block_cache = raw._block_cache
+    raw.close()
+    assert block_cache._executor is None
+    assert raw.block_cache_info['n_blocks'] == 0
+    assert_array_equal(raw.get_data(stop=1000), want[:, :1000])
+    assert (block_cache._executor is None) == (read_ahead == 0)
+    raw.set_block_cache(None)
+    assert block_cache._executor is None
+    assert raw.block_cache_info is None
+    raw.set_block_cache(block_size=500, read_ahead=read_ahead)
+    raw.load_data()
+    assert raw.block_cache_info is None
+    assert_array_equal(raw.get_data(), want)
+    with pytest.raises(ValueError, match='must end with'):
+        read_raw_fif(test_fif_fname).set_block_cache('1kB')
+
+
+def test_block_cache_parallel(tmpdir, monkeypatch):
+    """Test that the block cache reads different files in parallel."""
+    fname = tmpdir.join('test_raw.fif')
+    read_raw_fif(test_fif_fname).save(fname, split_size='10MB')
+    raw = read_raw_fif(fname)
+    assert len(raw.filenames) > 2
+    want = raw.get_data()
+    raw.set_block_cache(block_size=raw.n_times)
+    read_segment_file = Raw._read_segment_file
+    barrier = threading.Barrier(2, timeout=10)
+
+    def _read_segment_file_together(self, *args):
+        barrier.wait()  # would time out if reads were serialized
+        return read_segment_file(self, *args)
+
+    monkeypatch.setattr(Raw, '_read_segment_file',
+                        _read_segment_file_together)
+    sl = slice(raw._first_samps[1] - raw.first_samp - 10,
+               raw._first_samps[1] - raw.first_samp + 10)
+    assert_array_equal(raw.get_data(start=sl.start, stop=sl.stop, n_jobs=2),
+                       want[:, sl])
+
+
+def test_index_cache(tmpdir, monkeypatch):
+    """Test the persistent FIF index cache."""
+    from mne.io import open as fiff_open_mod
+    fname = tmpdir.join('test_raw.fif')
+    raw_orig = read_raw_fif(test_fif_fname)
+    raw_orig.save(fname, split_size='10MB')
+    fnames = read_raw_fif(fname).filenames
+    assert len(fnames) > 1
+    cache_dir = tmpdir.join('cache')
+    monkeypatch.setenv('MNE_FIF_INDEX_CACHE_DIR', str(cache_dir))
+    raw = read_raw_fif(fname)
+    assert len(os.listdir(cache_dir)) == 2 * len(fnames)  # tree and raw
+    want = raw.get_data()
+
+    def _bad_make_dir_tree(*args, **kwargs):
+        raise RuntimeError('should not be called')
+
+    monkeypatch.setattr(fiff_open_mod, 'make_dir_tree', _bad_make_dir_tree)
+    raw_cached = read_raw_fif(fname)
+    assert raw_cached.filenames == fnames
+    assert_array_equal(raw_cached._raw_extras[0]['bounds'],
+                       raw._raw_extras[0]['bounds'])
+    assert_array_equal(raw_cached.get_data(), want)
+    # modifying the file invalidates its cache entries
+    os.utime(fnames[1], ns=(0, 0))
+    with pytest.raises(RuntimeError, match='should not be called'):
+        read_raw_fif(fname)
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='Needs symlinks')
+def test_index_cache_symlink(tmpdir, monkeypatch):
+    """Test that cached indices do not tie split files to one path."""
+    real_dir, link_dir = tmpdir.mkdir('real'), tmpdir.mkdir('link')
+    fname = real_dir.join('a_raw.fif')
+    read_raw_fif(test_fif_fname).save(fname, split_size='10MB')
+    assert op.isfile(real_dir.join('a_raw-1.fif'))
+    os.symlink(str(fname), str(link_dir.join('a_raw.fif')))
+    monkeypatch.setenv('MNE_FIF_INDEX_CACHE_DIR', str(tmpdir.join('cache')))
+    raw_link = read_raw_fif(link_dir.join('a_raw.fif'),
+                            on_split_missing='ignore')
+    assert len(raw_link.filenames) == 1
+    raw = read_raw_fif(fname)
+    assert len(raw.filenames) > 1
+    assert raw.n_times > raw_link.n_times
+
+
 @pytest.mark.parametrize('split', (False, True))
 @pytest.mark.parametrize('kind', ('file', 'bytes'))
 @pytest.mark.parametrize('preload', (True, str))
@@ -0,0 +1,5 @@
+"""Chunked HDF5 storage for raw data."""
+
+# License: BSD (3-clause)
+
+from ._hdf5 import read_raw_hdf5
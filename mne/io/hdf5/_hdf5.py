@@ -0,0 +1,201 @@
+# License: BSD (3-clause)
+
+import numpy as np
+
+from ..base import BaseRaw
+from ..meas_info import Info, _writing_info_hdf5
+from ..pick import pick_info, _picks_to_idx
+from ..tag import _update_ch_info_named
+from ..utils import _mult_cal_one
+from ...annotations import Annotations
+from ...externals.h5io import read_hdf5, write_hdf5
+from ...externals.h5io._h5io import _check_h5py
+from ...parallel import _prefetch
+from ...utils import logger, verbose, fill_doc, _check_fname
+
+# Layout version of the files written by _write_raw_hdf5
+_HDF5_RAW_VERSION = 1
+
+# On-disk dtype for each ``fmt``
+_HDF5_DTYPES = dict(double=np.float64, single=np.float32,
+                    int=np.int32, short=np.int16)
+
+
+@fill_doc
+def read_raw_hdf5(fname, preload=False, verbose=None):
+    """Read raw data saved in chunked HDF5 format.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the ``.h5`` file written by :meth:`mne.io.Raw.save`.
+    %(preload)s
+    %(verbose)s
+
+    Returns
+    -------
+    raw : instance of RawHDF5
+        A Raw object containing the data.
+
+    See Also
+    --------
+    mne.io.Raw : Documentation of attribute and methods.
+
+    Notes
+    -----
+    Data are stored in compressed chunks of one channel by one time block,
+    so reading a subset of channels or a short time window (e.g.,
+    ``raw.get_data(picks, start, stop)`` without preloading) only
+    decompresses the chunks that overlap the request.
+
+    .. versionadded:: 0.23
+    """
+    return RawHDF5(fname, preload, verbose)
+
+
+@fill_doc
+class RawHDF5(BaseRaw):
+    """Raw object from a chunked HDF5 file.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the ``.h5`` file written by :meth:`mne.io.Raw.save`.
+    %(preload)s
+    %(verbose)s
+
+    See Also
+    --------
+    mne.io.Raw : Documentation of attribute and methods.
+    """
+
+    @verbose
+    def __init__(self, fname, preload=False, verbose=None):
+        h5py = _check_h5py()
+        fname = _check_fname(fname, 'read', True, 'fname')
+        logger.info('Loading %s' % fname)
+        meta = read_hdf5(fname, title='mnepython', slash='replace')
+        if meta.get('version', None) != _HDF5_RAW_VERSION:
+            raise RuntimeError('Unsupported raw HDF5 file version %s in %s'
+                               % (meta.get('version', None), fname))
+        info = Info(meta['info'])
+        for ch in info['chs']:  # restore the named constants, like FIF
+            _update_ch_info_named(ch)
+        info._check_consistency()
+        with h5py.File(fname, 'r') as fid:
+            n_channels, n_times = fid['mne_raw/data'].shape
+        assert n_channels == info['nchan']
+        first_samp = int(meta['first_samp'])
+        raw_extras = dict(
+            fmt=meta['fmt'], chunk=int(meta['chunk']), first_samp=first_samp,
+            orig_nchan=n_channels)
+        super(RawHDF5, self).__init__(
+            info, preload, filenames=[fname], first_samps=[first_samp],
+            last_samps=[first_samp + n_times - 1], raw_extras=[raw_extras],
+            orig_format=meta['fmt'], verbose=verbose)
+        annot = meta['annotations']
+        annotations = Annotations(
+            annot['onset'], annot['duration'], annot['description'],
+            orig_time=annot['orig_time'],
+            ch_names=[tuple(names) for names in annot['ch_names']])
+        self.set_annotations(annotations, emit_warning=False)
+
+    def _read_segment_file(self, data, idx, fi, start, stop, cals, mult):
+        """Read a segment of data from a file."""
+        h5py = _check_h5py()
+        extras = self._raw_extras[fi]
+        start -= extras['first_samp']
+        stop -= extras['first_samp']
+        rows = np.arange(extras['orig_nchan'])[idx]
+        rows, inverse = np.unique(rows, return_inverse=True)
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            sel = slice(rows[0], rows[-1] + 1)  # contiguous: a faster read
+        else:
+            sel = rows
+        with h5py.File(self._filenames[fi], 'r') as fid:
+            group = fid['mne_raw']
+            block = group['data'][sel, start:stop]
+            if extras['fmt'] in ('int', 'short'):
+                chunk = extras['chunk']
+                first, last = start // chunk, (stop - 1) // chunk + 1
+                scale = group['scale'][sel, first:last]
+                offset = group['offset'][sel, first:last]
+                which = np.arange(start, stop) // chunk - first
+                block = block * scale[:, which] + offset[:, which]
+        _mult_cal_one(data, block[inverse], slice(None), cals, mult)
+
+
+def _quantize(data, dtype):
+    """Quantize data to integers with per-channel offset and scale."""
+    qmax = np.iinfo(dtype).max
+    lims = np.array([data.min(axis=-1), data.max(axis=-1)])
+    offset = lims.mean(axis=0)
+    scale = np.diff(lims, axis=0)[0] / (2. * qmax)
+    scale[scale == 0] = 1.
+    data = np.rint((data - offset[:, np.newaxis]) / scale[:, np.newaxis])
+    data = np.clip(data, -qmax, qmax).astype(dtype)
+    return data, scale, offset
+
+
+def _write_raw_hdf5(fname, raw, info, picks, fmt, start, stop, buffer_size,
+                    projector):
+    """Write raw data in chunked, compressed HDF5 format."""
+    h5py = _check_h5py()
+    picks = _picks_to_idx(info, picks, 'all', ())
+    info = pick_info(info, picks)
+    is_complex = np.iscomplexobj(raw[0, 0][0])
+    if fmt in ('int', 'short') and is_complex:
+        raise ValueError('Complex data must be saved as "single" or '
+                         '"double", not "%s"' % (fmt,))
+    n_times = stop - start
+    chunk = int(min(buffer_size, n_times))
+    annot = raw.annotations
+    meta = dict(
+        info=info, first_samp=raw.first_samp + start, fmt=fmt, chunk=chunk,
+        version=_HDF5_RAW_VERSION,
+        annotations=dict(onset=annot.onset, duration=annot.duration,
+                         description=list(annot.description),
+                         orig_time=annot.orig_time,
+                         ch_names=[list(names) for names in annot.ch_names]))
+    logger.info('Writing %s' % fname)
+    with _writing_info_hdf5(info):
+        write_hdf5(fname, meta, overwrite=True, title='mnepython',
+                   slash='replace')
+
+    firsts = list(range(start, stop, chunk))
+
+    # like FIF, the data are stored divided by the calibration factors
+    cals = np.array([[ch['cal'] * ch['range']] for ch in info['chs']])
+
+    def _prepare(first):
+        sl = slice(first, min(first + chunk, stop))
+        if projector is None:
+            data = raw[picks, sl][0]
+        else:  # the projection can involve channels that are not saved
+            data = np.dot(projector[picks], raw[:, sl][0])
+        data /= cals
+        if fmt in ('int', 'short'):
+            return _quantize(data, _HDF5_DTYPES[fmt])
+        return data.astype(_HDF5_DTYPES[fmt], copy=False), None, None
+
+    dtype = _HDF5_DTYPES[fmt]
+    if is_complex:
+        dtype = np.result_type(dtype, np.complex64)
+    kwargs = dict(chunks=(1, chunk), compression='gzip', compression_opts=4,
+                  shuffle=True)
+    with h5py.File(fname, 'a') as fid:
+        group = fid.create_group('mne_raw')
+        dset = group.create_dataset(
+            'data', (len(picks), n_times), dtype=dtype, **kwargs)
+        if fmt in ('int', 'short'):
+            shape = (len(picks), len(firsts))
+            scales = group.create_dataset('scale', shape, dtype=np.float64)
+            offsets = group.create_dataset('offset', shape, dtype=np.float64)
+        buffers = _prefetch(_prepare, firsts)
+        for ci, (data, scale, offset) in enumerate(buffers):
+            first = firsts[ci] - start
+            dset[:, first:first + data.shape[1]] = data
+            if scale is not None:
+                scales[:, ci] = scale
+                offsets[:, ci] = offset
+    return fname
@@ -0,0 +1,97 @@
+# License: BSD (3-clause)
+
+import os.path as op
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from mne import Annotations, pick_types
+from mne.io import read_raw_fif, read_raw_hdf5, read_raw
+from mne.io.tests.test_raw import _test_raw_reader
+from mne.utils import requires_h5py
+
+base_dir = op.join(op.dirname(__file__), '..', '..', 'tests', 'data')
+test_fif_fname = op.join(base_dir, 'test_raw.fif')
+
+
+def _get_raw():
+    raw = read_raw_fif(test_fif_fname).crop(0, 3).load_data()
+    raw.pick_types(meg=True, eeg=True, stim=True, exclude=())
+    onset = raw.first_time + np.array([0.5, 1.])
+    raw.set_annotations(Annotations(onset, [0.2, 0.], ['a', 'bad b'],
+                                    orig_time=raw.info['meas_date']))
+    return raw
+
+
+@requires_h5py
+@pytest.mark.parametrize('fmt, rtol', [
+    ('double', 0),
+    ('single', 1e-6),
+    ('int', 1e-8),
+    ('short', 1e-4),
+])
+def test_hdf5_roundtrip(tmpdir, fmt, rtol):
+    """Test writing and reading raw data in chunked HDF5 format."""
+    raw = _get_raw()
+    fname = tmpdir.join('test_raw.h5')
+    raw.save(fname, fmt=fmt, buffer_size_sec=0.5)
+    raw_h5 = read_raw_hdf5(fname)
+    assert raw_h5.orig_format == fmt
+    assert raw_h5.first_samp == raw.first_samp
+    assert raw_h5.ch_names == raw.ch_names
+    assert raw_h5.info['sfreq'] == raw.info['sfreq']
+    assert_array_equal(raw_h5.annotations.onset, raw.annotations.onset)
+    assert_array_equal(raw_h5.annotations.description,
+                       raw.annotations.description)
+    assert raw_h5.annotations.orig_time == raw.annotations.orig_time
+    data = raw.get_data()
+    # quantization error is relative to the range of each chunk
+    atol = rtol * np.ptp(data, axis=1, keepdims=True)
+    data_h5 = raw_h5.get_data()
+    if fmt == 'double':
+        assert_allclose(data_h5, data, rtol=1e-14, atol=0)
+    else:
+        assert np.all(np.abs(data_h5 - data) <= atol + 1e-30)
+    assert raw_h5.get_data().dtype == np.float64
+    # partial reads of channel subsets and time windows
+    picks = pick_types(raw.info, meg='grad')[::3]
+    for start, stop in ((0, 10), (250, 1201), (1500, len(raw.times))):
+        want = data[picks, start:stop]
+        got = raw_h5.get_data(picks, start, stop)
+        assert got.shape == want.shape
+        assert np.all(np.abs(got - want) <= atol[picks] + 1e-30)
+    # unsorted picks and preloading give the same data
+    got = raw_h5.get_data([5, 2, 3], 100, 200)
+    assert_allclose(got, data_h5[[5, 2, 3], 100:200], rtol=0, atol=0)
+    raw_h5 = read_raw(fname, preload=True)
+    assert_array_equal(raw_h5.get_data(), data_h5)
+
+
+@requires_h5py
+def test_hdf5_save_options(tmpdir):
+    """Test tmin/tmax, picks, and projection when saving to HDF5."""
+    raw = _get_raw().set_eeg_reference(projection=True)
+    fname = tmpdir.join('test_raw.h5')
+    raw.save(fname, picks='eeg', tmin=1., tmax=2., fmt='double', proj=True)
+    raw_h5 = read_raw_hdf5(fname)
+    start, stop = raw._tmin_tmax_to_start_stop(1., 2.)
+    assert raw_h5.first_samp == raw.first_samp + start
+    picks = pick_types(raw.info, meg=False, eeg=True)
+    assert raw_h5.ch_names == [raw.ch_names[pick] for pick in picks]
+    assert all(proj['active'] for proj in raw_h5.info['projs'])
+    want = raw.copy().apply_proj().get_data(picks, start, stop)
+    assert_allclose(raw_h5.get_data(), want, rtol=1e-10, atol=0)
+    with pytest.raises(FileExistsError, match='Destination file exists'):
+        raw.save(fname)
+    with pytest.raises(IOError, match='must end with'):
+        raw.save(tmpdir.join('test_raw.hdf'))
+
+
+@requires_h5py
+def test_hdf5_reader(tmpdir):
+    """Test the HDF5 raw reader API."""
+    raw = _get_raw().pick_types(meg=False, eeg=True)
+    fname = tmpdir.join('test_raw.h5')
+    raw.save(fname, fmt='double')
+    _test_raw_reader(read_raw_hdf5, fname=str(fname))
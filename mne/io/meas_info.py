@@ -12,6 +12,7 @@ from copy import deepcopy
 import datetime
 from io import BytesIO
 import operator
+import os.path as op
 from textwrap import shorten
 
 import numpy as np
@@ -19,7 +20,7 @@ import numpy as np
 from .pick import (channel_type, pick_channels, pick_info,
                    get_channel_type_constants, pick_types)
 from .constants import FIFF, _coord_frame_named
-from .open import fiff_open
+from .open import fiff_open, _fiff_get_fid
 from .tree import dir_tree_find
 from .tag import (read_tag, find_tag, _ch_coord_dict, _update_ch_info_named,
                   _rename_list)
@@ -34,7 +35,7 @@ from .proc_history import _read_proc_history, _write_proc_history
 from ..transforms import invert_transform, Transform, _coord_frame_name
 from ..utils import (logger, verbose, warn, object_diff, _validate_type,
                      _stamp_to_dt, _dt_to_stamp, _pl, _is_numeric,
-                     _check_option)
+                     _check_option, _file_like)
 from ._digitization import (_format_dig_points, _dig_kind_proper, DigPoint,
                             _dig_kind_rev, _dig_kind_ints, _read_dig_fif)
 from ._digitization import write_dig as _dig_write_dig
@@ -545,6 +546,11 @@ class Info(dict, MontageMixin):
             The helium level meas date.
     """
 
+    # Entries read with read_info(..., lazy=True) that are not decoded yet,
+    # as a dict of key -> reader(fid) for the file in _lazy_fname
+    _lazy = None
+    _lazy_fname = None
+
     def __init__(self, *args, **kwargs):
         super(Info, self).__init__(*args, **kwargs)
         # Deal with h5io writing things as dict
@@ -572,6 +578,85 @@ class Info(dict, MontageMixin):
         else:
             self['meas_date'] = _ensure_meas_date_none_or_dt(meas_date)
 
+    def _load_lazy(self, keys=None):
+        """Decode deferred entries (all of them if ``keys`` is None)."""
+        if not self._lazy:
+            return
+        keys = list(self._lazy) if keys is None else \
+            [key for key in keys if key in self._lazy]
+        # entries that were overwritten in the meantime need no decoding
+        for key in keys:
+            if dict.__contains__(self, key):
+                del self._lazy[key]
+        keys = [key for key in keys if key in self._lazy]
+        if len(keys) == 0:
+            return
+        logger.debug('Decoding deferred info entries %s from %s'
+                     % (', '.join(keys), self._lazy_fname))
+        # a reader is only dropped once its value is stored, so that a
+        # failed read can be retried
+        with _fiff_get_fid(self._lazy_fname) as fid:
+            for key in keys:
+                dict.__setitem__(self, key, self._lazy[key](fid))
+                del self._lazy[key]
+
+    def __missing__(self, key):  # noqa: D105
+        if self._lazy and key in self._lazy:
+            self._load_lazy([key])
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):  # noqa: D105
+        return dict.__contains__(self, key) or \
+            bool(self._lazy) and key in self._lazy
+
+    def __eq__(self, other):  # noqa: D105
+        # compare the decoded entries, and arrays by value (like DigPoint)
+        if not isinstance(other, dict):
+            return NotImplemented
+        return not object_diff(dict(self.items()), dict(other.items()))
+
+    def __ne__(self, other):  # noqa: D105
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __setitem__(self, key, value):  # noqa: D105
+        if self._lazy:
+            self._lazy.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def get(self, key, default=None):  # noqa: D102
+        self._load_lazy([key])
+        return dict.get(self, key, default)
+
+    def pop(self, key, *args):  # noqa: D102
+        self._load_lazy([key])
+        return dict.pop(self, key, *args)
+
+    def __iter__(self):  # noqa: D105
+        self._load_lazy()
+        return dict.__iter__(self)
+
+    def __len__(self):  # noqa: D105
+        self._load_lazy()
+        return dict.__len__(self)
+
+    def keys(self):  # noqa: D102
+        self._load_lazy()
+        return dict.keys(self)
+
+    def values(self):  # noqa: D102
+        self._load_lazy()
+        return dict.values(self)
+
+    def items(self):  # noqa: D102
+        self._load_lazy()
+        return dict.items(self)
+
+    def __getstate__(self):  # noqa: D105
+        self._load_lazy()
+        return self.__dict__
+
     def copy(self):
         """Copy the instance.
 
@@ -930,13 +1015,23 @@ def write_dig(fname, pts, coord_frame=None):
 
 
 @verbose
-def read_info(fname, verbose=None):
+def read_info(fname, lazy=False, verbose=None):
     """Read measurement info from a file.
 
     Parameters
     ----------
     fname : str
         File name.
+    lazy : bool
+        If True, only the file positions of the digitization, projector,
+        CTF compensation, HPI and processing history blocks are recorded,
+        and these entries are decoded (by re-opening the file) the first
+        time they are accessed. This makes it much faster to scan e.g.
+        ``info['sfreq']``, ``info['ch_names']`` or ``info['meas_date']`` of
+        many files. The file must not be modified or moved in the meantime.
+        Only used when ``fname`` is a path.
+
+        .. versionadded:: 0.23
     %(verbose)s
 
     Returns
@@ -944,9 +1039,13 @@ def read_info(fname, verbose=None):
     info : instance of Info
        Measurement information for the dataset.
     """
+    _validate_type(lazy, bool, 'lazy')
+    lazy_fname = None
+    if lazy and not _file_like(fname):
+        lazy_fname = op.abspath(fname)
     f, tree, _ = fiff_open(fname)
     with f as fid:
-        info = read_meas_info(fid, tree)[0]
+        info = _read_meas_info(fid, tree, lazy_fname=lazy_fname)[0]
     return info
 
 
@@ -1005,6 +1104,15 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
     meas : dict
         Node in tree that contains the info.
     """
+    return _read_meas_info(fid, tree, clean_bads)
+
+
+def _read_meas_info(fid, tree, clean_bads=False, lazy_fname=None):
+    """Read the measurement info.
+
+    If ``lazy_fname`` is given, the heavy sub-blocks are only decoded (by
+    re-opening that file) when they are first accessed.
+    """
     #   Find the desired blocks
     meas = dir_tree_find(tree, FIFF.FIFFB_MEAS)
     if len(meas) == 0:
@@ -1146,9 +1254,6 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
                           ctf_head_t is None):
                         ctf_head_t = cand
 
-    #   Locate the Polhemus data
-    dig = _read_dig_fif(fid, meas_info)
-
     #   Locate the acquisition information
     acqpars = dir_tree_find(meas_info, FIFF.FIFFB_DACQ_PARS)
     acq_pars = None
@@ -1165,14 +1270,6 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
                 tag = read_tag(fid, pos)
                 acq_stim = tag.data
 
-    #   Load the SSP data
-    projs = _read_proj(
-        fid, meas_info, ch_names_mapping=ch_names_mapping)
-
-    #   Load the CTF compensation data
-    comps = _read_ctf_comp(
-        fid, meas_info, chs, ch_names_mapping=ch_names_mapping)
-
     #   Load the bad channel list
     bads = _read_bad_channels(
         fid, meas_info, ch_names_mapping=ch_names_mapping)
@@ -1200,84 +1297,6 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
         evs.append(ev)
     info['events'] = evs
 
-    #   Locate HPI result
-    hpi_results = dir_tree_find(meas_info, FIFF.FIFFB_HPI_RESULT)
-    hrs = list()
-    for hpi_result in hpi_results:
-        hr = dict()
-        hr['dig_points'] = []
-        for k in range(hpi_result['nent']):
-            kind = hpi_result['directory'][k].kind
-            pos = hpi_result['directory'][k].pos
-            if kind == FIFF.FIFF_DIG_POINT:
-                hr['dig_points'].append(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_HPI_DIGITIZATION_ORDER:
-                hr['order'] = read_tag(fid, pos).data
-            elif kind == FIFF.FIFF_HPI_COILS_USED:
-                hr['used'] = read_tag(fid, pos).data
-            elif kind == FIFF.FIFF_HPI_COIL_MOMENTS:
-                hr['moments'] = read_tag(fid, pos).data
-            elif kind == FIFF.FIFF_HPI_FIT_GOODNESS:
-                hr['goodness'] = read_tag(fid, pos).data
-            elif kind == FIFF.FIFF_HPI_FIT_GOOD_LIMIT:
-                hr['good_limit'] = float(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_HPI_FIT_DIST_LIMIT:
-                hr['dist_limit'] = float(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_HPI_FIT_ACCEPT:
-                hr['accept'] = int(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_COORD_TRANS:
-                hr['coord_trans'] = read_tag(fid, pos).data
-        hrs.append(hr)
-    info['hpi_results'] = hrs
-
-    #   Locate HPI Measurement
-    hpi_meass = dir_tree_find(meas_info, FIFF.FIFFB_HPI_MEAS)
-    hms = list()
-    for hpi_meas in hpi_meass:
-        hm = dict()
-        for k in range(hpi_meas['nent']):
-            kind = hpi_meas['directory'][k].kind
-            pos = hpi_meas['directory'][k].pos
-            if kind == FIFF.FIFF_CREATOR:
-                hm['creator'] = str(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_SFREQ:
-                hm['sfreq'] = float(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_NCHAN:
-                hm['nchan'] = int(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_NAVE:
-                hm['nave'] = int(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_HPI_NCOIL:
-                hm['ncoil'] = int(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_FIRST_SAMPLE:
-                hm['first_samp'] = int(read_tag(fid, pos).data)
-            elif kind == FIFF.FIFF_LAST_SAMPLE:
-                hm['last_samp'] = int(read_tag(fid, pos).data)
-        hpi_coils = dir_tree_find(hpi_meas, FIFF.FIFFB_HPI_COIL)
-        hcs = []
-        for hpi_coil in hpi_coils:
-            hc = dict()
-            for k in range(hpi_coil['nent']):
-                kind = hpi_coil['directory'][k].kind
-                pos = hpi_coil['directory'][k].pos
-                if kind == FIFF.FIFF_HPI_COIL_NO:
-                    hc['number'] = int(read_tag(fid, pos).data)
-                elif kind == FIFF.FIFF_EPOCH:
-                    hc['epoch'] = read_tag(fid, pos).data
-                    hc['epoch'].flags.writeable = False
-                elif kind == FIFF.FIFF_HPI_SLOPES:
-                    hc['slopes'] = read_tag(fid, pos).data
-                    hc['slopes'].flags.writeable = False
-                elif kind == FIFF.FIFF_HPI_CORR_COEFF:
-                    hc['corr_coeff'] = read_tag(fid, pos).data
-                    hc['corr_coeff'].flags.writeable = False
-                elif kind == FIFF.FIFF_HPI_COIL_FREQ:
-                    hc['coil_freq'] = float(read_tag(fid, pos).data)
-            hcs.append(hc)
-        hm['hpi_coils'] = hcs
-        hms.append(hm)
-    info['hpi_meas'] = hms
-    del hms
-
     subject_info = dir_tree_find(meas_info, FIFF.FIFFB_SUBJECT)
     si = None
     if len(subject_info) == 1:
@@ -1400,9 +1419,6 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
             hs['hpi_coils'] = hc
     info['hpi_subsystem'] = hs
 
-    #   Read processing history
-    info['proc_history'] = _read_proc_history(fid, tree)
-
     #  Make the most appropriate selection for the measurement id
     if meas_info['parent_id'] is None:
         if meas_info['id'] is None:
@@ -1449,22 +1465,120 @@ def read_meas_info(fid, tree, clean_bads=False, verbose=None):
         info['dev_ctf_t'] = Transform('meg', 'ctf_head', dev_ctf_trans)
 
     #   All kinds of auxliary stuff
-    info['dig'] = _format_dig_points(dig)
     info['bads'] = bads
     info._update_redundant()
     if clean_bads:
         info['bads'] = [b for b in bads if b in info['ch_names']]
-    info['projs'] = projs
-    info['comps'] = comps
     info['acq_pars'] = acq_pars
     info['acq_stim'] = acq_stim
     info['custom_ref_applied'] = custom_ref_applied
     info['xplotter_layout'] = xplotter_layout
     info['kit_system_id'] = kit_system_id
+
+    #   The heavy sub-blocks: Polhemus data, SSP, CTF compensation, HPI and
+    #   processing history
+    comp_chs = chs if lazy_fname is None else [ch.copy() for ch in chs]
+    readers = dict(
+        dig=lambda fid: _format_dig_points(_read_dig_fif(fid, meas_info)),
+        projs=lambda fid: _read_proj(
+            fid, meas_info, ch_names_mapping=ch_names_mapping),
+        comps=lambda fid: _read_ctf_comp(
+            fid, meas_info, comp_chs, ch_names_mapping=ch_names_mapping),
+        hpi_results=lambda fid: _read_hpi_results(fid, meas_info),
+        hpi_meas=lambda fid: _read_hpi_meas(fid, meas_info),
+        proc_history=lambda fid: _read_proc_history(fid, tree),
+    )
+    if lazy_fname is None:
+        for key, reader in readers.items():
+            info[key] = reader(fid)
+    else:
+        info._lazy = readers
+        info._lazy_fname = lazy_fname
     info._check_consistency()
     return info, meas
 
 
+def _read_hpi_results(fid, meas_info):
+    """Read the HPI result blocks."""
+    hpi_results = dir_tree_find(meas_info, FIFF.FIFFB_HPI_RESULT)
+    hrs = list()
+    for hpi_result in hpi_results:
+        hr = dict()
+        hr['dig_points'] = []
+        for k in range(hpi_result['nent']):
+            kind = hpi_result['directory'][k].kind
+            pos = hpi_result['directory'][k].pos
+            if kind == FIFF.FIFF_DIG_POINT:
+                hr['dig_points'].append(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_HPI_DIGITIZATION_ORDER:
+                hr['order'] = read_tag(fid, pos).data
+            elif kind == FIFF.FIFF_HPI_COILS_USED:
+                hr['used'] = read_tag(fid, pos).data
+            elif kind == FIFF.FIFF_HPI_COIL_MOMENTS:
+                hr['moments'] = read_tag(fid, pos).data
+            elif kind == FIFF.FIFF_HPI_FIT_GOODNESS:
+                hr['goodness'] = read_tag(fid, pos).data
+            elif kind == FIFF.FIFF_HPI_FIT_GOOD_LIMIT:
+                hr['good_limit'] = float(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_HPI_FIT_DIST_LIMIT:
+                hr['dist_limit'] = float(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_HPI_FIT_ACCEPT:
+                hr['accept'] = int(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_COORD_TRANS:
+                hr['coord_trans'] = read_tag(fid, pos).data
+        hrs.append(hr)
+    return hrs
+
+
+def _read_hpi_meas(fid, meas_info):
+    """Read the HPI measurement blocks."""
+    hpi_meass = dir_tree_find(meas_info, FIFF.FIFFB_HPI_MEAS)
+    hms = list()
+    for hpi_meas in hpi_meass:
+        hm = dict()
+        for k in range(hpi_meas['nent']):
+            kind = hpi_meas['directory'][k].kind
+            pos = hpi_meas['directory'][k].pos
+            if kind == FIFF.FIFF_CREATOR:
+                hm['creator'] = str(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_SFREQ:
+                hm['sfreq'] = float(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_NCHAN:
+                hm['nchan'] = int(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_NAVE:
+                hm['nave'] = int(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_HPI_NCOIL:
+                hm['ncoil'] = int(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_FIRST_SAMPLE:
+                hm['first_samp'] = int(read_tag(fid, pos).data)
+            elif kind == FIFF.FIFF_LAST_SAMPLE:
+                hm['last_samp'] = int(read_tag(fid, pos).data)
+        hpi_coils = dir_tree_find(hpi_meas, FIFF.FIFFB_HPI_COIL)
+        hcs = []
+        for hpi_coil in hpi_coils:
+            hc = dict()
+            for k in range(hpi_coil['nent']):
+                kind = hpi_coil['directory'][k].kind
+                pos = hpi_coil['directory'][k].pos
+                if kind == FIFF.FIFF_HPI_COIL_NO:
+                    hc['number'] = int(read_tag(fid, pos).data)
+                elif kind == FIFF.FIFF_EPOCH:
+                    hc['epoch'] = read_tag(fid, pos).data
+                    hc['epoch'].flags.writeable = False
+                elif kind == FIFF.FIFF_HPI_SLOPES:
+                    hc['slopes'] = read_tag(fid, pos).data
+                    hc['slopes'].flags.writeable = False
+                elif kind == FIFF.FIFF_HPI_CORR_COEFF:
+                    hc['corr_coeff'] = read_tag(fid, pos).data
+                    hc['corr_coeff'].flags.writeable = False
+                elif kind == FIFF.FIFF_HPI_COIL_FREQ:
+                    hc['coil_freq'] = float(read_tag(fid, pos).data)
+            hcs.append(hc)
+        hm['hpi_coils'] = hcs
+        hms.append(hm)
+    return hms
+
+
 def _read_extended_ch_info(chs, parent, fid):
     ch_infos = dir_tree_find(parent, FIFF.FIFFB_CH_INFO)
     if len(ch_infos) == 0:
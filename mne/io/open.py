@@ -4,7 +4,10 @@
 #
 # License: BSD (3-clause)
 
+import hashlib
+import os
 import os.path as op
+import pickle
 from io import BytesIO, SEEK_SET
 from gzip import GzipFile
 
@@ -13,7 +16,7 @@ import numpy as np
 from .tag import read_tag_info, read_tag, Tag, _call_dict_names
 from .tree import make_dir_tree, dir_tree_find
 from .constants import FIFF
-from ..utils import logger, verbose, _file_like
+from ..utils import logger, verbose, _file_like, get_config
 
 
 class _NoCloseRead(object):
@@ -97,6 +100,65 @@ def _get_next_fname(fid, fname, tree):
     return next_fname
 
 
+# Bump this whenever the content of the cached indices changes
+_INDEX_CACHE_VERSION = 2
+
+
+def _index_cache_fname(fname, kind):
+    """Get the index cache filename for a FIF file (None if disabled)."""
+    cache_dir = get_config('MNE_FIF_INDEX_CACHE_DIR')
+    if not cache_dir or _file_like(fname):
+        return None
+    key = hashlib.sha1(op.realpath(str(fname)).encode()).hexdigest()
+    return op.join(cache_dir, 'fif-%s-%s.pkl' % (kind, key))
+
+
+def _index_cache_key(fname):
+    stat = os.stat(str(fname))
+    return (_INDEX_CACHE_VERSION, op.realpath(str(fname)), stat.st_size,
+            stat.st_mtime_ns)
+
+
+def _read_index_cache(fname, kind):
+    """Read a cached index of a FIF file.
+
+    Returns None if the cache is disabled (``MNE_FIF_INDEX_CACHE_DIR`` unset)
+    or if there is no valid entry for the file in its current state
+    (path, size and modification time).
+    """
+    cache_fname = _index_cache_fname(fname, kind)
+    if cache_fname is None or not op.isfile(cache_fname):
+        return None
+    try:
+        with open(cache_fname, 'rb') as fid:
+            key, value = pickle.load(fid)
+    except Exception as exp:  # corrupt or incompatible, will be rewritten
+        logger.debug('    Could not read index cache %s (%s)'
+                     % (cache_fname, exp))
+        return None
+    if key != _index_cache_key(fname):
+        return None
+    logger.debug('    Using cached %s index from %s' % (kind, cache_fname))
+    return value
+
+
+def _write_index_cache(fname, kind, value):
+    """Write a cached index of a FIF file (no-op if the cache is disabled)."""
+    cache_fname = _index_cache_fname(fname, kind)
+    if cache_fname is None:
+        return
+    tmp_fname = '%s.%d.tmp' % (cache_fname, os.getpid())
+    try:
+        os.makedirs(op.dirname(cache_fname), exist_ok=True)
+        with open(tmp_fname, 'wb') as fid:
+            pickle.dump((_index_cache_key(fname), value), fid,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_fname, cache_fname)  # atomic
+    except OSError as exp:  # the cache is only an optimization
+        logger.debug('    Could not write index cache %s (%s)'
+                     % (cache_fname, exp))
+
+
 @verbose
 def fiff_open(fname, preload=False, verbose=None):
     """Open a FIF file.
@@ -120,22 +182,39 @@ def fiff_open(fname, preload=False, verbose=None):
         lists and tags.
     directory : list
         A list of tags.
+
+    Notes
+    -----
+    If the ``MNE_FIF_INDEX_CACHE_DIR`` configuration value is set, the
+    directory and tree are cached in that directory (keyed on the file path,
+    size and modification time) so that reopening the file does not require
+    traversing it again.
     """
     fid = _fiff_get_fid(fname)
     try:
-        return _fiff_open(fname, fid, preload)
+        index = _read_index_cache(fname, 'tree')
+        if index is not None:
+            return (_fiff_preload(fid, preload),) + index
+        fid, tree, directory = _fiff_open(fname, fid, preload)
+        _write_index_cache(fname, 'tree', (tree, directory))
+        return fid, tree, directory
     except Exception:
         fid.close()
         raise
 
 
-def _fiff_open(fname, fid, preload):
+def _fiff_preload(fid, preload):
     # do preloading of entire file
     if preload:
         # note that StringIO objects instantiated this way are read-only,
         # but that's okay here since we are using mode "rb" anyway
         with fid as fid_old:
             fid = BytesIO(fid_old.read())
+    return fid
+
+
+def _fiff_open(fname, fid, preload):
+    fid = _fiff_preload(fid, preload)
 
     tag = read_tag_info(fid)
 
@@ -212,7 +212,8 @@ class ProjMixin(object):
         self._projector, self.info = _projector, info
         if isinstance(self, (BaseRaw, Evoked)):
             if self.preload:
-                self._data = np.dot(self._projector, self._data)
+                self._data = np.dot(self._projector, self._data).astype(
+                    self._data.dtype, copy=False)
         else:  # BaseEpochs
             if self.preload:
                 for ii, e in enumerate(self._data):
@@ -6,6 +6,7 @@
 
 import hashlib
 import os.path as op
+import pickle
 from datetime import datetime, timedelta, timezone, date
 
 import pytest
@@ -294,6 +295,66 @@ def test_read_write_info(tmpdir):
         write_info(fname, info)
 
 
+@pytest.mark.parametrize('fname', (raw_fname, chpi_fname))
+def test_read_info_lazy(tmpdir, fname):
+    """Test lazy reading of the heavy Info entries."""
+    info = read_info(fname)
+    info_lazy = read_info(fname, lazy=True)
+    lazy_keys = ('dig', 'projs', 'comps', 'hpi_results', 'hpi_meas',
+                 'proc_history')
+    assert set(info_lazy._lazy) == set(lazy_keys)
+    # cheap entries do not decode anything
+    assert info_lazy['sfreq'] == info['sfreq']
+    assert info_lazy['ch_names'] == info['ch_names']
+    assert info_lazy['meas_date'] == info['meas_date']
+    assert all(key in info_lazy for key in lazy_keys)
+    assert set(info_lazy._lazy) == set(lazy_keys)
+    # heavy entries are decoded one at a time on access
+    assert len(info_lazy['projs']) == len(info['projs'])
+    assert info_lazy.get('dig') == info['dig']
+    assert set(info_lazy._lazy) == set(lazy_keys) - {'projs', 'dig'}
+    # overwritten entries are not decoded
+    info_lazy['proc_history'] = []
+    assert_object_equal(dict(info_lazy.items()),
+                        dict(info, proc_history=[]))
+    assert not info_lazy._lazy
+    # copies and pickles decode everything
+    for func in (lambda x: x.copy(), lambda x: pickle.loads(pickle.dumps(x))):
+        assert_object_equal(func(read_info(fname, lazy=True)), info)
+    write_info(tmpdir.join('info.fif'), read_info(fname, lazy=True))
+    info_read = read_info(tmpdir.join('info.fif'))
+    for key in lazy_keys:
+        assert_object_equal(info_read[key], info[key])
+    with pytest.raises(TypeError, match='lazy must be'):
+        read_info(fname, lazy=1)
+    # comparisons decode everything
+    assert read_info(fname, lazy=True) == info
+    assert info == read_info(fname, lazy=True)
+    assert not read_info(fname, lazy=True) != info
+    info_lazy = read_info(fname, lazy=True)
+    info_lazy['bads'] = info['ch_names'][:1]
+    assert info_lazy != info
+
+
+def test_read_info_lazy_error(monkeypatch):
+    """Test that a failed lazy read can be retried."""
+    info = read_info(raw_fname)
+    info_lazy = read_info(raw_fname, lazy=True)
+
+    def _fiff_get_fid_err(fname):
+        raise OSError('Disk unplugged')
+
+    with monkeypatch.context() as m:
+        m.setattr(meas_info, '_fiff_get_fid', _fiff_get_fid_err)
+        with pytest.raises(OSError, match='Disk unplugged'):
+            info_lazy['projs']
+        with pytest.raises(OSError, match='Disk unplugged'):
+            info_lazy.copy()
+    assert 'projs' in info_lazy
+    assert_object_equal(info_lazy['projs'], info['projs'])
+    assert_object_equal(info_lazy.copy(), info)
+
+
 def test_io_dig_points(tmpdir):
     """Test Writing for dig files."""
     points = read_polhemus_fastscan(hsp_fname, on_header_missing='ignore')
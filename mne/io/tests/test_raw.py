@@ -109,7 +109,9 @@ def _test_raw_reader(reader, test_preloading=True, test_kwargs=True,
             slices += [slice(bnd, 2 * bnd), slice(bnd, bnd + 1),
                        slice(0, bnd + 100)]
         other_raws = [reader(preload=buffer_fname, **kwargs),
-                      reader(preload=False, **kwargs)]
+                      reader(preload=False, **kwargs),
+                      reader(preload=False, **kwargs).set_block_cache(
+                          block_size=max(bnd // 3, 1), read_ahead=1)]
         for sl_time in slices:
             data1, times1 = raw[picks, sl_time]
             for other_raw in other_raws:
@@ -264,9 +266,9 @@ def _test_raw_reader(reader, test_preloading=True, test_kwargs=True,
     raw.save(out_fname, tmax=raw.times[-1], overwrite=True, buffer_size_sec=1)
 
     # Test saving with not correct extension
-    out_fname_h5 = op.join(tempdir, 'test_raw.h5')
-    with pytest.raises(IOError, match='raw must end with .fif or .fif.gz'):
-        raw.save(out_fname_h5)
+    out_fname_txt = op.join(tempdir, 'test_raw.txt')
+    with pytest.raises(IOError, match='must end with .fif, .fif.gz or .h5'):
+        raw.save(out_fname_txt)
 
     raw3 = read_raw_fif(out_fname)
     assert_named_constants(raw3.info)
@@ -4,7 +4,13 @@
 #
 # License: BSD (3-clause)
 
-from mne.io.utils import _check_orig_units
+import tracemalloc
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from mne.io.utils import _check_orig_units, _mult_cal_one
 
 
 def test_check_orig_units():
@@ -17,3 +23,24 @@ def test_check_orig_units():
     assert orig_units['Pz'] == 'µV'
     assert orig_units['greekMu'] == 'µV'
     assert orig_units['microSign'] == 'µV'
+
+
+@pytest.mark.parametrize('multiplexed', (False, True))
+@pytest.mark.parametrize('dtype', (np.int16, np.float32, np.float64))
+def test_mult_cal_one(dtype, multiplexed):
+    """Test calibrating picked rows without temporary copies."""
+    one = np.arange(8 * 100000).reshape(8, -1).astype(dtype)
+    if multiplexed:  # samples in rows on disk, e.g. BrainVision
+        one = np.ascontiguousarray(one.T).T
+    idx = np.array([5, 0, 2, 7])
+    cals = np.arange(1., 5.)[:, np.newaxis]
+    want = one[idx] * cals
+    data_view = np.empty((4, one.shape[1]))
+    tracemalloc.start()
+    _mult_cal_one(data_view, one, idx, cals, None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < one[idx].nbytes // 4
+    assert_allclose(data_view, want)
+    _mult_cal_one(data_view, one, slice(1, 5), cals, None)
+    assert_allclose(data_view, one[1:5] * cals)
@@ -74,21 +74,36 @@ def _find_channels(ch_names, ch_type='EOG'):
     return eog_idx
 
 
+# bytes of picked on-disk data converted at once by _mult_cal_one
+_MULT_CAL_CHUNK = 2 ** 17
+
+
 def _mult_cal_one(data_view, one, idx, cals, mult):
-    """Take a chunk of raw data, multiply by mult or cals, and store."""
-    one = np.asarray(one, dtype=data_view.dtype)
+    """Take a chunk of raw data, multiply by mult or cals, and store.
+
+    ``one`` can be a (possibly memory-mapped) view in the on-disk dtype,
+    the conversion to ``data_view.dtype`` only happens for the picked rows,
+    in chunks of samples so that multiplexed data are read contiguously.
+    """
+    one = np.asarray(one)
     assert data_view.shape[1] == one.shape[1], (data_view.shape[1], one.shape[1])  # noqa: E501
     if mult is not None:
         mult.ndim == one.ndim == 2
-        data_view[:] = mult @ one[idx]
+        data_view[:] = mult @ np.asarray(one[idx], dtype=data_view.dtype)
     else:
         assert cals is not None
         if isinstance(idx, slice):
-            data_view[:] = one[idx]
-        else:
-            # faster than doing one = one[idx]
-            np.take(one, idx, axis=0, out=data_view)
-        data_view *= cals
+            np.multiply(one[idx], cals, out=data_view)
+        elif one.dtype == data_view.dtype and one.flags.c_contiguous:
+            # faster than doing one = one[idx], mode='raise' would buffer
+            np.take(one, idx, axis=0, out=data_view, mode='clip')
+            data_view *= cals
+        else:  # convert the picked rows a chunk of samples at a time
+            n_samp = max(_MULT_CAL_CHUNK // (len(idx) * one.itemsize), 1)
+            for start in range(0, one.shape[1], n_samp):
+                sl = slice(start, start + n_samp)
+                data_view[:, sl] = one[idx, sl]
+            data_view *= cals
 
 
 def _blk_read_lims(start, stop, buf_len):
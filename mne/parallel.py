@@ -4,8 +4,14 @@
 #
 # License: Simplified BSD
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+import threading
+import weakref
+
+import numpy as np
 
 from . import get_config
 from .utils import logger, verbose, warn, ProgressBar
@@ -146,20 +152,22 @@ def check_n_jobs(n_jobs, allow_cuda=False):
     n_jobs : int
         The number of jobs.
     allow_cuda : bool
-        Allow n_jobs to be 'cuda'. Default: False.
+        Allow n_jobs to be 'cuda' or 'fft-threads'. Default: False.
 
     Returns
     -------
     n_jobs : int
-        The checked number of jobs. Always positive (or 'cuda' if
-        applicable).
+        The checked number of jobs. Always positive (or 'cuda' or
+        'fft-threads' if applicable).
     """
     if not isinstance(n_jobs, int_like):
         if not allow_cuda:
             raise ValueError('n_jobs must be an integer')
-        elif not isinstance(n_jobs, str) or n_jobs != 'cuda':
-            raise ValueError('n_jobs must be an integer, or "cuda"')
-        # else, we have n_jobs='cuda' and this is okay, so do nothing
+        elif not isinstance(n_jobs, str) or n_jobs not in ('cuda',
+                                                           'fft-threads'):
+            raise ValueError('n_jobs must be an integer, "cuda", or '
+                             '"fft-threads"')
+        # else, we have n_jobs='cuda' or 'fft-threads', so do nothing
     elif _force_serial:
         n_jobs = 1
         logger.info('... MNE_FORCE_SERIAL set. Processing in forced '
@@ -180,3 +188,170 @@ def check_n_jobs(n_jobs, allow_cuda=False):
                 n_jobs = 1
 
     return n_jobs
+
+
+def _prefetch(func, iterable, n_ahead=1, n_threads=1):
+    """Lazily map a function over an iterable, computing ahead in a thread.
+
+    While the caller consumes one result, up to ``n_ahead`` of the following
+    ones are computed in ``n_threads`` background threads (``n_ahead=1`` is
+    classic double buffering). Results are yielded in order. Exceptions are
+    raised when the corresponding result is reached, and pending
+    computations are cancelled (or waited for) if the generator is closed
+    early.
+    """
+    futures = deque()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        try:
+            for item in iterable:
+                futures.append(executor.submit(func, item))
+                if len(futures) > n_ahead:
+                    yield futures.popleft().result()
+            while len(futures) > 0:
+                yield futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+###############################################################################
+# Shared memory arrays
+
+# shared memory blocks attached by this (worker) process
+_attached = dict()
+_attach_lock = threading.Lock()
+
+
+class _SharedArray(np.ndarray):
+    """An array (or view of an array) stored in shared memory.
+
+    These arrays are pickled as regular arrays. To let worker processes read
+    (and write) the data in place instead of receiving a copy, pass them a
+    :func:`_shared_ref` of the array, with :func:`_run_shared` (or
+    :func:`_run_inplace` to write the result back).
+    """
+
+    def __array_finalize__(self, obj):
+        shm = getattr(obj, '_shm', None)
+        addr = getattr(obj, '_shm_addr', None)
+        # copies (e.g., x.copy() or x + 1) are not in shared memory
+        if shm is not None and self.size > 0 and not (
+                addr <= self.ctypes.data < addr + shm.size):
+            shm = addr = None
+        self._shm = shm
+        self._shm_addr = addr
+
+    def __reduce_ex__(self, protocol):  # noqa: D105
+        return np.asarray(self).__reduce_ex__(protocol)
+
+    def __deepcopy__(self, memo):  # noqa: D105
+        return np.array(self)
+
+
+def _shared_empty(shape, dtype=np.float64):
+    """Allocate a (zero-initialized) array in shared memory."""
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError:  # Python < 3.8
+        raise RuntimeError('Storing data in shared memory requires Python '
+                           '3.8 or newer')
+    dtype = np.dtype(dtype)
+    n_bytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    shm = SharedMemory(create=True, size=max(n_bytes, 1))
+    data = np.ndarray(shape, dtype, buffer=shm.buf).view(_SharedArray)
+    data._shm = shm
+    data._shm_addr = data.ctypes.data
+    # the block is removed once the array (and all of its views) are gone
+    weakref.finalize(data, _unlink_shared, shm)
+    logger.debug('Allocated %s bytes of shared memory (%s)'
+                 % (n_bytes, shm.name))
+    return data
+
+
+def _is_shared(data):
+    """Check if an array is (a view of an array) in shared memory."""
+    return getattr(data, '_shm', None) is not None
+
+
+class _SharedRef(object):
+    """A picklable reference to (a view of) an array in shared memory.
+
+    It is only valid while the referenced array exists, so it should only be
+    passed to jobs that finish before the array is released.
+    """
+
+    def __init__(self, data):
+        self.name = data._shm.name
+        self.dtype = data.dtype.str
+        self.shape = data.shape
+        self.strides = data.strides
+        self.offset = data.ctypes.data - data._shm_addr
+
+    def attach(self):
+        """Get the array (in a worker process)."""
+        return np.ndarray(self.shape, self.dtype,
+                          buffer=_shared_buffer(self.name),
+                          offset=self.offset, strides=self.strides)
+
+
+def _shared_ref(data):
+    """Get what to pass to workers for data, by reference if it is shared."""
+    return _SharedRef(data) if _is_shared(data) and data.size > 0 else data
+
+
+def _shared_buffer(name):
+    """Get the buffer of an existing shared memory block (in a worker)."""
+    from multiprocessing.shared_memory import SharedMemory
+    with _attach_lock:
+        if name not in _attached:
+            # unmap the blocks that are no longer used by any array
+            for old_name, old_shm in list(_attached.items()):
+                try:
+                    old_shm.close()
+                except BufferError:  # still used
+                    continue
+                del _attached[old_name]
+            try:
+                shm = SharedMemory(name=name, track=False)  # Python >= 3.13
+            except TypeError:
+                shm = SharedMemory(name=name)
+                # Before Python 3.13, attaching registers the block with the
+                # resource tracker of this process, which removes it when
+                # this process exits although the process that allocated it
+                # still uses it (bpo-39959). There is no tracker on Windows.
+                if os.name != 'nt':
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(shm._name, 'shared_memory')
+            _attached[name] = shm
+        return _attached[name].buf
+
+
+def _unlink_shared(shm):
+    """Remove a shared memory block allocated by this process."""
+    if os.name != 'nt':
+        # workers that share our resource tracker (e.g., multiprocessing
+        # children) unregister the block when they attach to it, but
+        # unlink() expects it to be registered
+        from multiprocessing import resource_tracker
+        with _attach_lock:
+            resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+
+def _attach(data):
+    """Get the array data refers to, if it is a :func:`_shared_ref`."""
+    return data.attach() if isinstance(data, _SharedRef) else data
+
+
+def _run_shared(func, data, *args, **kwargs):
+    """Get func(data, ...), where data can be a :func:`_shared_ref`."""
+    return func(_attach(data), *args, **kwargs)
+
+
+def _run_inplace(func, data, *args, **kwargs):
+    """Replace data with func(data, ...) in place, e.g. in shared memory.
+
+    data can be a :func:`_shared_ref` to an array in shared memory.
+    """
+    data = _attach(data)
+    data[...] = func(data, *args, **kwargs)
@@ -27,7 +27,8 @@ from mne.utils import (assert_and_remove_boundary_annot, _raw_annot,
                        _dt_to_stamp, _stamp_to_dt, check_version)
 from mne.io import read_raw_fif, RawArray, concatenate_raws
 from mne.annotations import (_sync_onset, _handle_meas_date,
-                             _read_annotations_txt_parse_header)
+                             _read_annotations_txt_parse_header,
+                             _bad_annotation_overlaps)
 from mne.datasets import testing
 
 data_dir = op.join(testing.data_path(download=False), 'MEG', 'sample')
@@ -501,6 +502,43 @@ def test_annotation_omit(first_samp):
     pytest.raises(ValueError, raw.get_data, reject_by_annotation='foo')
 
 
+@pytest.mark.parametrize('preload', (True, False))
+def test_annotation_omit_many(preload):
+    """Test raw.get_data with many overlapping bad annotations."""
+    raw = read_raw_fif(fif_fname, preload=preload).crop(0, 10)
+    raw.pick_types(meg='mag', stim=True)
+    rng = np.random.RandomState(0)
+    n_annot = 500
+    onset = np.sort(rng.uniform(0, raw.times[-1] - 0.05, n_annot))
+    duration = rng.uniform(0, 0.05, n_annot)
+    duration[::10] = 0.  # zero-duration annotations do not reject anything
+    description = np.where(rng.rand(n_annot) < 0.8, 'BAD_muscle', 'ok')
+    raw.set_annotations(Annotations(
+        onset + raw.first_time, duration, description,
+        orig_time=raw.info['meas_date']))
+    starts = raw.time_as_index(onset, use_rounding=True)
+    stops = raw.time_as_index(onset + duration, use_rounding=True)
+    good = np.ones(len(raw.times), bool)
+    for start, stop, desc in zip(starts, stops, description):
+        if desc.startswith('BAD'):
+            good[start:stop] = False
+    data, times = raw.get_data(return_times=True)
+    for start, stop in ((0, None), (123, 4567)):
+        sl = slice(start, stop)
+        got, got_times = raw.get_data(start=start, stop=stop,
+                                      reject_by_annotation='omit',
+                                      return_times=True)
+        assert_array_equal(got, data[:, sl][:, good[sl]])
+        assert_array_equal(got_times, times[sl][good[sl]])
+        got = raw.get_data(start=start, stop=stop, reject_by_annotation='NaN')
+        assert_array_equal(np.isnan(got[0]), ~good[sl])
+        assert_array_equal(got[:, good[sl]], data[:, sl][:, good[sl]])
+    # the merged spans are cached until the annotations change
+    assert raw._bad_spans is not None
+    raw.annotations.description[:] = 'ok'
+    assert_array_equal(raw.get_data(reject_by_annotation='omit'), data)
+
+
 def test_annotation_epoching():
     """Test that annotations work properly with concatenated edges."""
     # Create data with just a DC component
@@ -1284,3 +1322,31 @@ def test_annotation_ch_names():
         raw_2.set_annotations(annot, on_missing='warn')
     assert raw_2.annotations is not annot_pruned
     _assert_annotations_equal(raw_2.annotations, annot_pruned)
+
+
+@first_samps
+def test_bad_annotation_overlaps(first_samp):
+    """Test finding the first bad annotation overlapping segments."""
+    rng = np.random.RandomState(0)
+    raw = RawArray(np.zeros((1, 10000)), create_info(1, 100.),
+                   first_samp=first_samp)
+    onsets = rng.uniform(0, 75, 40)
+    # long spans that contain later (shorter) ones, and some good ones
+    durations = rng.choice([0., 0.05, 0.3, 20.], 40)
+    descs = rng.choice(['bad', 'BAD_long', 'good'], 40)
+    raw.set_annotations(Annotations(onsets, durations, descs))
+    annot = raw.annotations
+    starts = rng.randint(-100, 10000, 500)
+    stops = starts + rng.randint(1, 200, 500)
+    got = _bad_annotation_overlaps(raw, starts, stops)
+    onset = _sync_onset(raw, annot.onset)
+    for start, stop, descr in zip(starts, stops, got):
+        hit = ((onset < stop / 100.) &
+               (onset + annot.duration > start / 100.) &
+               np.array([d.lower().startswith('bad')
+                         for d in annot.description]))
+        want = annot.description[np.argmax(hit)] if hit.any() else None
+        assert descr == want
+    assert _bad_annotation_overlaps(raw, starts[0], stops[0]) == got[:1]
+    raw.set_annotations(None)
+    assert _bad_annotation_overlaps(raw, starts, stops) == [None] * 500
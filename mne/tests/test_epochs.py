@@ -29,6 +29,7 @@ from mne.baseline import rescale
 from mne.datasets import testing
 from mne.chpi import read_head_pos, head_pos_to_trans_rot_t
 from mne.event import merge_events
+from mne.filter import resample
 from mne.io import RawArray, read_raw_fif
 from mne.io.constants import FIFF
 from mne.io.proj import _has_eeg_average_ref_proj
@@ -37,7 +38,7 @@ from mne.preprocessing import maxwell_filter
 from mne.epochs import (
     bootstrap, equalize_epoch_counts, combine_event_ids, add_channels_epochs,
     EpochsArray, concatenate_epochs, BaseEpochs, average_movements,
-    _handle_event_repeated, make_metadata)
+    _handle_event_repeated, make_metadata, _is_good)
 from mne.utils import (requires_pandas, object_diff,
                        catch_logging, _FakeNoPandas,
                        assert_meg_snr, check_version, _dt_to_stamp)
@@ -432,6 +433,94 @@ def test_reject():
         raw.set_annotations(None)
 
 
+@pytest.mark.parametrize('fmt', ('single', 'double'))
+def test_epochs_fif_partial_read(tmpdir, fmt):
+    """Test reading only some channels and times of epochs from FIF."""
+    raw, events, picks = _get_data()
+    raw.info['lowpass'] = 40.  # avoid aliasing warnings
+    epochs = Epochs(raw, events[:10], event_id, tmin, tmax, picks=picks,
+                    preload=True)
+    fname = str(tmpdir.join('test-epo.fif'))
+    epochs.save(fname, fmt=fmt)
+    ch_names = [epochs.ch_names[pick] for pick in (40, 3, 4, 5, 200, 201)]
+    want = read_epochs(fname).pick_channels(ch_names, ordered=True)
+    want.crop(-0.05, 0.2).decimate(2)
+    epochs_read = read_epochs(fname, preload=False)
+    n_bytes = [0]
+    for container in epochs_read._raw:
+        fid_read = container.fid.read
+
+        def _read(size, fid_read=fid_read):
+            n_bytes[0] += size
+            return fid_read(size)
+
+        container.fid.read = _read
+    epochs_read.pick_channels(ch_names, ordered=True)
+    epochs_read.crop(-0.05, 0.2).decimate(2)
+    assert epochs_read.ch_names == ch_names
+    assert_array_equal(epochs_read.times, want.times)
+    data = epochs_read.get_data()
+    assert_allclose(data, want.get_data(), rtol=1e-6 if fmt == 'single'
+                    else 1e-12, atol=1e-20)
+    # 3 runs of channels (each read in one go) for each epoch
+    itemsize = 4 if fmt == 'single' else 8
+    n_times = len(epochs_read._raw_times)
+    n_file_times = epochs_read._raw[0].epoch_shape[1]
+    assert n_bytes[0] == len(data) * itemsize * (
+        3 * n_times + 3 * n_file_times)
+    # cropping and decimating in the other order
+    epochs_read = read_epochs(fname, preload=False).decimate(3, offset=1)
+    epochs_read.crop(0., 0.15)
+    want = read_epochs(fname).decimate(3, offset=1).crop(0., 0.15)
+    assert_array_equal(epochs_read.times, want.times)
+    assert_allclose(epochs_read.get_data(), want.get_data(), rtol=1e-6)
+    epochs_read.load_data()
+    assert_allclose(epochs_read.get_data(), want.get_data(), rtol=1e-6)
+    # projections not applied before saving require preloading
+    epochs = Epochs(raw, events[:10], event_id, tmin, tmax, picks=picks,
+                    proj=False)
+    assert not epochs.info['projs'][0]['active']
+    epochs.save(fname, overwrite=True)
+    epochs_read = read_epochs(fname, preload=False)
+    with pytest.raises(RuntimeError, match='projections that are not'):
+        epochs_read.pick_channels(ch_names)
+    epochs_read = read_epochs(fname, preload=False, proj=False)
+    epochs_read.pick_channels(ch_names)
+    want = read_epochs(fname, proj=False).pick_channels(ch_names)
+    assert_allclose(epochs_read.get_data(), want.get_data(), rtol=1e-6)
+
+
+@pytest.mark.parametrize('preload', (True, False))
+def test_reject_blocks(preload, monkeypatch):
+    """Test that rejecting blocks of epochs matches single epochs."""
+    raw, events, picks = _get_data()
+    raw.crop(0, 20).info['bads'] = ['MEG 2443', 'EEG 053']
+    events = make_fixed_length_events(raw, duration=0.25)[1:-1]
+    kwargs = dict(event_id=None, tmin=-0.1, tmax=0.3, picks=picks,
+                  reject_tmin=0., proj='delayed', preload=preload)
+    epochs = Epochs(raw, events, reject=None, flat=None, **kwargs)
+    data_noproj = epochs.get_data()
+    data = epochs.copy().apply_proj().get_data()
+    assert len(data) == len(events)
+    # reject three epochs at a time
+    monkeypatch.setattr(mne.epochs, '_RAW_WINDOW_SIZE', 3 * data[0].nbytes)
+    rej = dict(grad=800e-12, mag=3e-12, eeg=60e-6, eog=150e-6)
+    fla = dict(grad=1e-13, eeg=1e-6)
+    ch_type_idx = epochs._channel_type_idx
+    want = list()
+    for epoch in data[:, :, epochs._reject_time]:
+        is_good, bad_tuple = _is_good(
+            epoch, epochs.ch_names, ch_type_idx, rej, fla, full_report=True,
+            ignore_chs=raw.info['bads'])
+        want.append(() if is_good else bad_tuple)
+    assert 10 < sum(len(w) > 0 for w in want) < len(want) - 10
+    epochs = Epochs(raw, events, reject=rej, flat=fla, **kwargs)
+    epochs.drop_bad()
+    assert epochs.drop_log == tuple(want)
+    good = np.array([len(w) == 0 for w in want])
+    assert_array_equal(epochs.get_data(), data_noproj[good])
+
+
 def test_reject_by_annotations_reject_tmin_reject_tmax():
     """Test reject_by_annotations with reject_tmin and reject_tmax defined."""
     # 10 seconds of data, event at 2s, bad segment from 1s to 1.5s
@@ -1476,6 +1565,169 @@ def test_preload_epochs():
                               epochs.average().data, 18)
 
 
+def test_preload_dtype():
+    """Test reduced-precision storage of epochs data."""
+    raw, events, picks = _get_data()
+    kwargs = dict(event_id=event_id, tmin=tmin, tmax=tmax, picks=picks)
+    epochs_64 = Epochs(raw, events[:16], preload=True, **kwargs)
+    epochs_32 = Epochs(raw, events[:16], preload=True, preload_dtype='float32',
+                       **kwargs)
+    assert epochs_32._data.dtype == np.float32
+    data = epochs_64.get_data()
+    assert epochs_32.get_data().dtype == np.float32
+    atol = 1e-6 * np.abs(data).max()
+    assert_allclose(epochs_32.get_data(), data, rtol=1e-6, atol=atol)
+    # averaging is done in double precision
+    evoked = epochs_32.average()
+    assert evoked.data.dtype == np.float64
+    assert_allclose(evoked.data, epochs_64.average().data, rtol=1e-6,
+                    atol=atol)
+    # lazy loading and conversion
+    epochs = Epochs(raw, events[:16], preload=False, **kwargs)
+    epochs.load_data(dtype='float32')
+    assert_array_equal(epochs.get_data(), epochs_32.get_data())
+    epochs.load_data(dtype='float64')
+    assert epochs._data.dtype == np.float64
+    with pytest.raises(ValueError, match='Invalid value for the .dtype'):
+        Epochs(raw, events[:16], preload_dtype=int, **kwargs)
+    # processing keeps the precision
+    assert epochs_32.copy().filter(None, 20.)._data.dtype == np.float32
+    assert epochs_32.copy().resample(100.)._data.dtype == np.float32
+    # EpochsArray
+    epochs = EpochsArray(data, epochs_64.info, dtype='float32')
+    assert epochs._data.dtype == np.float32
+    epochs = EpochsArray(data + 1j * data, epochs_64.info, dtype='float32')
+    assert epochs._data.dtype == np.complex64
+
+
+def test_preload_memmap(tmpdir):
+    """Test preloading epochs into a memory-mapped file."""
+    raw, events, picks = _get_data()
+    kwargs = dict(event_id=None, tmin=tmin, tmax=tmax, picks=picks,
+                  reject=reject, flat=flat, baseline=None)
+    epochs = Epochs(raw, events, preload=True, **kwargs)
+    epochs_mm = Epochs(raw, events, preload=tmpdir.join('epo.dat'),
+                       **kwargs)
+    assert isinstance(epochs_mm._data, np.memmap)
+    assert epochs_mm.drop_log == epochs.drop_log
+    assert_array_equal(epochs_mm.get_data(), epochs.get_data())
+    # in-place operations stay on disk
+    for inst in (epochs, epochs_mm):
+        inst.apply_baseline((None, 0))
+        inst.filter(None, 40., fir_design='firwin')
+        inst.decimate(3, offset=1)
+        inst.decimate(1)
+        inst.drop([0, 3, 4], reason='testing')
+        inst.drop_bad(dict(reject, grad=800e-12))
+    assert isinstance(epochs_mm._data, np.memmap)
+    assert epochs_mm._data.filename == str(tmpdir.join('epo.dat'))
+    assert epochs_mm.drop_log == epochs.drop_log
+    assert_allclose(epochs_mm.get_data(), epochs.get_data(), rtol=1e-12)
+    assert_array_equal(epochs_mm.times, epochs.times)
+    # selecting epochs into a new instance does not modify the original
+    data = epochs_mm.get_data()
+    assert_array_equal(epochs_mm[::2].get_data(), data[::2])
+    assert_array_equal(epochs_mm.get_data(), data)
+    # EpochsFIF, lazily from file names and eagerly from file-like objects
+    fname = tmpdir.join('test-epo.fif')
+    epochs.save(fname)
+    data = read_epochs(fname).get_data()
+    epochs_read = read_epochs(fname, preload=tmpdir.join('epo2.dat'))
+    assert isinstance(epochs_read._data, np.memmap)
+    assert_array_equal(epochs_read.get_data(), data)
+    with open(fname, 'rb') as fid:
+        epochs_read = read_epochs(fid, preload=tmpdir.join('epo3.dat'))
+    assert isinstance(epochs_read._data, np.memmap)
+    assert_array_equal(epochs_read.get_data(), data)
+    # EpochsArray keeps memory-mapped input as is
+    epochs_arr = EpochsArray(epochs_read._data, epochs.info)
+    assert isinstance(epochs_arr._data, np.memmap)
+    assert np.shares_memory(epochs_arr._data, epochs_read._data)
+
+
+def test_lazy_windows():
+    """Test that lazy epochs read overlapping epochs together."""
+    raw, _, picks = _get_data()
+    raw.crop(0, 10).del_proj()
+    events = make_fixed_length_events(raw, duration=0.2)
+    events[::7, 2] = 2
+    onset = raw.first_time + np.array([1., 5.])
+    raw.set_annotations(Annotations(onset, [0.5, 0.], ['bad', 'BAD_zero'],
+                                    orig_time=raw.info['meas_date']))
+    kwargs = dict(tmin=-0.3, tmax=0.7, picks=picks[::5], reject=reject,
+                  flat=flat)
+    epochs_pre = Epochs(raw, events, preload=True, **kwargs)
+    assert 0 < len(epochs_pre) < len(events)
+    n_reads = [0]
+    read_segment = raw._read_segment
+
+    def _read_segment(*args, **kwargs):
+        n_reads[0] += 1
+        return read_segment(*args, **kwargs)
+
+    raw._read_segment = _read_segment
+    epochs = Epochs(raw, events, preload=False, **kwargs)
+    data = epochs.get_data()
+    assert n_reads[0] == 1  # one window for all epochs
+    assert epochs.drop_log == epochs_pre.drop_log
+    assert_array_equal(data, epochs_pre.get_data())
+    assert_array_equal(epochs.get_data(item=[3, 1, 2]), data[[3, 1, 2]])
+    # iteration, including changing the position in between
+    epochs = Epochs(raw, events, preload=False, **kwargs)
+    assert_array_equal(np.array([epoch for epoch in epochs]), data)
+    epochs.drop_bad()
+    iter(epochs)
+    assert_array_equal(next(epochs), data[0])
+    assert_array_equal(next(epochs), data[1])
+    epochs_copy = epochs.copy()
+    epochs._current = 3
+    assert_array_equal(next(epochs), data[3])
+    assert_array_equal(next(epochs_copy), data[2])
+    # small windows give the same result
+    with pytest.MonkeyPatch().context() as mp:
+        mp.setattr('mne.epochs._RAW_WINDOW_SIZE', 1)
+        n_reads[0] = 0
+        epochs = Epochs(raw, events, preload=True, **kwargs)
+        assert n_reads[0] > 1
+    assert_array_equal(epochs.get_data(), data)
+
+
+@pytest.mark.parametrize('preload', (True, False))
+def test_iter_data(preload):
+    """Test iterating over epochs data with prefetching."""
+    raw, _, picks = _get_data()
+    raw.crop(0, 10)
+    events = make_fixed_length_events(raw, duration=0.5)
+    events[::3, 2] = 2
+    epochs = Epochs(raw, events, tmin=-0.2, tmax=0.5, picks=picks,
+                    reject=reject, flat=flat, proj='delayed', preload=preload)
+    want = [epoch for epoch in epochs]
+    iter(epochs)
+    want_ids = [epochs.next(True)[1] for _ in range(len(want))]
+    assert 0 < len(want) < len(events)
+    iter(epochs)
+    next(epochs)
+    for kwargs in (dict(), dict(prefetch=0), dict(prefetch=3, n_jobs=2)):
+        got = list(epochs.iter_data(**kwargs))
+        assert len(got) == len(want)
+        for epoch, epoch_want in zip(got, want):
+            assert_array_equal(epoch, epoch_want)
+        batches = list(epochs.iter_data(
+            batch_size=4, return_event_id=True, **kwargs))
+        assert [len(data) for data, _ in batches[:-1]] == \
+            [4] * (len(batches) - 1)
+        assert_array_equal(np.concatenate([data for data, _ in batches]),
+                           want)
+        assert_array_equal(np.concatenate([ids for _, ids in batches]),
+                           want_ids)
+    # the iteration state is not modified
+    assert_array_equal(next(epochs), want[1])
+    with pytest.raises(ValueError, match='batch_size must be at least'):
+        next(epochs.iter_data(batch_size=0))
+    with pytest.raises(TypeError, match='prefetch must be'):
+        next(epochs.iter_data(prefetch=1.))
+
+
 def test_indexing_slicing():
     """Test of indexing and slicing operations."""
     raw, events, picks = _get_data()
@@ -1666,6 +1918,12 @@ def test_resample():
     epochs.resample(sfreq_normal * 2, n_jobs=1, npad=0)
     assert (np.allclose(data_up, epochs._data, rtol=1e-8, atol=1e-16))
 
+    # polyphase resampling of each epoch
+    epochs = epochs_o.copy().resample(sfreq_normal * 2, method='polyphase')
+    assert_array_equal(epochs.times, times_up)
+    assert_allclose(epochs._data, resample(data_normal, 2, 1, pad='edge',
+                                           method='polyphase'))
+
     # test copy flag
     epochs = epochs_o.copy()
     epochs_resampled = epochs.copy().resample(sfreq_normal * 2, npad=0)
@@ -2971,6 +3229,114 @@ def test_make_metadata(all_event_id, row_events, keep_first,
            verbose='warning')
 
 
+@requires_pandas
+def test_make_metadata_windows():
+    """Test the time windows of make_metadata."""
+    events = np.array([[0, 0, 1], [10, 0, 3], [20, 0, 4], [20, 0, 3],
+                       [30, 0, 1], [40, 0, 5], [500, 0, 1]])
+    event_id = {'a/1': 1, 'b/1': 3, 'b/2': 4}
+    metadata, events_out, event_id_out = make_metadata(
+        events, event_id, tmin=-0.1, tmax=0.2, sfreq=100., keep_last='b')
+    assert_array_equal(metadata.index, [0, 1, 2, 3, 4, 6])
+    assert_array_equal(events_out, events[[0, 1, 2, 3, 4, 6]])
+    assert event_id_out == event_id
+    assert list(metadata.columns) == ['event_name', 'a/1', 'b/1', 'b/2', 'b',
+                                      'last_b']
+    assert list(metadata['event_name']) == ['a/1', 'b/1', 'b/2', 'b/1',
+                                            'a/1', 'a/1']
+    nan = np.nan
+    assert_allclose(metadata['a/1'], [0., -0.1, 0.1, 0.1, 0., 0.])
+    assert_allclose(metadata['b/1'], [0.1, 0., -0.1, -0.1, -0.1, nan])
+    assert_allclose(metadata['b/2'], [0.2, 0.1, 0., 0., -0.1, nan])
+    assert_allclose(metadata['b'], metadata['b/2'])
+    assert list(metadata['last_b']) == ['2'] * 5 + [None]
+    # rows only for a subset of the events
+    metadata, events_out, event_id_out = make_metadata(
+        events, event_id, tmin=-0.1, tmax=0.2, sfreq=100., row_events='b/1')
+    assert_array_equal(metadata.index, [1, 3])
+    assert_array_equal(events_out, events[[1, 3]])
+    assert event_id_out == {'b/1': 3}
+    assert_allclose(metadata['a/1'], [-0.1, 0.1])
+
+
+def _make_metadata_loop(events, event_id, tmin, tmax, sfreq, keep_first,
+                        keep_last):
+    """Fill the metadata one row and event at a time (the old algorithm)."""
+    from mne.utils.mixin import _hid_match
+    start_sample = int(round(tmin * sfreq))
+    stop_sample = int(round(tmax * sfreq)) + 1
+    id_to_name_map = {v: k for k, v in event_id.items()}
+    events = events[np.in1d(events[:, 2], list(event_id.values()))]
+    group_names = keep_first + keep_last
+    rows = list()
+    for row_sample, _, row_id in events:
+        row = dict(event_name=id_to_name_map[row_id])
+        in_window = ((events[:, 0] >= row_sample + start_sample) &
+                     (events[:, 0] <= row_sample + stop_sample))
+        for sample, _, id_ in events[in_window]:
+            event_time = (sample - row_sample) / sfreq
+            event_time = 0 if np.isclose(event_time, 0) else event_time
+            event_name = id_to_name_map[id_]
+            if event_name in row and event_name not in keep_last:
+                continue
+            row[event_name] = event_time
+            for group_name in group_names:
+                if event_name not in _hid_match(event_id, [group_name]):
+                    continue
+                old_time = row.get(group_name, np.nan)
+                if not np.isnan(old_time):
+                    if ((group_name in keep_first and
+                         old_time <= event_time) or
+                        (group_name in keep_last and
+                         old_time >= event_time)):
+                        continue
+                if group_name not in event_id:
+                    prefix = 'first' if group_name in keep_first else 'last'
+                    row[f'{prefix}_{group_name}'] = (
+                        event_name.replace(group_name, '')
+                        .replace('//', '/').strip('/'))
+                row[group_name] = event_time
+        rows.append(row)
+    return rows
+
+
+@requires_pandas
+@pytest.mark.parametrize('seed', range(20))
+def test_make_metadata_loop(seed):
+    """Test make_metadata against the old per-row algorithm."""
+    rng = np.random.RandomState(seed)
+    event_id = {'a/x': 1, 'a/y': 2, 'b/x': 3, 'd': 4}
+    samples = np.sort(rng.randint(0, 300, 40))
+    events = np.array([samples, np.zeros(40, int),
+                       rng.randint(1, 5, 40)]).T
+    keep_first, keep_last = [['x', 'd'], ['a/x']][::(-1) ** seed]
+    tmin, tmax = rng.choice([-0.5, -0.2]), rng.choice([0., 0.3])
+    metadata = make_metadata(
+        events, event_id, tmin=tmin, tmax=tmax, sfreq=100.,
+        keep_first=keep_first, keep_last=keep_last)[0]
+    want = _make_metadata_loop(events, event_id, tmin, tmax, 100.,
+                               keep_first, keep_last)
+    assert len(metadata) == len(want)
+    for (_, got_row), want_row in zip(metadata.iterrows(), want):
+        for col in metadata.columns:
+            if col.startswith(('first_', 'last_', 'event_name')):
+                assert got_row[col] == want_row.get(col), col
+            else:
+                assert_allclose(got_row[col], want_row.get(col, np.nan),
+                                err_msg=col)
+
+
+@requires_pandas
+def test_make_metadata_keep_first_last():
+    """Test keep_first groups of event types that are in keep_last."""
+    events = np.array([[242, 0, 1], [254, 0, 2], [255, 0, 2], [292, 0, 1]])
+    metadata = make_metadata(
+        events, {'a/x': 1, 'd': 2}, tmin=-0.5, tmax=0., sfreq=100.,
+        keep_first='x', keep_last=['a/x'])[0]
+    assert_allclose(metadata['a/x'], [0., -0.12, -0.13, 0.])
+    assert_allclose(metadata['x'], [0., -0.12, -0.13, -0.5])
+
+
 def test_events_list():
     """Test that events can be a list."""
     events = [[100, 0, 1], [200, 0, 1], [300, 0, 1]]
@@ -3105,6 +3471,71 @@ def test_average_methods():
         assert_array_equal(evoked_data, fun(data))
 
 
+def test_average_stream(monkeypatch):
+    """Test one-pass aggregation of lazy epochs by event type."""
+    raw, _, picks = _get_data()
+    raw.crop(0, 12)
+    events = make_fixed_length_events(raw, duration=0.25)[1:-1]
+    events[::3, 2] = 2
+    events[1::3, 2] = 3
+    event_ids = dict(a=1, b=2, c=3, missing=4)
+    kwargs = dict(tmin=-0.1, tmax=0.3, picks=picks, reject=reject,
+                  on_missing='ignore')
+    epochs_pre = Epochs(raw, events, event_ids, preload=True, **kwargs)
+    epochs = Epochs(raw, events, event_ids, preload=False, **kwargs)
+    # each epoch is read once, in a few blocks
+    monkeypatch.setattr(mne.epochs, '_RAW_WINDOW_SIZE',
+                        20 * epochs_pre._data[0].nbytes)
+    n_read = [0]
+    get_epochs_from_raw = epochs._get_epochs_from_raw
+
+    def _get_epochs_from_raw(idxs):
+        n_read[0] += len(idxs)
+        return get_epochs_from_raw(idxs)
+
+    epochs._get_epochs_from_raw = _get_epochs_from_raw
+    with pytest.warns(RuntimeWarning, match='evoked object is empty'):
+        evokeds = epochs.average(by_event_type=True)
+    assert n_read[0] == len(events)
+    assert [evoked.comment for evoked in evokeds] == list(event_ids)
+    assert evokeds[-1].nave == 0
+    assert np.isnan(evokeds[-1].data).all()
+    for evoked, key in zip(evokeds[:-1], event_ids):
+        evoked_want = epochs_pre[key].average()
+        assert evoked.nave == evoked_want.nave > 5
+        assert_allclose(evoked.data, evoked_want.data, rtol=1e-10, atol=1e-20)
+    with pytest.warns(RuntimeWarning, match='evoked object is empty'):
+        evokeds = epochs.standard_error(by_event_type=True)
+    assert evokeds[0].kind == 'standard_error'
+    for evoked, key in zip(evokeds[:-1], event_ids):
+        assert_allclose(evoked.data, epochs_pre[key].standard_error().data,
+                        rtol=1e-7, atol=1e-20)
+    with pytest.warns(RuntimeWarning, match='evoked object is empty'):
+        evokeds_pre = epochs_pre.average(by_event_type=True)
+    for evoked, evoked_pre in zip(evokeds, evokeds_pre):
+        assert evoked.comment == evoked_pre.comment
+        assert evoked.nave == evoked_pre.nave
+    # without grouping
+    assert_allclose(epochs.average().data, epochs_pre.average().data,
+                    rtol=1e-10, atol=1e-20)
+    assert_allclose(epochs.standard_error().data,
+                    epochs_pre.standard_error().data, rtol=1e-7, atol=1e-20)
+    # approximate median: exact for a few epochs, close for more
+    data = epochs_pre.get_data()[:, pick_types(epochs_pre.info, meg=True,
+                                               eeg=True)]
+    evoked = epochs_pre[:5].average(method='approx_median')
+    assert_allclose(evoked.data, np.median(data[:5], axis=0))
+    evoked = epochs.average(method='approx_median')
+    assert evoked.nave == len(data)
+    assert not np.allclose(evoked.data, np.median(data, axis=0))
+    lims = np.percentile(data, [35, 65], axis=0)
+    assert np.mean((evoked.data >= lims[0]) & (evoked.data <= lims[1])) > 0.95
+    with pytest.raises(ValueError, match='can only compute mean'):
+        epochs.average(method='median')
+    with pytest.raises(TypeError, match='by_event_type must be'):
+        epochs.average(by_event_type=1)
+
+
 @pytest.mark.parametrize('relative', (True, False))
 def test_shift_time(relative):
     """Test the timeshift method."""
@@ -11,11 +11,16 @@ from mne import create_info
 from numpy.fft import fft, fftfreq
 from mne.io import RawArray, read_raw_fif
 from mne.io.pick import _DATA_CH_TYPES_SPLIT
+from mne import filter as filter_mod
+from mne.cuda import _setup_cuda_fft_multiply_repeated
+from mne.parallel import _shared_empty, _is_shared
 from mne.filter import (filter_data, resample, _resample_stim_channels,
                         construct_iir_filter, notch_filter, detrend,
-                        _overlap_add_filter, _smart_pad, design_mne_c_filter,
-                        estimate_ringing_samples, create_filter,
-                        _length_factors)
+                        _overlap_add_filter, _1d_overlap_filter, _smart_pad,
+                        design_mne_c_filter, estimate_ringing_samples,
+                        create_filter,
+                        _length_factors, get_filter_cache_info,
+                        clear_filter_cache, _filter_cache)
 
 from mne.utils import (sum_squared, run_tests_if_main,
                        catch_logging, requires_mne, run_subprocess)
@@ -142,6 +147,37 @@ def test_1d_filter():
                             assert_allclose(x_filtered, x_expected, atol=1e-13)
 
 
+@pytest.mark.parametrize('phase', ('zero', 'linear', 'zero-double'))
+@pytest.mark.parametrize('pad', ('reflect_limited', 'edge', 'mean'))
+def test_2d_filter(phase, pad, monkeypatch):
+    """Test overlap-add filtering of blocks of rows in place."""
+    rng = np.random.RandomState(0)
+    h = rng.randn(21)
+    n_fft = 128
+    for n_times in (5, 20, 301):
+        x = rng.randn(6, n_times)
+        picks = [0, 1, 2, 5, 4]
+        # filter each row on its own with the reference implementation
+        n_edge = min(len(h), n_times) - 1
+        h_use = np.convolve(h, h[::-1]) if phase == 'zero-double' else h
+        cuda_dict = _setup_cuda_fft_multiply_repeated(1, h_use, n_fft)[1]
+        want = x.copy()
+        for pick in picks:
+            want[pick] = _1d_overlap_filter(x[pick], len(h_use), n_edge, phase,
+                                            cuda_dict, pad, n_fft)
+        for max_size in (n_fft, 2 * n_fft, 2 ** 18):  # 1, 2 or all rows
+            monkeypatch.setattr(filter_mod, '_MAX_FFT_SIZE', max_size)
+            for n_jobs, shared in ((1, False), (2, False), (2, True)):
+                # shared data are filtered in place by the workers
+                x_filt = _shared_empty(x.shape) if shared else np.empty_like(x)
+                x_filt[:] = x
+                out = _overlap_add_filter(x_filt, h, n_fft, phase, picks,
+                                          n_jobs=n_jobs, copy=False, pad=pad)
+                assert out is x_filt
+                assert _is_shared(x_filt) == shared
+                assert_allclose(x_filt, want, atol=1e-12)
+
+
 def test_iir_stability():
     """Test IIR filter stability check."""
     sig = np.random.RandomState(0).rand(1000)
@@ -279,7 +315,39 @@ def test_resample_scipy():
                 assert_allclose(x_p5, x_p5_sp, atol=1e-12, err_msg=err_msg)
 
 
-@pytest.mark.parametrize('n_jobs', (2, 'cuda'))
+def test_resample_polyphase(monkeypatch):
+    """Test polyphase resampling against FFT resampling and SciPy."""
+    from scipy.signal import resample_poly
+    rng = np.random.RandomState(0)
+    t = np.arange(5000) / 1000.
+    # band-limited signals, well below the new Nyquist frequency (50 Hz)
+    x = np.array([np.sin(2 * np.pi * freq * t + rng.rand() * 2 * np.pi)
+                  for freq in (1., 5., 20.)])
+    y = resample(x, 100., 1000., method='polyphase')
+    assert y.shape == (3, 500)
+    assert_allclose(y[:, 20:-20], resample(x, 100., 1000., npad=0)[:, 20:-20],
+                    atol=2e-3)
+    # away from the edges, this is the SciPy filter
+    assert_allclose(y[:, 30:-30], resample_poly(x, 1, 10, axis=-1)[:, 30:-30],
+                    atol=1e-12)
+    # chunks, worker processes and other axes give the same result
+    monkeypatch.setattr(filter_mod, '_MAX_POLYPHASE_SIZE', 1)
+    assert_allclose(resample(x, 1, 10, method='polyphase'), y, atol=1e-12)
+    assert_allclose(resample(x, 1, 10, method='polyphase', n_jobs=2), y,
+                    atol=1e-12)
+    y_up = resample(x.T.astype(np.float32), 3, 2, axis=0, method='polyphase')
+    assert y_up.shape == (7500, 3)
+    assert y_up.dtype == np.float32
+    assert_allclose(y_up[20:-20], resample(x.T, 3, 2, npad=0, axis=0)[20:-20],
+                    atol=2e-3)
+    assert_array_equal(resample(x, 2, 2, method='polyphase'), x)
+    with pytest.raises(ValueError, match='fraction with a denominator'):
+        resample(x, np.pi, 1, method='polyphase')
+    with pytest.raises(ValueError, match='Invalid value for the .method'):
+        resample(x, 1, 10, method='poly')
+
+
+@pytest.mark.parametrize('n_jobs', (2, 'cuda', 'fft-threads'))
 def test_n_jobs(n_jobs):
     """Test resampling against SciPy."""
     x = np.random.RandomState(0).randn(4, 100)
@@ -291,6 +359,30 @@ def test_n_jobs(n_jobs):
     assert_allclose(y1, y2)
 
 
+def test_fft_threads(monkeypatch):
+    """Test the number of threads used with n_jobs='fft-threads'."""
+    x = np.random.RandomState(0).randn(3, 1000)
+    monkeypatch.setenv('MNE_FFT_THREADS', '2')
+    with catch_logging() as log:
+        y = filter_data(x, 100., None, 20., n_jobs='fft-threads',
+                        verbose=True)
+        y_resamp = resample(x, 1, 3, n_jobs='fft-threads', verbose=True)
+    log = log.getvalue()
+    assert 'Using 2 FFT threads for FFT FIR filtering' in log
+    assert 'Using 2 FFT threads for FFT resampling' in log
+    assert_allclose(y, filter_data(x, 100., None, 20.), atol=1e-12)
+    assert_allclose(y_resamp, resample(x, 1, 3), atol=1e-12)
+    # 2D padding matches padding each row
+    for pad in ('reflect_limited', 'edge', 'mean'):
+        for n_pad in ((0, 0), (5, 3), (999, 1001)):
+            x_pad = _smart_pad(x, n_pad, pad)
+            assert x_pad.shape == (3, 1000 + sum(n_pad))
+            for row, row_pad in zip(x, x_pad):
+                assert_array_equal(row_pad, _smart_pad(row, n_pad, pad))
+    with pytest.raises(ValueError, match='or "fft-threads"'):
+        filter_data(x, 100., None, 20., n_jobs='threads')
+
+
 def test_resamp_stim_channel():
     """Test resampling of stim channels."""
     # Downsampling
@@ -512,7 +604,11 @@ def test_filter_auto():
     pytest.raises(ValueError, filter_data, x, -sfreq, 1, 10)
     pytest.raises(ValueError, filter_data, x, sfreq, 1, sfreq * 0.75)
     with pytest.raises(ValueError, match='Data to be filtered must be real'):
-        filter_data(x.astype(np.float32), sfreq, None, 10)
+        filter_data(x.astype(np.int64), sfreq, None, 10)
+    x_filt = filter_data(x, sfreq, None, 10)
+    x_filt_32 = filter_data(x.astype(np.float32), sfreq, None, 10)
+    assert x_filt_32.dtype == np.float32
+    assert_allclose(x_filt_32, x_filt, rtol=1e-4, atol=1e-6 * np.abs(x).max())
     with pytest.raises(ValueError, match='Data to be filtered must be real'):
         filter_data(1j, 1000., None, 40.)
 
@@ -762,4 +858,50 @@ def test_filter_picks():
                 assert_allclose(raw.get_data(), want)
 
 
+def test_filter_cache(monkeypatch):
+    """Test caching filter designs."""
+    clear_filter_cache()
+    info = get_filter_cache_info()
+    assert info['hits'] == info['misses'] == info['n_filters'] == 0
+    kwargs = dict(data=None, sfreq=1000., l_freq=1., h_freq=40.,
+                  fir_design='firwin')
+    h = create_filter(**kwargs)
+    h[:] = 0.  # modifying the output does not modify the cached design
+    h_2 = create_filter(**kwargs)
+    assert_allclose(h_2, create_filter(**dict(kwargs, l_freq=1. + 1e-12)),
+                    atol=1e-12)
+    info = get_filter_cache_info()
+    assert (info['hits'], info['misses']) == (1, 2)
+    assert info['n_filters'] == 2
+    assert info['n_bytes'] == 2 * h.nbytes
+    assert np.abs(h_2).max() > 0.
+    # warnings are emitted every time
+    for _ in range(2):
+        with pytest.warns(RuntimeWarning, match='Attenuation'):
+            create_filter(None, 1000., None, 40., filter_length=11,
+                          fir_design='firwin2')
+    # IIR designs and their ringing estimates
+    iir_params = dict(order=4, ftype='butter', output='sos')
+    want = construct_iir_filter(iir_params, 40., None, 1000., 'low')
+    info = get_filter_cache_info()
+    got = construct_iir_filter(iir_params, 40., None, 1000., 'low')
+    assert get_filter_cache_info()['hits'] == info['hits'] + 2
+    assert_array_equal(got['sos'], want['sos'])
+    assert got['padlen'] == want['padlen']
+    assert got['sos'] is not want['sos']
+    for _ in range(2):
+        with pytest.warns(RuntimeWarning, match='properly estimate'):
+            construct_iir_filter(dict(order=2, ftype='butter', output='sos'),
+                                 0.01, None, 1000., 'low')
+    # the least recently used designs are discarded first
+    monkeypatch.setattr(_filter_cache, 'max_bytes', 3 * h.nbytes)
+    clear_filter_cache()
+    for l_freq in (1., 2., 3., 1., 4., 2., 1.):  # 2 is discarded, then 3
+        create_filter(**dict(kwargs, l_freq=l_freq, filter_length=h.size))
+    info = get_filter_cache_info()
+    assert (info['hits'], info['misses']) == (2, 5)
+    assert info['n_filters'] == 3
+    assert info['n_bytes'] == 3 * h.nbytes
+
+
 run_tests_if_main()
@@ -0,0 +1,138 @@
+# License: BSD (3-clause)
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os.path as op
+import pickle
+import sys
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from mne import Epochs, make_fixed_length_events
+from mne.time_frequency import tfr_morlet
+from mne.io import read_raw_fif
+from mne.parallel import (_shared_empty, _is_shared, _run_inplace,
+                          _shared_ref)
+
+base_dir = op.join(op.dirname(__file__), '..', 'io', 'tests', 'data')
+raw_fname = op.join(base_dir, 'test_raw.fif')
+
+requires_shm = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason='Requires Python 3.8')
+
+
+def _dispatch(method, func, arrays, ref=True):
+    """Run func on each array in worker processes, like parallel_func."""
+    ctx = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(1, mp_context=ctx) as ex:
+        futures = [ex.submit(_run_inplace, func,
+                             _shared_ref(array) if ref else array)
+                   for array in arrays]
+        return [future.result() for future in futures]
+
+
+@requires_shm
+@pytest.mark.parametrize('method', ('fork', 'spawn'))
+def test_shared_array(method):
+    """Test passing shared memory arrays to worker processes."""
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip('Start method %s not available' % (method,))
+    data = _shared_empty((4, 10))
+    assert _is_shared(data)
+    assert_array_equal(data, 0.)
+    data[:] = np.arange(40.).reshape(4, 10)
+    want = data * 2
+    assert not _is_shared(want)
+    # views are modified in place by the workers
+    _dispatch(method, np.negative, [data[0], data[2, ::2], data[1:, 5:]])
+    want[0] *= -1
+    want[2, ::2] *= -1
+    want[1:, 5:] *= -1
+    assert_array_equal(data * 2, want)
+    # copies are not shared, so the workers only modify their own copy
+    copy = data.copy()
+    assert not _is_shared(copy)
+    _dispatch(method, np.negative, [copy])
+    assert_array_equal(copy * 2, want)
+    # without a reference, shared arrays are also sent as copies
+    _dispatch(method, np.negative, [data[1]], ref=False)
+    assert_array_equal(data * 2, want)
+    # and they are pickled as usual
+    data_pickle = pickle.loads(pickle.dumps(data[1]))
+    assert not _is_shared(data_pickle)
+    assert_array_equal(data_pickle * 2, want[1])
+    name = data._shm.name
+    del data
+    with pytest.raises(FileNotFoundError):
+        from multiprocessing.shared_memory import SharedMemory
+        SharedMemory(name=name)
+
+
+@requires_shm
+def test_load_data_shared_memory():
+    """Test preloading Raw and Epochs data in shared memory."""
+    raw = read_raw_fif(raw_fname).crop(0, 5).pick_types(meg='grad')
+    want = raw.get_data()
+    raw.load_data(shared_memory=True)
+    assert _is_shared(raw._data)
+    assert_array_equal(raw._data, want)
+    raw_filt = raw.copy()
+    assert not _is_shared(raw_filt._data)
+    raw.filter(None, 40., fir_design='firwin')
+    raw_filt.filter(None, 40., fir_design='firwin')
+    assert _is_shared(raw._data)
+    assert_allclose(raw._data, raw_filt._data)
+    # already preloaded data are moved to shared memory
+    raw_filt.load_data(shared_memory=True)
+    assert _is_shared(raw_filt._data)
+    assert_allclose(raw_filt._data, raw._data)
+    events = make_fixed_length_events(raw, duration=1.)
+    epochs = Epochs(raw, events, tmax=0.5, preload=False,
+                    reject=dict(grad=6e-10))
+    epochs.load_data(shared_memory=True)
+    assert len(epochs) == 4
+    assert _is_shared(epochs._data)
+    epochs_data = Epochs(raw, events, tmax=0.5, preload=True,
+                         reject=dict(grad=6e-10)).get_data()
+    assert_array_equal(epochs.get_data(), epochs_data)
+    with pytest.raises(TypeError, match='shared_memory must be'):
+        epochs.load_data(shared_memory='yes')
+
+
+@requires_shm
+def test_n_jobs_shared_memory():
+    """Test passing shared data to parallel jobs by reference."""
+    raw = read_raw_fif(raw_fname).crop(0, 2).pick_types(meg='grad')
+    raw.load_data(shared_memory=True)
+    raw_want = raw.copy()
+    assert not _is_shared(raw_want._data)
+    # modified in place
+    for inst in (raw, raw_want):
+        inst.apply_function(np.negative, n_jobs=2 if inst is raw else 1)
+        inst.apply_hilbert(envelope=True, n_jobs=2 if inst is raw else 1)
+    assert _is_shared(raw._data)
+    assert_allclose(raw._data, raw_want._data)
+    # read by reference
+    for method in ('fft', 'polyphase'):
+        got = raw.copy().load_data(shared_memory=True)
+        assert _is_shared(got._data)
+        sfreq = raw.info['sfreq'] / 4.
+        got.resample(sfreq, npad=0, n_jobs=2, method=method)
+        want = raw_want.copy().resample(sfreq, npad=0, method=method)
+        assert_allclose(got._data, want._data)
+    events = make_fixed_length_events(raw, duration=0.5)
+    epochs = Epochs(raw, events, tmax=0.4, baseline=None, preload=False)
+    epochs.load_data(shared_memory=True)
+    epochs_want = epochs.copy()
+    assert not _is_shared(epochs_want._data)
+    epochs.apply_function(np.negative, n_jobs=2)
+    epochs_want.apply_function(np.negative)
+    assert _is_shared(epochs._data)
+    assert_allclose(epochs._data, epochs_want._data)
+    kwargs = dict(freqs=[20., 30.], n_cycles=2, return_itc=False,
+                  picks=[2, 3, 4])
+    power = tfr_morlet(epochs, n_jobs=2, **kwargs)
+    power_want = tfr_morlet(epochs_want, **kwargs)
+    assert_allclose(power.data, power_want.data)
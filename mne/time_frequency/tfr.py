@@ -19,7 +19,7 @@ from .multitaper import dpss_windows
 from ..baseline import rescale
 from ..fixes import _import_fft
 from ..filter import next_fast_len
-from ..parallel import parallel_func
+from ..parallel import parallel_func, _run_shared, _shared_ref, _is_shared
 from ..utils import (logger, verbose, _time_mask, _freq_mask, check_fname,
                      sizeof_fmt, GetEpochsMixin, _prepare_read_metadata,
                      fill_doc, _prepare_write_metadata, _check_event_id,
@@ -336,7 +336,8 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
         imaginary values code for the 'itc': out = avg_power + i * itc
     """
     # Check data
-    epoch_data = np.asarray(epoch_data)
+    if not _is_shared(epoch_data):  # keep passing shared data by reference
+        epoch_data = np.asarray(epoch_data)
     if epoch_data.ndim != 3:
         raise ValueError('epoch_data must be of shape (n_epochs, n_chans, '
                          'n_times), got %s' % (epoch_data.shape,))
@@ -385,11 +386,12 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
     # Parallel computation
     all_Ws = sum([list(W) for W in Ws], list())
     _get_nfft(all_Ws, epoch_data, use_fft)
-    parallel, my_cwt, _ = parallel_func(_time_frequency_loop, n_jobs)
+    parallel, my_cwt, _ = parallel_func(_run_shared, n_jobs)
 
     # Parallelization is applied across channels.
     tfrs = parallel(
-        my_cwt(channel, Ws, output, use_fft, 'same', decim)
+        my_cwt(_time_frequency_loop, _shared_ref(channel), Ws, output,
+               use_fft, 'same', decim)
         for channel in epoch_data.transpose(1, 0, 2))
 
     # FIXME: to avoid overheads we should use np.array_split()
@@ -2224,6 +2226,8 @@ def _prepare_picks(info, data, picks, axis):
     info = pick_info(info, picks)
     sl = [slice(None)] * data.ndim
     sl[axis] = picks
+    if len(picks) and (np.diff(picks) == 1).all():  # a view avoids a copy
+        sl[axis] = slice(picks[0], picks[-1] + 1)
     data = data[tuple(sl)]
     return info, data
 
@@ -18,7 +18,8 @@ from .check import (check_fname, check_version, check_random_state,
                     _check_pyqt5_version, _check_sphere, _check_time_format,
                     _check_freesurfer_home, _suggest, _require_version,
                     _on_missing, _check_on_missing, int_like, _safe_input,
-                    _check_all_same_channel_names, path_like, _ensure_events)
+                    _check_all_same_channel_names, path_like, _ensure_events,
+                    _check_preload_dtype)
 from .config import (set_config, get_config, get_config_path, set_cache_dir,
                      set_memmap_min_size, get_subjects_dir, _get_stim_channel,
                      sys_info, _get_extra_data_path, _get_root_dir,
@@ -610,13 +610,35 @@ def _check_all_same_channel_names(instances):
     return True
 
 
+def _check_preload_dtype(dtype, like=np.float64):
+    """Get the dtype to store data in memory with the given precision.
+
+    ``like`` is the dtype used by default, it determines whether the data
+    are real or complex.
+    """
+    like = np.dtype(like)
+    if dtype is None:
+        return like
+    try:
+        name = np.dtype(dtype).name
+    except TypeError:
+        name = dtype
+    _check_option('dtype', name, ('float32', 'float64'))
+    if np.issubdtype(like, np.complexfloating):
+        return np.result_type(name, np.complex64)
+    return np.dtype(name)
+
+
 def _check_combine(mode, valid=('mean', 'median', 'std')):
+    # accumulate reduced-precision data in double precision
     if mode == "mean":
         def fun(data):
-            return np.mean(data, axis=0)
+            return np.mean(data, axis=0,
+                           dtype=np.result_type(data.dtype, np.float64))
     elif mode == "std":
         def fun(data):
-            return np.std(data, axis=0)
+            return np.std(data, axis=0,
+                          dtype=np.result_type(data.dtype, np.float64))
     elif mode == "median" or mode == np.median:
         def fun(data):
             return _median_complex(data, axis=0)
@@ -112,6 +112,8 @@ known_config_types = (
     'MNE_DATASETS_SSVEP_PATH',
     'MNE_DATASETS_ERP_CORE_PATH',
     'MNE_DATASETS_EPILEPSY_ECOG_PATH',
+    'MNE_FFT_THREADS',
+    'MNE_FIF_INDEX_CACHE_DIR',
     'MNE_FORCE_SERIAL',
     'MNE_KIT2FIFF_STIM_CHANNELS',
     'MNE_KIT2FIFF_STIM_CHANNEL_CODING',
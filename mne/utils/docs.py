@@ -37,6 +37,23 @@ preload : bool or str (default False)
     large amount of memory). If preload is a string, preload is the
     file name of a memory-mapped file which is used to store the data
     on the hard drive (slower, requires less memory)."""
+docdict['preload_dtype'] = """
+dtype : None | 'float32' | 'float64'
+    Floating-point precision used to store the data in memory. None (default)
+    uses ``'float64'`` (or the precision the data are already stored with).
+    ``'float32'`` halves the memory usage; complex data are then stored as
+    ``complex64``. Filtering, resampling, and projection keep the data in
+    this precision, while averaging accumulates in double precision.
+
+    .. versionadded:: 0.23"""
+docdict['preload_shared_memory'] = """
+shared_memory : bool
+    If True, store the data in shared memory. Jobs dispatched to multiple
+    processes (e.g., filtering with ``n_jobs > 1``) then access the data in
+    place instead of receiving a copy of them, which saves memory and
+    serialization time. Requires Python 3.8 or newer.
+
+    .. versionadded:: 0.23"""
 docdict['preload_concatenate'] = """
 preload : bool, str, or None (default None)
     Preload data into memory for data manipulation and faster indexing.
@@ -47,6 +64,20 @@ preload : bool, str, or None (default None)
     None, preload=True or False is inferred using the preload status
     of the instances passed in.
 """
+docdict['preload_filter'] = """
+preload : bool | str
+    Only used for raw data that are not loaded yet. If True or a string,
+    the data are read from disk, filtered, and stored block by block, so
+    that the unfiltered recording is never held in memory at once. If a
+    string, it is the file name of a memory-mapped file used to store the
+    data (as with ``preload`` when reading raw data), which bounds the
+    memory usage by a few blocks regardless of the length of the recording.
+    Only FIR filters (``method='fir'``) are applied in blocks, other methods
+    first load all of the data. If False (default), the data must be loaded
+    beforehand.
+
+    .. versionadded:: 0.23
+"""
 
 # Raw
 _on_missing_base = """\
@@ -617,12 +648,15 @@ method : str
 docdict['n_jobs-fir'] = """
 n_jobs : int | str
     Number of jobs to run in parallel. Can be 'cuda' if ``cupy``
-    is installed properly and method='fir'.
+    is installed properly and method='fir'. Can also be 'fft-threads' with
+    method='fir' to compute the FFTs with multiple threads on the CPU
+    (see :ref:`fft-threads`).
 """
 docdict['n_jobs-cuda'] = """
 n_jobs : int | str
     Number of jobs to run in parallel. Can be 'cuda' if ``cupy``
-    is installed properly.
+    is installed properly, or 'fft-threads' to compute the FFTs with
+    multiple threads on the CPU (see :ref:`fft-threads`).
 """
 docdict['iir_params'] = """
 iir_params : dict | None
@@ -641,6 +675,16 @@ window : str | tuple
     Frequency-domain window to use in resampling.
     See :func:`scipy.signal.resample`.
 """
+docdict['method-resample'] = """
+method : str
+    Resampling method to use. Can be ``'fft'`` (default) to resample in the
+    frequency domain, or ``'polyphase'`` to use an up/down polyphase FIR filter
+    (see :func:`scipy.signal.resample_poly`), which is faster and needs less
+    memory for long signals when the ratio of the sampling rates is a simple
+    fraction (e.g., 5000 Hz to 500 Hz). With ``'polyphase'``, the data are
+    processed in chunks, ``npad`` and ``window`` are ignored, and ``n_jobs``
+    splits the channels across worker processes.
+"""
 docdict['average-psd'] = """
 average : str | None
     How to average the segments. If ``mean`` (default), calculate the
@@ -2074,8 +2118,35 @@ event_id : int | list of int | dict | None
 docdict['epochs_preload'] = """
     Load all epochs from disk when creating the object
     or wait before accessing each epoch (more memory
-    efficient but can be slower).
+    efficient but can be slower). If a string, it is the file name of a
+    memory-mapped file which is used to store the data on the hard drive
+    (slower, requires less memory).
+
+    .. versionchanged:: 0.23
+       Support for memory-mapped files.
+"""
+docdict['by_event_type'] = """
+by_event_type : bool
+    When ``False`` (the default) all epochs are processed together and a
+    single :class:`~mne.Evoked` object is returned. When ``True``, epochs are
+    first grouped by event type (as specified using the ``event_id``
+    parameter) and a list is returned containing a separate
+    :class:`~mne.Evoked` object for each event type. The ``.comment``
+    attribute is set to the label of the event type.
+
+    .. versionadded:: 0.23
 """
+_by_event_type_returns_base = """
+evoked : instance of Evoked | list of Evoked
+    The {} data. If ``by_event_type=True`` was specified, a list is returned
+    containing a separate :class:`~mne.Evoked` object for each event type. The
+    list has the same order as the event types as specified in the
+    ``event_id`` dictionary.
+"""
+docdict['evoked_by_event_type_returns'] = \
+    _by_event_type_returns_base.format('averaged')
+docdict['std_err_by_event_type_returns'] = \
+    _by_event_type_returns_base.format('standard error')
 docdict['epochs_detrend'] = """
 detrend : int | None
     If 0 or 1, the data channels (MEG and EEG) will be detrended when
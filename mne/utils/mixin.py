@@ -217,9 +217,20 @@ class GetEpochsMixin(object):
             # will reset the index for us
             GetEpochsMixin.metadata.fset(inst, metadata, verbose=False)
         if inst.preload and select_data:
-            # ensure that each Epochs instance owns its own data so we can
-            # resize later if necessary
-            inst._data = np.require(inst._data[select], requirements=['O'])
+            keep = np.arange(len(inst._data))[select]
+            if not copy and isinstance(inst._data, np.memmap) and \
+                    np.all(np.diff(keep) > 0):
+                # move the kept epochs to the front of the memory map rather
+                # than reading all of them into memory
+                for ii, idx in enumerate(keep):
+                    if ii != idx:
+                        inst._data[ii] = inst._data[idx]
+                inst._data = inst._data[:len(keep)]
+            else:
+                # ensure that each Epochs instance owns its own data so we
+                # can resize later if necessary
+                inst._data = np.require(inst._data[select],
+                                        requirements=['O'])
         if drop_event_id:
             # update event id to reflect new content of inst
             inst.event_id = {k: v for k, v in inst.event_id.items()
@@ -313,6 +324,7 @@ class GetEpochsMixin(object):
         """
         self._current = 0
         self._current_detrend_picks = self._detrend_picks
+        self._raw_epochs = None
         return self
 
     def __next__(self, return_event_id=False):
@@ -340,7 +352,14 @@ class GetEpochsMixin(object):
             while not is_good:
                 if self._current >= len(self.events):
                     self._stop_iter()
-                epoch_noproj = self._get_epoch_from_raw(self._current)
+                # read ahead the following epochs, unless the position was
+                # changed in between
+                raw_epochs = getattr(self, '_raw_epochs', None)
+                if raw_epochs is None or raw_epochs[0] != self._current:
+                    raw_epochs = (self._current, self._get_epochs_from_raw(
+                        range(self._current, len(self.events))))
+                epoch_noproj = next(raw_epochs[1])
+                self._raw_epochs = (self._current + 1, raw_epochs[1])
                 epoch_noproj = self._detrend_offset_decim(
                     epoch_noproj, self._current_detrend_picks)
                 epoch = self._project_epoch(epoch_noproj)
@@ -358,6 +377,7 @@ class GetEpochsMixin(object):
     def _stop_iter(self):
         del self._current
         del self._current_detrend_picks
+        self._raw_epochs = None
         raise StopIteration  # signal the end
 
     next = __next__  # originally for Python2, now b/c public